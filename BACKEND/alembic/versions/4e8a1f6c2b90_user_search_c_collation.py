@@ -0,0 +1,47 @@
+"""user search c collation
+
+Revision ID: 4e8a1f6c2b90
+Revises: 9c4e2a7f1d35
+Create Date: 2026-10-19 23:48:12.906154
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.database.models.user_search import USER_SEARCH_POSTGRES_PREFIX_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e8a1f6c2b90'
+down_revision: Union[str, Sequence[str], None] = '9c4e2a7f1d35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_INDEXES = ["ix_users_username_prefix", "ix_users_email_prefix"]
+TEXT_PATTERN_OPS_DDL = [
+    "CREATE INDEX ix_users_username_prefix ON users (lower(username) text_pattern_ops)",
+    "CREATE INDEX ix_users_email_prefix ON users (lower(email) text_pattern_ops)",
+]
+
+
+def _recreate(statements: list[str]) -> None:
+    for name in SEARCH_INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    for statement in statements:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Postgres only: the SQLite prefix indexes already order by the byte-wise
+    # BINARY collation they are searched with
+    if op.get_bind().dialect.name == "postgresql":
+        _recreate(USER_SEARCH_POSTGRES_PREFIX_DDL)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        _recreate(TEXT_PATTERN_OPS_DDL)
@@ -0,0 +1,34 @@
+"""read pins
+
+Revision ID: 7a2d9c4e1f63
+Revises: 4e8a1f6c2b90
+Create Date: 2026-10-20 00:31:57.284019
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a2d9c4e1f63'
+down_revision: Union[str, Sequence[str], None] = '4e8a1f6c2b90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('read_pins',
+    sa.Column('subject', sa.String(length=255), nullable=False),
+    sa.Column('expires', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('subject')
+    )
+    op.create_index(op.f('ix_read_pins_expires'), 'read_pins', ['expires'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_read_pins_expires'), table_name='read_pins')
+    op.drop_table('read_pins')
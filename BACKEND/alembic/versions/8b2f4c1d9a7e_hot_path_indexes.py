@@ -0,0 +1,56 @@
+"""hot path indexes
+
+Revision ID: 8b2f4c1d9a7e
+Revises: 3fba622fd86c
+Create Date: 2026-10-19 10:12:31.418205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2f4c1d9a7e'
+down_revision: Union[str, Sequence[str], None] = '3fba622fd86c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partial index predicate for rows that are not soft-deleted. It must match the
+# SQL the services render for `is_deleted == False` on each dialect.
+NOT_DELETED = {
+    "postgresql_where": sa.text("is_deleted = false"),
+    "sqlite_where": sa.text("is_deleted = 0"),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Reverse lookups on the association tables (the composite PKs only cover the leading column)
+    op.create_index(op.f('ix_roles_permissions_permission_id'), 'roles_permissions', ['permission_id'], unique=False)
+    op.create_index(op.f('ix_groups_roles_role_id'), 'groups_roles', ['role_id'], unique=False)
+    op.create_index(op.f('ix_users_groups_group_id'), 'users_groups', ['group_id'], unique=False)
+    op.create_index(op.f('ix_users_roles_role_id'), 'users_roles', ['role_id'], unique=False)
+
+    # Listing endpoints: only live rows, ordered by creation time
+    op.create_index('ix_roles_active_created', 'roles', ['created'], unique=False, **NOT_DELETED)
+    op.create_index('ix_groups_active_created', 'groups', ['created'], unique=False, **NOT_DELETED)
+    op.create_index('ix_permissions_active_created', 'permissions', ['created'], unique=False, **NOT_DELETED)
+    op.create_index('ix_users_status_created', 'users', ['is_deleted', 'is_active', 'created'], unique=False)
+
+    # Revoking a user's active refresh tokens
+    op.create_index('ix_refresh_tokens_user_id_revoked', 'refresh_tokens', ['user_id', 'revoked'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_refresh_tokens_user_id_revoked', table_name='refresh_tokens')
+    op.drop_index('ix_users_status_created', table_name='users')
+    op.drop_index('ix_permissions_active_created', table_name='permissions')
+    op.drop_index('ix_groups_active_created', table_name='groups')
+    op.drop_index('ix_roles_active_created', table_name='roles')
+    op.drop_index(op.f('ix_users_roles_role_id'), table_name='users_roles')
+    op.drop_index(op.f('ix_users_groups_group_id'), table_name='users_groups')
+    op.drop_index(op.f('ix_groups_roles_role_id'), table_name='groups_roles')
+    op.drop_index(op.f('ix_roles_permissions_permission_id'), table_name='roles_permissions')
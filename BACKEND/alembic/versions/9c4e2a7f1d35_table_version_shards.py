@@ -0,0 +1,68 @@
+"""table version shards
+
+Revision ID: 9c4e2a7f1d35
+Revises: b81d6f2c4e97
+Create Date: 2026-10-19 22:05:41.517203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.database.models.table_version import TABLE_VERSION_POSTGRES_FUNCTION, TABLE_VERSION_SHARDS
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4e2a7f1d35'
+down_revision: Union[str, Sequence[str], None] = 'b81d6f2c4e97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UNSHARDED_POSTGRES_FUNCTION = """
+    CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+    BEGIN
+        UPDATE table_versions SET version = version + 1 WHERE name = TG_TABLE_NAME;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+
+def _recreate(sharded: bool) -> sa.Table:
+    """Recreates table_versions with or without the shard column, carrying each table's total over."""
+    totals = op.get_bind().execute(
+        sa.text("SELECT name, SUM(version) FROM table_versions GROUP BY name")
+    ).all()
+    op.drop_table('table_versions')
+    columns = [sa.Column('name', sa.String(length=50), nullable=False)]
+    if sharded:
+        columns.append(sa.Column('shard', sa.SmallInteger(), nullable=False))
+    table = op.create_table('table_versions',
+    *columns,
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name', 'shard') if sharded else sa.PrimaryKeyConstraint('name')
+    )
+    rows = [{'name': name, 'version': int(total)} for name, total in totals]
+    if sharded:
+        shards = TABLE_VERSION_SHARDS if op.get_bind().dialect.name == "postgresql" else 1
+        rows = [
+            {**row, 'shard': shard, 'version': row['version'] if shard == 0 else 0}
+            for row in rows for shard in range(shards)
+        ]
+    op.bulk_insert(table, rows)
+    return table
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _recreate(sharded=True)
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(TABLE_VERSION_POSTGRES_FUNCTION)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _recreate(sharded=False)
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(UNSHARDED_POSTGRES_FUNCTION)
@@ -0,0 +1,37 @@
+"""rate limit buckets
+
+Revision ID: a3c8e5f19b42
+Revises: f2b7d41c8e06
+Create Date: 2026-10-19 18:05:41.917352
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c8e5f19b42'
+down_revision: Union[str, Sequence[str], None] = 'f2b7d41c8e06'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rate_limit_buckets',
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('tokens', sa.Float(), nullable=False),
+    sa.Column('updated', sa.Float(), nullable=False),
+    sa.Column('full_at', sa.Float(), nullable=False),
+    sa.Column('allowed', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_rate_limit_buckets_full_at'), 'rate_limit_buckets', ['full_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_rate_limit_buckets_full_at'), table_name='rate_limit_buckets')
+    op.drop_table('rate_limit_buckets')
@@ -0,0 +1,36 @@
+"""invalidation log
+
+Revision ID: b81d6f2c4e97
+Revises: a3c8e5f19b42
+Create Date: 2026-10-19 19:12:08.604127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b81d6f2c4e97'
+down_revision: Union[str, Sequence[str], None] = 'a3c8e5f19b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('invalidation_log',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('created', sa.Float(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sqlite_autoincrement=True
+    )
+    op.create_index(op.f('ix_invalidation_log_created'), 'invalidation_log', ['created'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_invalidation_log_created'), table_name='invalidation_log')
+    op.drop_table('invalidation_log')
@@ -0,0 +1,66 @@
+"""user counters
+
+Revision ID: c47e91a2b5d3
+Revises: 8b2f4c1d9a7e
+Create Date: 2026-10-19 14:03:52.771046
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c47e91a2b5d3'
+down_revision: Union[str, Sequence[str], None] = '8b2f4c1d9a7e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SQLITE_TRIGGERS = {
+    "users_counter_insert": """
+        CREATE TRIGGER users_counter_insert AFTER INSERT ON users WHEN NEW.is_deleted = 0
+        BEGIN
+            UPDATE user_counters SET total = total + 1 WHERE is_active = NEW.is_active;
+        END
+    """,
+    "users_counter_delete": """
+        CREATE TRIGGER users_counter_delete AFTER DELETE ON users WHEN OLD.is_deleted = 0
+        BEGIN
+            UPDATE user_counters SET total = total - 1 WHERE is_active = OLD.is_active;
+        END
+    """,
+    "users_counter_update": """
+        CREATE TRIGGER users_counter_update AFTER UPDATE OF is_active, is_deleted ON users
+        BEGIN
+            UPDATE user_counters SET total = total - 1 WHERE OLD.is_deleted = 0 AND is_active = OLD.is_active;
+            UPDATE user_counters SET total = total + 1 WHERE NEW.is_deleted = 0 AND is_active = NEW.is_active;
+        END
+    """,
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('user_counters',
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('is_active')
+    )
+    # Postgres estimates totals from planner statistics; the counters are only maintained on SQLite
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute(
+            "INSERT INTO user_counters (is_active, total) "
+            "SELECT flag, (SELECT count(*) FROM users WHERE is_deleted = 0 AND is_active = flag) "
+            "FROM (SELECT 0 AS flag UNION ALL SELECT 1)"
+        )
+        for trigger in SQLITE_TRIGGERS.values():
+            op.execute(trigger)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        for name in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table('user_counters')
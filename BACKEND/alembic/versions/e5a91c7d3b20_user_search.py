@@ -0,0 +1,58 @@
+"""user search
+
+Revision ID: e5a91c7d3b20
+Revises: c47e91a2b5d3
+Create Date: 2026-10-19 15:21:08.402617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.database.models.user_search import USER_SEARCH_SQLITE_DDL
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a91c7d3b20'
+down_revision: Union[str, Sequence[str], None] = 'c47e91a2b5d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The Postgres DDL as of this revision; 4e8a1f6c2b90 collates the prefix indexes
+USER_SEARCH_POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX ix_users_username_trgm ON users USING gin (lower(username) gin_trgm_ops)",
+    "CREATE INDEX ix_users_email_trgm ON users USING gin (lower(email) gin_trgm_ops)",
+    "CREATE INDEX ix_users_username_prefix ON users (lower(username) text_pattern_ops)",
+    "CREATE INDEX ix_users_email_prefix ON users (lower(email) text_pattern_ops)",
+]
+SEARCH_INDEXES = ["ix_users_username_prefix", "ix_users_email_prefix"]
+POSTGRES_TRIGRAM_INDEXES = ["ix_users_username_trgm", "ix_users_email_trgm"]
+SQLITE_TRIGGERS = ["users_fts_insert", "users_fts_delete", "users_fts_update"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        for statement in USER_SEARCH_POSTGRES_DDL:
+            op.execute(statement)
+    elif dialect == "sqlite":
+        # Includes the FTS 'rebuild' that indexes the users already present
+        for statement in USER_SEARCH_SQLITE_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        for name in POSTGRES_TRIGRAM_INDEXES + SEARCH_INDEXES:
+            op.execute(f"DROP INDEX IF EXISTS {name}")
+    elif dialect == "sqlite":
+        for name in SQLITE_TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute("DROP TABLE IF EXISTS users_fts")
+        for name in SEARCH_INDEXES:
+            op.execute(f"DROP INDEX IF EXISTS {name}")
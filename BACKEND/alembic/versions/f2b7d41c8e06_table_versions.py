@@ -0,0 +1,82 @@
+"""table versions
+
+Revision ID: f2b7d41c8e06
+Revises: e5a91c7d3b20
+Create Date: 2026-10-19 16:42:17.238410
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+VERSIONED_TABLES = ("users", "roles", "groups", "permissions")
+
+# The DDL as of this revision (one counter row per table); 9c4e2a7f1d35 shards it
+_SEED = "INSERT INTO table_versions (name, version) VALUES " + ", ".join(f"('{table}', 0)" for table in VERSIONED_TABLES)
+TABLE_VERSION_POSTGRES_DDL = [
+    _SEED,
+    """
+    CREATE FUNCTION bump_table_version() RETURNS trigger AS $$
+    BEGIN
+        UPDATE table_versions SET version = version + 1 WHERE name = TG_TABLE_NAME;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    *(
+        f"CREATE TRIGGER {table}_version AFTER INSERT OR UPDATE OR DELETE ON {table} "
+        f"FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+        for table in VERSIONED_TABLES
+    ),
+]
+TABLE_VERSION_SQLITE_DDL = [
+    _SEED,
+    *(
+        f"""
+        CREATE TRIGGER {table}_version_{operation.lower()} AFTER {operation} ON {table}
+        BEGIN
+            UPDATE table_versions SET version = version + 1 WHERE name = '{table}';
+        END
+        """
+        for table in VERSIONED_TABLES
+        for operation in ("INSERT", "UPDATE", "DELETE")
+    ),
+]
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b7d41c8e06'
+down_revision: Union[str, Sequence[str], None] = 'e5a91c7d3b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('table_versions',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        for statement in TABLE_VERSION_POSTGRES_DDL:
+            op.execute(statement)
+    elif dialect == "sqlite":
+        for statement in TABLE_VERSION_SQLITE_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    for table in VERSIONED_TABLES:
+        if dialect == "postgresql":
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_version ON {table}")
+        elif dialect == "sqlite":
+            for operation in ("insert", "update", "delete"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_version_{operation}")
+    if dialect == "postgresql":
+        op.execute("DROP FUNCTION IF EXISTS bump_table_version()")
+    op.drop_table('table_versions')
@@ -0,0 +1,55 @@
+import hashlib
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.auth import get_current_user
+from app.api.dependencies.database import get_read_db
+from app.config import Config
+from app.database.models import User
+from app.database.services import TableVersionService
+
+
+def make_etag(key: str, versions: dict[str, int]) -> str:
+    """Quoted ETag for a representation identified by `key` at the given table versions."""
+    parts = [Config.VERSION, key, *(f"{table}={versions.get(table, 0)}" for table in sorted(versions))]
+    return '"' + hashlib.blake2b("|".join(parts).encode(), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match uses the weak comparison: W/ prefixes are ignored, "*" matches anything."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or etag in (candidate.removeprefix("W/") for candidate in candidates)
+
+
+def conditional_get(*tables: str, db_dependency=get_read_db, per_user: bool = False):
+    """
+    Route dependency for GETs whose body only changes when `tables` change.
+
+    The ETag is derived from the table change counters (TableVersion), the
+    request URL and, with `per_user`, the caller's id, so checking it costs
+    one small query. A matching If-None-Match ends the request with 304
+    before the endpoint runs. Authentication runs first, so stale ETags never
+    answer an anonymous client. `db_dependency` should be the one the
+    endpoint reads with, so version and rows come from the same database.
+    """
+    async def check(
+        request: Request,
+        response: Response,
+        db: AsyncSession = Depends(db_dependency),
+        current_user: User = Depends(get_current_user),
+    ) -> None:
+        versions = await TableVersionService.get_versions(db, tables)
+        key = f"{request.url.path}?{request.url.query}"
+        if per_user:
+            # The caller's row was loaded before the versions were read; its
+            # `updated` keeps a write committed in between from being masked
+            key += f"|user={current_user.id}|{current_user.updated}"
+        etag = make_etag(key, versions)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    return check
@@ -1,5 +1,25 @@
-from app.database.models import SessionLocal
+from fastapi import Request
+
+from app.config import Config
+from app.database.models import SessionLocal, read_router
+from app.middlewares.read_your_writes import pinned_to_primary
 
 async def get_db():
     async with SessionLocal() as db:
         yield db
+
+async def wants_primary(request: Request) -> bool:
+    """True when the client asked for primary reads or wrote within the read-your-writes window."""
+    if request.headers.get(Config.READ_CONSISTENCY_HEADER, "").lower() == "primary":
+        return True
+    # Without replicas every read is a primary read: skip the token decode and pin lookup
+    return bool(read_router.replicas) and await pinned_to_primary(request)
+
+async def get_read_db(request: Request):
+    use_primary = await wants_primary(request)
+    factory = read_router.session_factory(use_primary=use_primary)
+    # Read by the response cache: pinned requests bypass it, replica reads never fill it
+    request.state.primary_requested = use_primary
+    request.state.read_from_replica = factory is not read_router.primary
+    async with factory() as db:
+        yield db
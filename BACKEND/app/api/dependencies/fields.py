@@ -0,0 +1,18 @@
+from fastapi import HTTPException, status
+
+
+def parse_field_list(value: str | None, allowed, param: str) -> list[str] | None:
+    """
+    Splits a comma-separated query parameter (`fields=a,b`), keeping order and
+    dropping duplicates. Names outside `allowed` are rejected with 400.
+    """
+    if value is None:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    unknown = [name for name in names if name not in allowed]
+    if unknown or not names:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid {param}: {', '.join(unknown) or 'empty'}. Allowed: {', '.join(allowed)}"
+        )
+    return names
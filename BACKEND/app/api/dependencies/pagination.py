@@ -0,0 +1,37 @@
+from typing import Collection, Mapping
+
+from fastapi import HTTPException, Response, status
+
+from app.database.pagination import Keyset, KeysetCursor
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def parse_cursor(cursor: str | None, model: type, sort_keys: Mapping[str, str] | Collection[str]) -> KeysetCursor | None:
+    """
+    Decodes the `cursor` query parameter, rejecting with 400 tampered or
+    malformed values, cursors sorting by a key outside `sort_keys` (sort key
+    -> `model` attribute, or attribute names) and values whose type does not
+    match that attribute's column.
+    """
+    if not cursor:
+        return None
+    try:
+        after = Keyset.decode(cursor)
+    except ValueError:
+        after = None
+    if after is not None and after.sort_by in sort_keys:
+        attribute = sort_keys[after.sort_by] if isinstance(sort_keys, Mapping) else after.sort_by
+        if Keyset.accepts(getattr(model, attribute), after.value):
+            return after
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+def set_next_cursor(response: Response | None, items: list, limit: int, sort_by: str, sort_order: str) -> None:
+    """Exposes the next page cursor on list endpoints whose body is a plain JSON array."""
+    if response is None:
+        return
+    next_cursor = Keyset.next_cursor(items, limit, sort_by, sort_order)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
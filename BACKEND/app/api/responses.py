@@ -0,0 +1,35 @@
+from functools import lru_cache
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (native datetime support, no indent)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@lru_cache(maxsize=None)
+def type_adapter(tp: Any) -> TypeAdapter:
+    """TypeAdapter per type, built once: building one compiles a validator and a serializer."""
+    return TypeAdapter(tp)
+
+
+def validated_response(tp: Any, data: Any, include: Any = None, **kwargs) -> Response:
+    """
+    Validates `data` against `tp` once and renders it with pydantic's JSON
+    serializer, keeping only the `include` fields when given (pydantic
+    include syntax). The bytes are those FastAPI would send for the model
+    (e.g. UTC datetimes end in "Z", which orjson would render as "+00:00").
+
+    Routes returning this bypass FastAPI's response_model validation and
+    serialization; the response_model stays on the route for the OpenAPI
+    schema only, so `tp` must match it. Rows returned by Session.execute
+    validate directly against models with from_attributes.
+    """
+    adapter = type_adapter(tp)
+    return Response(adapter.dump_json(adapter.validate_python(data), include=include), media_type="application/json", **kwargs)
@@ -12,6 +12,8 @@ from app.auth.password_hash import PasswordHasher
 from app.schemas.auth import PasswordResetRequest, PasswordResetConfirm
 from app.api.dependencies.auth import get_current_user, authenticate_refresh_token
 from app.utils.logger import log
+from app.utils.rate_limit import rate_limiter, form_field, json_field
+from app.config import Config
 from app.database.models import User
 
 router = APIRouter(
@@ -19,7 +21,14 @@ router = APIRouter(
     tags=["AUTHENTICATION"]
 )
 
-@router.post("/token", name="token")
+@router.post("/token", name="token", dependencies=[Depends(rate_limiter.limit(
+    "token",
+    per_ip=Config.RATE_LIMIT_TOKEN_PER_IP,
+    per_identity=Config.RATE_LIMIT_TOKEN_PER_USERNAME,
+    identity=form_field("username"),
+    identity_failure_status=status.HTTP_401_UNAUTHORIZED,
+    known_client_seconds=Config.RATE_LIMIT_TOKEN_KNOWN_CLIENT_SECONDS,
+))])
 async def get_token(
     request: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db),
@@ -37,11 +46,17 @@ async def get_token(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid credentials.",
         )
+    user_id, username = user.id, user.username
     result = await AuthService.get_new_tokens(db, user)
-    log.info("User logged in", extra={"user_id": user.id, "username": user.username})
+    log.info("User logged in", extra={"user_id": user_id, "username": username})
     return result
 
-@router.post("/password-reset/request", status_code=status.HTTP_200_OK)
+@router.post("/password-reset/request", status_code=status.HTTP_200_OK, dependencies=[Depends(rate_limiter.limit(
+    "password_reset_request",
+    per_ip=Config.RATE_LIMIT_PASSWORD_RESET_PER_IP,
+    per_identity=Config.RATE_LIMIT_PASSWORD_RESET_PER_EMAIL,
+    identity=json_field("email"),
+))])
 async def request_password_reset(
     data: PasswordResetRequest,
     db: AsyncSession = Depends(get_db),
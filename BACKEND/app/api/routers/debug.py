@@ -0,0 +1,51 @@
+from typing import Annotated, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.auth import require_permission
+from app.api.dependencies.database import get_db
+from app.api.responses import ORJSONResponse
+from app.config import Config
+from app.utils.logger import log
+from app.utils.profiler import profiler
+
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+
+# 🔸 GET /debug/profile - Sample this worker's event loop and tasks for N seconds
+@router.get("/profile", name="get_profile", dependencies=[require_permission("view_audit_logs")])
+async def get_profile(
+    seconds: Annotated[float, Query(gt=0, le=Config.PROFILE_MAX_SECONDS)] = 10,
+    interval: Annotated[float, Query(ge=0.001, le=1)] = Config.PROFILE_INTERVAL_SECONDS,
+    format: Annotated[Literal["json", "collapsed", "speedscope"], Query()] = "json",
+    db: AsyncSession = Depends(get_db),
+):
+    # The request waits out the profile: the sampler thread only reads stacks,
+    # so other requests on this worker keep being served (and show up in it)
+    if profiler.running:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="A profile is already running on this worker")
+    # The permission check's session (shared through get_db) would otherwise
+    # hold a pooled connection idle in transaction for the whole profile
+    await db.close()
+    log.info("Profile started", extra={"seconds": seconds, "interval": interval})
+    profile = await profiler.profile(seconds, interval)
+
+    if format == "collapsed":
+        return PlainTextResponse(profile.collapsed())
+    if format == "speedscope":
+        return ORJSONResponse(
+            profile.speedscope(),
+            headers={"Content-Disposition": 'attachment; filename="profile.speedscope.json"'},
+        )
+    return ORJSONResponse({
+        "seconds": round(profile.duration, 3),
+        "samples": profile.samples,
+        "sample_seconds": round(profile.sample_seconds, 6),
+        "coroutines": profile.coroutines(),
+        "stacks": [
+            {"stack": list(stack), "samples": count}
+            for stack, count in profile.stacks.most_common(20)
+        ],
+    })
@@ -1,13 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Annotated, Optional
 from datetime import datetime
 
-from app.api.dependencies.database import get_db
+from app.api.dependencies.database import get_db, get_read_db
+from app.api.dependencies.pagination import parse_cursor, set_next_cursor
 from app.api.dependencies.auth import get_current_user, require_permission
-from app.schemas import GroupCreate, GroupUpdate, GroupOut, AddUserToGroupForGroup, AddRoleToGroupForGroup, RoleOut, UserOut
+from app.api.dependencies.conditional import conditional_get
+from app.schemas import GroupCreate, GroupUpdate, GroupOut, AddUserToGroupForGroup, AddRoleToGroupForGroup, AddUsersToGroup, AddRolesToGroup, BulkAssignResponse, RoleOut, UserOut
 from app.database.services import GroupService, UserGroupService, GroupRoleService
 
-from app.database.models import User
+from app.database.models import User, Group
+from app.utils.response_cache import response_cache
 
 
 router = APIRouter(
@@ -32,29 +36,39 @@ async def create_group(
 
 
 # 🔸 GET /groups/ - List all groups
-@router.get("/", response_model=list[GroupOut], name="get_all_groups")
+@router.get("/", response_model=list[GroupOut], name="get_all_groups", dependencies=[Depends(conditional_get("groups"))])
+@response_cache.cached("groups", list[GroupOut])
 async def get_all_groups(
     skip: int = 0,
     limit: int = 10,
     sort_by: str = "created",
     sort_order: str = "desc",
-    db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_user)  # Requires authentication
+    db: AsyncSession = Depends(get_read_db),
+    _: User = Depends(get_current_user),  # Requires authentication
+    cursor: Annotated[Optional[str], Query(description="Cursor from the X-Next-Cursor header of the previous page; overrides skip, sort_by and sort_order")] = None,
+    response: Response = None
 ):
-    return await GroupService.get_all_groups(
+    after = parse_cursor(cursor, Group, GroupService.SORT_COLUMNS)
+    if after:
+        sort_by, sort_order = after.sort_by, after.sort_order
+    groups = await GroupService.get_all_groups(
         db,
         skip=skip,
         limit=limit,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=after
     )
+    set_next_cursor(response, groups, limit, sort_by, sort_order)
+    return groups
 
 
 # 🔸 GET /groups/{id} - Get group by ID
-@router.get("/{id}", response_model=GroupOut, name="get_group")
+@router.get("/{id}", response_model=GroupOut, name="get_group", dependencies=[Depends(conditional_get("groups"))])
+@response_cache.cached("groups", GroupOut, id_param="id")
 async def get_group(
     id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(get_current_user)  # Requires authentication
 ):
     group = await GroupService.get_group_by_id(db, id)
@@ -119,6 +133,29 @@ async def add_user_to_group(
         "timestamp": datetime.now()
         }
 
+# POST /groups/{id}/add_users - Add many users to group in one transaction
+@router.post("/{group_id}/add_users", name="add_users_to_group", response_model=BulkAssignResponse, dependencies=[require_permission("assign_user_to_group")])
+async def add_users_to_group(
+    group_id: int,
+    request_data: AddUsersToGroup,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    statuses = await UserGroupService.assign_users_to_group(
+        db=db,
+        group_id=group_id,
+        user_ids=request_data.user_ids,
+        valid_from=request_data.valid_from,
+        valid_until=request_data.valid_until,
+        created_by=current_user.id
+    )
+    if statuses is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to add users to group. Check if the group exists."
+        )
+    return BulkAssignResponse.from_statuses(statuses)
+
 # POST /group/{id}/remove_user
 @router.post("/{group_id}/remove_user", name="remove_user_from_group", status_code=status.HTTP_202_ACCEPTED, dependencies=[require_permission("remove_user_from_group")])
 async def remove_user_from_group(
@@ -178,6 +215,29 @@ async def assign_role_to_group(
         "timestamp": datetime.now()
         }
     
+# POST /groups/{group_id}/assign_roles - Assign many roles to group in one transaction
+@router.post("/{group_id}/assign_roles", name="assign_roles_to_group", response_model=BulkAssignResponse, dependencies=[require_permission("remove_user_from_group")])
+async def assign_roles_to_group(
+    group_id: int,
+    request_data: AddRolesToGroup,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    statuses = await GroupRoleService.assign_roles_to_group(
+        db=db,
+        group_id=group_id,
+        role_ids=request_data.role_ids,
+        valid_from=request_data.valid_from,
+        valid_until=request_data.valid_until,
+        created_by=current_user.id
+    )
+    if statuses is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to assign roles to group. Check if the group exists."
+        )
+    return BulkAssignResponse.from_statuses(statuses)
+
 # POST /groups/{group_id}/remove_role   
 @router.post("/{group_id}/remove_role", name="remove_role_from_group", status_code=status.HTTP_202_ACCEPTED, dependencies=[require_permission("remove_user_from_group")])
 async def remove_role_from_group(
@@ -210,7 +270,7 @@ async def get_roles_of_group(
     return roles
 
 # 🔸 GET /groups/name/{name} - Get group by name
-@router.get("/name/{name}", response_model=GroupOut, name="get_group_by_name")
+@router.get("/name/{name}", response_model=GroupOut, name="get_group_by_name", dependencies=[Depends(conditional_get("groups", db_dependency=get_db))])
 async def get_group_by_name(
     name: str,
     db: AsyncSession = Depends(get_db),
@@ -5,7 +5,7 @@ from app.config import Config
 from app.api.dependencies.database import get_db
 from datetime import datetime, timezone
 import os
-from app.database.models import engine, Base
+from app.database.models import engine, writer_engine, read_router, Base
 from alembic.config import Config as AlembicConfig
 from alembic import command
 
@@ -80,6 +80,8 @@ async def reset_db():
     try:
         # 1. Dispose engine connections to avoid database locks
         await engine.dispose()
+        await writer_engine.dispose()
+        await read_router.dispose()
 
         # 2. Check if SQLite and delete the database files
         db_path = None
@@ -119,6 +121,8 @@ async def reset_db():
 
         # 4. Dispose engine again to clean up migration connections
         await engine.dispose()
+        await writer_engine.dispose()
+        await read_router.dispose()
 
         return {"status": "SUCCESS", "message": "Database reset completed successfully"}
     except Exception as exc:
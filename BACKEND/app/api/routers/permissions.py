@@ -1,12 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import Annotated, List, Optional
 
-from app.api.dependencies.database import get_db
+from app.api.dependencies.database import get_db, get_read_db
+from app.api.dependencies.pagination import parse_cursor, set_next_cursor
 from app.api.dependencies.auth import get_current_user, require_permission
+from app.api.dependencies.conditional import conditional_get
 from app.schemas import PermissionCreate, PermissionUpdate, PermissionOut, AddPermissionToRoleForPermission, RoleOut
 from app.database.services import PermissionService, RolePermissionService
-from app.database.models import User
+from app.database.models import User, Permission
+from app.utils.response_cache import response_cache
 
 router = APIRouter(
     prefix="/permissions", 
@@ -31,29 +34,39 @@ async def create_permission(
 
 
 # 🔸 GET /permissions/ - List all permissions
-@router.get("/", response_model=list[PermissionOut], name="get_all_permissions")
+@router.get("/", response_model=list[PermissionOut], name="get_all_permissions", dependencies=[Depends(conditional_get("permissions"))])
+@response_cache.cached("permissions", list[PermissionOut])
 async def get_all_permissions(
     skip: int = 0,
     limit: int = 10,
     sort_by: str = "created",
     sort_order: str = "desc",
-    db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_user)
+    db: AsyncSession = Depends(get_read_db),
+    _: User = Depends(get_current_user),
+    cursor: Annotated[Optional[str], Query(description="Cursor from the X-Next-Cursor header of the previous page; overrides skip, sort_by and sort_order")] = None,
+    response: Response = None
 ):
-    return await PermissionService.get_all_permissions(
+    after = parse_cursor(cursor, Permission, PermissionService.SORT_COLUMNS)
+    if after:
+        sort_by, sort_order = after.sort_by, after.sort_order
+    permissions = await PermissionService.get_all_permissions(
         db,
         skip=skip,
         limit=limit,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=after
     )
+    set_next_cursor(response, permissions, limit, sort_by, sort_order)
+    return permissions
 
 
 # 🔸 GET /permissions/{id} - Get permission by ID
-@router.get("/{id}", response_model=PermissionOut, name="get_permission")
+@router.get("/{id}", response_model=PermissionOut, name="get_permission", dependencies=[Depends(conditional_get("permissions"))])
+@response_cache.cached("permissions", PermissionOut, id_param="id")
 async def get_permission(
     id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(get_current_user)
 ):
     permission = await PermissionService.get_permission_by_id(db, id)
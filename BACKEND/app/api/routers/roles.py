@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Annotated, Optional
 
-from app.api.dependencies.database import get_db
+from app.api.dependencies.database import get_db, get_read_db
+from app.api.dependencies.pagination import parse_cursor, set_next_cursor
 from app.api.dependencies.auth import get_current_user, require_permission
-from app.schemas import RoleCreate, RoleUpdate, RoleOut, AddRoleToUserForRole, AddRoleToGroupForRole, AddPermissionToRoleForRole, PermissionOut, UserOut, GroupOut
+from app.api.dependencies.conditional import conditional_get
+from app.schemas import RoleCreate, RoleUpdate, RoleOut, AddRoleToUserForRole, AddRoleToGroupForRole, AddPermissionToRoleForRole, AddPermissionsToRole, BulkAssignResponse, PermissionOut, UserOut, GroupOut
 from app.database.services import RoleService, UserRoleService, GroupRoleService, RolePermissionService, UserService
-from app.database.models import User
+from app.database.models import User, Role
 from app.utils.logger import log
+from app.utils.response_cache import response_cache
 
 
 router = APIRouter(
@@ -31,29 +35,39 @@ async def create_role(
 
 
 # 🔸 GET /roles/ - List all roles
-@router.get("/", response_model=list[RoleOut], name="get_all_roles")
+@router.get("/", response_model=list[RoleOut], name="get_all_roles", dependencies=[Depends(conditional_get("roles"))])
+@response_cache.cached("roles", list[RoleOut])
 async def get_all_roles(
     skip: int = 0,
     limit: int = 10,
     sort_by: str = "created",
     sort_order: str = "desc",
-    db: AsyncSession = Depends(get_db),
-    _: User = Depends(get_current_user)  # Requires authentication
+    db: AsyncSession = Depends(get_read_db),
+    _: User = Depends(get_current_user),  # Requires authentication
+    cursor: Annotated[Optional[str], Query(description="Cursor from the X-Next-Cursor header of the previous page; overrides skip, sort_by and sort_order")] = None,
+    response: Response = None
 ):
-    return await RoleService.get_all_roles(
+    after = parse_cursor(cursor, Role, RoleService.SORT_COLUMNS)
+    if after:
+        sort_by, sort_order = after.sort_by, after.sort_order
+    roles = await RoleService.get_all_roles(
         db,
         skip=skip,
         limit=limit,
         sort_by=sort_by,
-        sort_order=sort_order
+        sort_order=sort_order,
+        cursor=after
     )
+    set_next_cursor(response, roles, limit, sort_by, sort_order)
+    return roles
 
 
 # 🔸 GET /roles/{id} - Get role by ID
-@router.get("/{id}", response_model=RoleOut, name="get_role")
+@router.get("/{id}", response_model=RoleOut, name="get_role", dependencies=[Depends(conditional_get("roles"))])
+@response_cache.cached("roles", RoleOut, id_param="id")
 async def get_role(
     id: int,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(get_current_user)  # Requires authentication
 ):
     role = await RoleService.get_role_by_id(db, id)
@@ -234,6 +248,27 @@ async def add_permission_to_role(
         )
     return {"message": "Permission added to role"}
 
+# POST /roles/{role_id}/assign_permissions - Add many permissions to role in one transaction
+@router.post("/{role_id}/assign_permissions", response_model=BulkAssignResponse, name="add_permissions_to_role", dependencies=[require_permission("assign_role_to_user")])
+async def add_permissions_to_role(
+    role_id: int,
+    request_data: AddPermissionsToRole,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    statuses = await RolePermissionService.assign_permissions_to_role(
+        db=db,
+        role_id=role_id,
+        permission_ids=request_data.permission_ids,
+        created_by=current_user.id
+    )
+    if statuses is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to add permissions to role. Check if the role exists."
+        )
+    return BulkAssignResponse.from_statuses(statuses)
+
 # POST /roles/{role_id}/remove_permission/ - Remove permission from role
 @router.post("/{role_id}/remove_permission", status_code=status.HTTP_202_ACCEPTED, name="remove_permission_from_role", dependencies=[require_permission("assign_role_to_user")])
 async def remove_permission_from_role(
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.dependencies.auth import require_permission
+from app.api.dependencies.database import get_read_db
+from app.api.responses import validated_response
+from app.config import Config
+from app.database.services import StatsService
+from app.schemas import StatsSummary
+from app.utils.response_cache import response_cache
+
+router = APIRouter(prefix="/stats", tags=["Stats"])
+
+
+# 🔸 GET /stats/summary - Dashboard counts, recent sign-ups and assignments expiring soon
+@router.get("/summary", response_model=StatsSummary, name="get_stats_summary", dependencies=[require_permission("search_user")])
+async def get_stats_summary(request: Request, db: AsyncSession = Depends(get_read_db)):
+    # The summary is the same for every caller allowed to see it: the rendered
+    # body is shared through the response cache backend for a short TTL. No
+    # write invalidates it, so replica reads fill it too: it is at most the
+    # TTL plus the replica's lag behind
+    key = f"stats-summary:{Config.VERSION}"
+    lookup = response_cache.enabled and response_cache.lookup_allowed(request)
+    body = await response_cache.backend.get(key) if lookup else None
+    if body is None:
+        body = validated_response(StatsSummary, await StatsService.get_summary(db)).body
+        if response_cache.enabled:
+            await response_cache.backend.set(key, body, Config.STATS_SUMMARY_TTL_SECONDS)
+    return Response(body, media_type="application/json")
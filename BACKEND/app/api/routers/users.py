@@ -1,22 +1,35 @@
 from datetime import datetime,timezone
-from fastapi import APIRouter, Depends, HTTPException, Path, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Request, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional, Annotated
+from typing import List, Literal, Optional, Annotated
 from sqlalchemy import select, func, or_, desc, asc
 from sqlalchemy.orm import joinedload
 
-from app.api.dependencies.database import get_db
-from app.schemas import UserCreate, UserUpdate, UserOut, UsersResponse, AddUserToGroupForUser, AddRoleToUserForUser, GroupOut, RoleOut
-from app.database.services import UserService, UserRoleService, UserGroupService
+from app.api.dependencies.database import get_db, get_read_db
+from app.api.dependencies.pagination import parse_cursor
+from app.api.dependencies.fields import parse_field_list
+from app.api.responses import validated_response
+from app.database.pagination import Keyset
+from app.schemas import UserCreate, UserUpdate, UserOut, UsersResponse, UsersPartialResponse, UserImportReport, AddUserToGroupForUser, AddRoleToUserForUser, AddRolesToUser, BulkAssignResponse, GroupOut, RoleOut
+from app.database.services import UserService, UserRoleService, UserGroupService, RoleService, UserImportService, UserExportService
 from app.database.models import User, Role, Group
 from app.api.dependencies.auth import get_current_user, require_permission
+from app.api.dependencies.conditional import conditional_get
+from app.utils.rate_limit import rate_limiter
+from app.config import Config
 from app.utils.logger import log
 import random
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
+# Columns the listing selects: exactly what UserOut renders
+USER_OUT_COLUMNS = list(UserOut.model_fields)
+# Memberships the listing can aggregate into each user (expand=)
+USER_EXPANSIONS = ["roles", "groups"]
+
 # 🔸 POST /users/ - Register a new user (async)
-@router.post("/", response_model=UserOut, status_code=status.HTTP_201_CREATED, name="create_user")
+@router.post("/", response_model=UserOut, status_code=status.HTTP_201_CREATED, name="create_user", dependencies=[Depends(rate_limiter.limit("create_user", per_ip=Config.RATE_LIMIT_CREATE_USER_PER_IP))])
 async def create_user(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     user = await UserService.create_user(db, user_data)
     if not user:
@@ -41,8 +54,42 @@ async def create_user(user_data: UserCreate, db: AsyncSession = Depends(get_db))
 
     return user
 
+# 🔸 POST /users/import - Bulk create users from a streamed CSV or NDJSON body (async)
+@router.post("/import", response_model=UserImportReport, name="import_users", dependencies=[require_permission("create_user")])
+async def import_users(
+    request: Request,
+    role_id: Annotated[Optional[int], Query(description="Role assigned to every imported user")] = None,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    content_type = request.headers.get("content-type", "")
+    if "csv" in content_type:
+        file_format = "csv"
+    elif "ndjson" in content_type or "jsonl" in content_type:
+        file_format = "ndjson"
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson"
+        )
+    if role_id is not None and not await RoleService.get_role_by_id(db, role_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Role not found."
+        )
+    records = UserImportService.read_records(UserImportService.read_lines(request.stream()), file_format)
+    try:
+        report = await UserImportService.import_users(db, records, role_id=role_id, created_by=current_user.id)
+    except UnicodeDecodeError:
+        # Chunks before the bad bytes are already committed
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Body is not valid UTF-8"
+        )
+    return report
+
 # 🔸 GET /users/me - Get current user profile (async)
-@router.get("/me", response_model=UserOut, name="get_me")
+@router.get("/me", response_model=UserOut, name="get_me", dependencies=[Depends(conditional_get("users", db_dependency=get_db, per_user=True))])
 async def get_me(current_user: User = Depends(get_current_user)):
     return current_user
 
@@ -80,9 +127,21 @@ async def get_all_users(
     role: Optional[str] = Query(None, description="Filter by user role"),
     group: Optional[str] = Query(None, description="Filter by user group"),
     search: Optional[str] = Query(None, description="Search term on username or email"),
-    session: AsyncSession = Depends(get_db)      # DB session
+    cursor: Annotated[Optional[str], Query(description="next_cursor of the previous page; overrides page, sort and order")] = None,
+    total: Annotated[Literal["exact", "estimate", "none"], Query(description="How to compute total: exact count, cheap estimate, or skip it")] = "exact",
+    fields: Annotated[Optional[str], Query(description="Comma-separated user fields to return; id is always included")] = None,
+    expand: Annotated[Optional[str], Query(description="Comma-separated memberships to include: roles, groups")] = None,
+    session: AsyncSession = Depends(get_read_db)      # DB session
 ):
-    total, users = await UserService.get_all_users(
+    selected = parse_field_list(fields, USER_OUT_COLUMNS, "fields")
+    expanded = parse_field_list(expand, USER_EXPANSIONS, "expand")
+    after = parse_cursor(cursor, User, UserService.SORT_COLUMNS)
+    if after:
+        sort, order = after.sort_by, after.sort_order
+    elif sort not in UserService.SORT_COLUMNS:
+        # The service sorts unknown keys by created; the cursor must name it
+        sort = "created"
+    total_count, users = await UserService.get_all_users(
         db=session,
         page=page,
         limit=limit,
@@ -91,20 +150,61 @@ async def get_all_users(
         status=status,
         role=role,
         group=group,
-        search=search
-    )
-    # Convert ORM objects to Pydantic schemas
-    users_data = [UserOut.model_validate(u) for u in users]
-    # Assemble full paginated response
-    return UsersResponse(
-        page=page,
-        limit=limit,
-        total=total,
-        users=users_data
+        search=search,
+        cursor=after,
+        total_mode=total,
+        columns=selected or USER_OUT_COLUMNS,
+        expand=expanded
     )
+    # Rows are validated once, straight into the serialized page
+    listing = {
+        "page": page,
+        "limit": limit,
+        "total": total_count,
+        "total_mode": total,
+        "users": users,
+        "next_cursor": Keyset.next_cursor(users, limit, sort, order.lower(), UserService.SORT_COLUMNS[sort]),
+    }
+    if not (selected or expanded):
+        return validated_response(UsersResponse, listing)
+    if expanded:
+        listing["users"] = [
+            {**row._mapping, **{kind: UserService.split_names(row._mapping[kind]) for kind in expanded}}
+            for row in users
+        ]
+    # The query also selects the sort column, which is only rendered when asked for
+    rendered = {"id", *(selected or USER_OUT_COLUMNS), *(expanded or [])}
+    include = {name: True for name in UsersPartialResponse.model_fields} | {"users": {"__all__": rendered}}
+    return validated_response(UsersPartialResponse, listing, include=include)
+
+# 🔸 GET /users/search - Autocomplete on username/email, prefix matches first (async)
+@router.get("/search", response_model=List[UserOut], name="search_users", dependencies=[require_permission("search_user")])
+async def search_users(
+    q: Annotated[str, Query(min_length=1, max_length=100, description="Username or email fragment")],
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+    session: AsyncSession = Depends(get_read_db)
+):
+    return await UserService.search_users(db=session, q=q, limit=limit)
+
+# 🔸 GET /users/export - Stream every live user with role/group names as NDJSON or CSV (async)
+@router.get("/export", name="export_users", dependencies=[require_permission("search_user")])
+async def export_users(
+    export_format: Annotated[Literal["ndjson", "csv"], Query(alias="format", description="Output format")] = "ndjson",
+    status: Annotated[Optional[bool], Query(description="Only active (true) or inactive (false) users")] = None,
+    session: AsyncSession = Depends(get_read_db)
+):
+    # The session stays open until the last chunk has been sent
+    rows = UserExportService.stream_rows(session, status=status)
+    if export_format == "csv":
+        return StreamingResponse(
+            UserExportService.csv(rows),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="users.csv"'}
+        )
+    return StreamingResponse(UserExportService.ndjson(rows), media_type="application/x-ndjson")
 
 # 🔸 GET /users/{id} - Admin only access to fetch any user (async)
-@router.get("/{id}", response_model=UserOut, name="get_by_id", dependencies=[require_permission("search_user")])
+@router.get("/{id}", response_model=UserOut, name="get_by_id", dependencies=[require_permission("search_user"), Depends(conditional_get("users", db_dependency=get_db))])
 async def get_user_by_id(
     id: int,
     db: AsyncSession = Depends(get_db),
@@ -247,6 +347,29 @@ async def assigne_role_to_user(
         )
     return {"message": "Role assigned to user successfully"}
 
+# 🔸 POST /users/{user_id}/assign_roles - Assign many roles to user in one transaction (async)
+@router.post("/{user_id}/assign_roles", response_model=BulkAssignResponse, name="assign_roles_to_user", dependencies=[require_permission("assign_role_to_user")])
+async def assign_roles_to_user(
+    user_id: int,
+    request_data: AddRolesToUser,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    statuses = await UserRoleService.assign_roles_to_user(
+        db=db,
+        user_id=user_id,
+        role_ids=request_data.role_ids,
+        valid_from=request_data.valid_from,
+        valid_until=request_data.valid_until,
+        created_by=current_user.id
+    )
+    if statuses is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to assign roles to user. Check if the user exists and is active."
+        )
+    return BulkAssignResponse.from_statuses(statuses)
+
 @router.post("/{user_id}/remove_role", status_code=status.HTTP_202_ACCEPTED, dependencies=[require_permission("assign_role_to_user")])
 async def remove_role_from_user(
     user_id: int,
@@ -1,5 +1,10 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from passlib.context import CryptContext
 
+from app.config import Config
+
 class PasswordHasher:
     # We set deprecated="auto" and define bcrypt context
     _pwd_context = CryptContext(
@@ -7,6 +12,8 @@ class PasswordHasher:
         deprecated="auto",
         bcrypt__min_rounds=12
     )
+    # Worker processes for bulk hashing, created on first use
+    _pool: ProcessPoolExecutor | None = None
 
     @staticmethod
     def get_password_hash(password: str) -> str:
@@ -15,3 +22,36 @@ class PasswordHasher:
     @staticmethod
     def verify_password(plain_password: str, hashed_password: str) -> bool:
         return PasswordHasher._pwd_context.verify(plain_password, hashed_password)
+
+    @staticmethod
+    async def hash_many(passwords: list[str]) -> list[str]:
+        """
+        Hashes passwords in parallel on a process pool (bcrypt is CPU bound and
+        holds the GIL), keeping the event loop free. With PASSWORD_HASH_WORKERS=0
+        the hashes run on the default thread executor instead.
+        """
+        loop = asyncio.get_running_loop()
+        pool = PasswordHasher._get_pool()
+        return list(await asyncio.gather(
+            *(loop.run_in_executor(pool, PasswordHasher.get_password_hash, password) for password in passwords)
+        ))
+
+    @staticmethod
+    def _get_pool() -> ProcessPoolExecutor | None:
+        if Config.PASSWORD_HASH_WORKERS <= 0:
+            return None
+        if PasswordHasher._pool is None:
+            # spawn: forking a process that already runs the event loop and
+            # driver threads can copy held locks into the children
+            PasswordHasher._pool = ProcessPoolExecutor(
+                max_workers=Config.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return PasswordHasher._pool
+
+    @staticmethod
+    async def shutdown() -> None:
+        """Stops the worker processes (app lifespan); the next bulk hash starts a new pool."""
+        pool, PasswordHasher._pool = PasswordHasher._pool, None
+        if pool is not None:
+            await asyncio.to_thread(pool.shutdown, cancel_futures=True)
@@ -22,7 +22,93 @@ class Config:
     else:
         DATABASE_URL = os.getenv("DATABASE_URL",f"{DATABASE_DRIVER}://{DATABASE_USERNAME}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}/{APPLICATION_NAME}")
         DATABASE_URL_ALEMBIC = os.getenv("DATABASE_URL_ALEMBIC",f"{DATABASE_DRIVER_SYNC}://{DATABASE_USERNAME}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}/{APPLICATION_NAME}")
-    
+
+    # Connection Pool Configuration
+    DATABASE_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", 5))
+    DATABASE_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", 10))
+    DATABASE_POOL_TIMEOUT = float(os.getenv("DATABASE_POOL_TIMEOUT", 30))
+    DATABASE_POOL_RECYCLE = int(os.getenv("DATABASE_POOL_RECYCLE", 1800))
+    DATABASE_POOL_PRE_PING = os.getenv("DATABASE_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+
+    # Statement caching: compiled SQL cache per engine and asyncpg prepared statements per connection
+    DATABASE_QUERY_CACHE_SIZE = int(os.getenv("DATABASE_QUERY_CACHE_SIZE", 1200))
+    DATABASE_PREPARED_STATEMENT_CACHE_SIZE = int(os.getenv("DATABASE_PREPARED_STATEMENT_CACHE_SIZE", 500))
+
+    # SQLite production profile: WAL + pragmas on every connection and a single
+    # serialized writer connection, reads go through the regular pool.
+    SQLITE_PRODUCTION_MODE = os.getenv("SQLITE_PRODUCTION_MODE", "true").lower() in ("1", "true", "yes")
+    SQLITE_PRAGMAS = {
+        "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+        "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", -64000)),  # negative = KiB, i.e. 64 MB
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", 268_435_456)),
+        "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+    }
+
+    # Read replicas: comma separated async URLs used round-robin by get_read_db.
+    # After a successful write a user keeps reading from the primary for
+    # READ_YOUR_WRITES_SECONDS, or on demand with the header below. Pins are
+    # kept per token subject in READ_YOUR_WRITES_BACKEND: "memory" (per
+    # process, refused with replicas when WEB_CONCURRENCY > 1), "database"
+    # (shared by every worker) or "package.module:ClassName".
+    DATABASE_READ_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_READ_REPLICA_URLS", "").split(",") if url.strip()]
+    READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", 5))
+    READ_YOUR_WRITES_BACKEND = os.getenv("READ_YOUR_WRITES_BACKEND", "memory")
+    READ_YOUR_WRITES_SWEEP_SECONDS = float(os.getenv("READ_YOUR_WRITES_SWEEP_SECONDS", 60))
+    WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 1))
+    READ_CONSISTENCY_HEADER = os.getenv("READ_CONSISTENCY_HEADER", "X-Read-Consistency")
+
+    # Bulk user import: rows validated, hashed and inserted per chunk; bcrypt
+    # runs on PASSWORD_HASH_WORKERS processes (0 = default thread executor)
+    USER_IMPORT_CHUNK_SIZE = int(os.getenv("USER_IMPORT_CHUNK_SIZE", 1000))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 1))
+
+    # Bulk association endpoints: ids accepted per request and rows per INSERT ... ON CONFLICT
+    BULK_ASSIGN_MAX_IDS = int(os.getenv("BULK_ASSIGN_MAX_IDS", 10_000))
+    BULK_ASSIGN_BATCH_SIZE = int(os.getenv("BULK_ASSIGN_BATCH_SIZE", 500))
+
+    # User export: rows fetched per server-side cursor round trip and written per response chunk
+    USER_EXPORT_CHUNK_SIZE = int(os.getenv("USER_EXPORT_CHUNK_SIZE", 1000))
+
+    # Response cache for the role/group/permission read endpoints. The backend is
+    # "memory" (per process) or "package.module:ClassName" of a shared CacheBackend
+    RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    RESPONSE_CACHE_BACKEND = os.getenv("RESPONSE_CACHE_BACKEND", "memory")
+    RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 60))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 1024))
+
+    # Cache invalidation bus between workers: "auto" (Postgres LISTEN/NOTIFY, SQLite polling
+    # of invalidation_log), "postgres", "sqlite", "local" (this process only) or "package.module:ClassName"
+    INVALIDATION_BUS_BACKEND = os.getenv("INVALIDATION_BUS_BACKEND", "auto")
+    INVALIDATION_BUS_CHANNEL = os.getenv("INVALIDATION_BUS_CHANNEL", "cache_invalidation")
+    INVALIDATION_POLL_SECONDS = float(os.getenv("INVALIDATION_POLL_SECONDS", 1))
+    INVALIDATION_LOG_RETENTION_SECONDS = float(os.getenv("INVALIDATION_LOG_RETENTION_SECONDS", 300))
+
+    # Stats summary: sign-up window and expiry horizon in days, rows listed per section, cache TTL
+    STATS_RECENT_SIGNUP_DAYS = int(os.getenv("STATS_RECENT_SIGNUP_DAYS", 7))
+    STATS_EXPIRING_WITHIN_DAYS = int(os.getenv("STATS_EXPIRING_WITHIN_DAYS", 7))
+    STATS_LIST_LIMIT = int(os.getenv("STATS_LIST_LIMIT", 10))
+    STATS_SUMMARY_TTL_SECONDS = float(os.getenv("STATS_SUMMARY_TTL_SECONDS", 30))
+
+    # Rate limits ("<count>/<second|minute|hour|day>", empty = no limit) per route, with one
+    # token bucket per client IP and one per submitted username or email. The backend is
+    # "memory" (per process), "database" (shared by every worker) or "package.module:ClassName".
+    # Behind proxies, RATE_LIMIT_TRUSTED_PROXIES is how many of them append to X-Forwarded-For.
+    # Only failed logins charge the username bucket, which an IP that logged in as that user
+    # skips for RATE_LIMIT_TOKEN_KNOWN_CLIENT_SECONDS
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+    RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_SWEEP_SECONDS = float(os.getenv("RATE_LIMIT_SWEEP_SECONDS", 60))
+    RATE_LIMIT_TRUST_FORWARDED_FOR = os.getenv("RATE_LIMIT_TRUST_FORWARDED_FOR", "false").lower() in ("1", "true", "yes")
+    RATE_LIMIT_TRUSTED_PROXIES = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", 1))
+    RATE_LIMIT_TOKEN_PER_IP = os.getenv("RATE_LIMIT_TOKEN_PER_IP", "30/minute")
+    RATE_LIMIT_TOKEN_PER_USERNAME = os.getenv("RATE_LIMIT_TOKEN_PER_USERNAME", "10/minute")
+    RATE_LIMIT_TOKEN_KNOWN_CLIENT_SECONDS = float(os.getenv("RATE_LIMIT_TOKEN_KNOWN_CLIENT_SECONDS", 30 * 86400))
+    RATE_LIMIT_PASSWORD_RESET_PER_IP = os.getenv("RATE_LIMIT_PASSWORD_RESET_PER_IP", "10/minute")
+    RATE_LIMIT_PASSWORD_RESET_PER_EMAIL = os.getenv("RATE_LIMIT_PASSWORD_RESET_PER_EMAIL", "5/hour")
+    RATE_LIMIT_CREATE_USER_PER_IP = os.getenv("RATE_LIMIT_CREATE_USER_PER_IP", "20/hour")
+
     #TOKEN Configuration
     ACCESS_TOKEN_EXPIRE_MINUTES = os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES",30)
     REFRESH_TOKEN_EXPIRE_DAYS = os.getenv("REFRESH_TOKEN_EXPIRE_DAYS",30)
@@ -37,6 +123,60 @@ class Config:
     LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", 5_000_000))
     LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", 2))
 
+    # Log sampling: fraction (0.0 - 1.0) of each hot-path event that is written.
+    # Warnings/errors and slow or failed requests are always written.
+    LOG_SAMPLE_RATES = {
+        "request_received": float(os.getenv("LOG_SAMPLE_RATE_REQUEST_RECEIVED", 0.1)),
+        "request_completed": float(os.getenv("LOG_SAMPLE_RATE_REQUEST_COMPLETED", 0.1)),
+        "No incoming correlation ID found; generating a new one.": float(os.getenv("LOG_SAMPLE_RATE_NO_CORRELATION_ID", 0.1)),
+        "Permission check passed": float(os.getenv("LOG_SAMPLE_RATE_PERMISSION_CHECK", 0.1)),
+        "Refresh Token retrieved from DB": float(os.getenv("LOG_SAMPLE_RATE_REFRESH_TOKEN_LOOKUP", 0.1)),
+    }
+    LOG_SAMPLE_SLOW_REQUEST_MS = float(os.getenv("LOG_SAMPLE_SLOW_REQUEST_MS", 1000))
+
+    # SQL query budgets: statements a request may run, by route name (QUERY_BUDGET_DEFAULT
+    # for the others). "log" warns with the statements and counts requests over budget;
+    # "off" skips the check. tests/integration asserts the same budgets.
+    QUERY_BUDGET_MODE = os.getenv("QUERY_BUDGET_MODE", "log")
+    QUERY_BUDGET_DEFAULT = int(os.getenv("QUERY_BUDGET_DEFAULT", 30))
+    QUERY_BUDGET_LOG_STATEMENTS = int(os.getenv("QUERY_BUDGET_LOG_STATEMENTS", 20))
+    QUERY_BUDGETS = {
+        "token": 5,
+        "refresh_access_token": 6,
+        "get_me": 2,
+        "get_by_id": 6,
+        "get_all_users": 5,
+        "search_users": 7,
+        "get_roles_of_user": 6,
+        "get_groups_of_user": 6,
+        "get_role": 3,
+        "get_group": 3,
+        "get_permission": 3,
+        "get_stats_summary": 7,
+        "get_all_roles": 3,
+        "get_all_groups": 3,
+        "get_all_permissions": 3,
+    }
+
+    # Database metrics from engine events (app/utils/monitoring.py): statement latency and
+    # rows per fingerprint, transactions per outcome. Fingerprints past the maximum share "other".
+    DB_METRICS_ENABLED = os.getenv("DB_METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+    DB_METRICS_MAX_FINGERPRINTS = int(os.getenv("DB_METRICS_MAX_FINGERPRINTS", 500))
+    DB_METRICS_STATEMENT_LENGTH = int(os.getenv("DB_METRICS_STATEMENT_LENGTH", 300))
+
+    # Event loop monitor: lag sampled every LOOP_MONITOR_INTERVAL_SECONDS; a watchdog thread
+    # logs the loop thread's stack (innermost LOOP_BLOCKED_STACK_LIMIT frames) with the
+    # request's correlation ID when the loop is blocked for LOOP_BLOCKED_THRESHOLD_SECONDS
+    LOOP_MONITOR_ENABLED = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() in ("1", "true", "yes")
+    LOOP_MONITOR_INTERVAL_SECONDS = float(os.getenv("LOOP_MONITOR_INTERVAL_SECONDS", 0.1))
+    LOOP_BLOCKED_THRESHOLD_SECONDS = float(os.getenv("LOOP_BLOCKED_THRESHOLD_SECONDS", 0.5))
+    LOOP_BLOCKED_STACK_LIMIT = int(os.getenv("LOOP_BLOCKED_STACK_LIMIT", 30))
+
+    # On-demand profiler (GET /debug/profile, view_audit_logs permission): longest profile a
+    # request may ask for and the default sampling interval
+    PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", 60))
+    PROFILE_INTERVAL_SECONDS = float(os.getenv("PROFILE_INTERVAL_SECONDS", 0.01))
+
     # Add Admin user default info
     ADMIN_USER = {
         "firstname": os.getenv("ADMIN_FIRSTNAME", "Admin"),
@@ -0,0 +1,92 @@
+from sqlalchemy import Select, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.config import Config
+from app.utils.invalidation import LinkChanged, invalidation_bus
+
+
+class BulkLinks:
+    """
+    Bulk create-or-restore of association rows (users_groups, users_roles, ...).
+
+    One owner (the path id) is linked to many targets: the targets are
+    validated with one IN query, the links that already exist are looked up
+    with a second one, and all links are written with multi-row
+    INSERT ... ON CONFLICT DO UPDATE statements of BULK_ASSIGN_BATCH_SIZE rows
+    inside a single transaction.
+    """
+
+    CREATED = "created"
+    UPDATED = "updated"
+    NOT_FOUND = "not_found"
+
+    @staticmethod
+    def upsert(db: AsyncSession, model: type, key_columns: list[str], rows: list[dict]):
+        """Multi-row INSERT that updates the non-key columns of rows that already exist."""
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            statement = postgresql.insert(model).values(rows)
+        elif dialect == "sqlite":
+            statement = sqlite.insert(model).values(rows)
+        else:
+            raise NotImplementedError(f"Bulk upsert is not supported on {dialect}")
+        updates = {column: statement.excluded[column] for column in rows[0] if column not in key_columns}
+        updates["updated_at"] = func.now()
+        return statement.on_conflict_do_update(index_elements=key_columns, set_=updates)
+
+    @staticmethod
+    async def assign(
+        db: AsyncSession,
+        owner_column: InstrumentedAttribute,
+        owner_id: int,
+        target_column: InstrumentedAttribute,
+        target_ids: list[int],
+        valid_targets: Select,
+        values: dict,
+    ) -> dict[int, str] | None:
+        """
+        Links `owner_id` to every id of `target_ids` returned by `valid_targets`
+        (a SELECT of ids), restoring soft-deleted links and overwriting `values`
+        on existing ones. Returns the status of each requested id in request
+        order, or None when the transaction failed.
+        """
+        model = owner_column.class_
+        target_ids = list(dict.fromkeys(target_ids))
+        found = set((await db.execute(valid_targets)).scalars().all())
+        existing = set()
+        if found:
+            existing = set((await db.execute(
+                select(target_column).where(owner_column == owner_id, target_column.in_(found))
+            )).scalars().all())
+
+        rows = [
+            {owner_column.key: owner_id, target_column.key: target_id, "is_deleted": False, **values}
+            for target_id in target_ids
+            if target_id in found
+        ]
+        key_columns = [owner_column.key, target_column.key]
+        batch_size = Config.BULK_ASSIGN_BATCH_SIZE
+        try:
+            for start in range(0, len(rows), batch_size):
+                await db.execute(BulkLinks.upsert(db, model, key_columns, rows[start:start + batch_size]))
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            return None
+        if rows:
+            # The many side is left open (any id): one small event instead of one per link
+            left, _ = (column.name for column in model.__table__.primary_key)
+            owner = {"left_id": owner_id} if owner_column.key == left else {"right_id": owner_id}
+            await invalidation_bus.publish(LinkChanged(model.__tablename__, **owner))
+
+        return {
+            target_id: (
+                BulkLinks.NOT_FOUND if target_id not in found
+                else BulkLinks.UPDATED if target_id in existing
+                else BulkLinks.CREATED
+            )
+            for target_id in target_ids
+        }
@@ -0,0 +1,288 @@
+import contextlib
+import itertools
+import time
+from contextvars import ContextVar
+from prometheus_client import Counter, Histogram
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS, CACHING_DISABLED, NO_CACHE_KEY, NO_DIALECT_SUPPORT
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from sqlalchemy.sql.dml import UpdateBase
+
+from app.config import Config
+from app.utils.monitoring import instrument_database
+
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a connection from the pool.",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Number of pool checkouts that gave up after pool_timeout.",
+    ["pool"],
+)
+STATEMENT_CACHE_LOOKUPS = Counter(
+    "db_statement_cache_lookups_total",
+    "Compiled statement cache lookups per executed statement, by outcome.",
+    ["engine", "result"],
+)
+
+_CACHE_RESULTS = {
+    CACHE_HIT: "hit",
+    CACHE_MISS: "miss",
+    CACHING_DISABLED: "disabled",
+    NO_CACHE_KEY: "no_key",
+    NO_DIALECT_SUPPORT: "unsupported",
+}
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait time and timeouts per pool."""
+
+    def connect(self):
+        pool_name = self.logging_name or "default"
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.labels(pool=pool_name).inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.labels(pool=pool_name).observe(time.perf_counter() - started)
+
+
+class PoolStatsCollector:
+    """Prometheus collector exposing live pool occupancy for every registered engine."""
+
+    def __init__(self):
+        self.engines: dict[str, AsyncEngine] = {}
+
+    def register(self, pool_name: str, engine: AsyncEngine) -> None:
+        self.engines[pool_name] = engine
+
+    def collect(self):
+        size = GaugeMetricFamily("db_pool_size", "Configured number of persistent pool connections.", labels=["pool"])
+        checked_out = GaugeMetricFamily("db_pool_checked_out_connections", "Connections currently checked out of the pool.", labels=["pool"])
+        overflow = GaugeMetricFamily("db_pool_overflow_connections", "Overflow connections currently in use.", labels=["pool"])
+        for pool_name, engine in self.engines.items():
+            # engine.dispose() swaps the pool, so always read it from the engine
+            pool = engine.sync_engine.pool
+            if not isinstance(pool, QueuePool):
+                continue
+            size.add_metric([pool_name], pool.size())
+            checked_out.add_metric([pool_name], pool.checkedout())
+            overflow.add_metric([pool_name], max(pool.overflow(), 0))
+        yield size
+        yield checked_out
+        yield overflow
+
+
+pool_stats = PoolStatsCollector()
+REGISTRY.register(pool_stats)
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def is_file_sqlite(url: str) -> bool:
+    return is_sqlite(url) and make_url(url).database not in (None, "", ":memory:")
+
+
+def engine_options(url: str, pool_name: str) -> dict:
+    """
+    Returns the create_async_engine() keyword arguments for the given URL.
+    In-memory SQLite keeps SQLAlchemy's single-connection default pool.
+    """
+    if is_sqlite(url) and not is_file_sqlite(url):
+        return {}
+    return {
+        "poolclass": InstrumentedAsyncQueuePool,
+        "pool_size": Config.DATABASE_POOL_SIZE,
+        "max_overflow": Config.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": Config.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": Config.DATABASE_POOL_RECYCLE,
+        "pool_pre_ping": Config.DATABASE_POOL_PRE_PING,
+        "pool_logging_name": pool_name,
+    }
+
+
+def build_async_engine(url: str, pool_name: str = "primary", **kwargs) -> AsyncEngine:
+    """
+    Creates an AsyncEngine with the pool settings from Config and registers
+    it for pool metrics under `pool_name`.
+    """
+    parsed = make_url(url)
+    if parsed.get_driver_name() == "asyncpg" and "prepared_statement_cache_size" not in parsed.query:
+        parsed = parsed.update_query_dict(
+            {"prepared_statement_cache_size": str(Config.DATABASE_PREPARED_STATEMENT_CACHE_SIZE)}
+        )
+    options = {"query_cache_size": Config.DATABASE_QUERY_CACHE_SIZE, **engine_options(url, pool_name)}
+    options.update(kwargs)
+    engine = create_async_engine(parsed, **options)
+    pool_stats.register(pool_name, engine)
+    instrument_statement_cache(engine, pool_name)
+    instrument_query_log(engine)
+    instrument_database(engine, pool_name)
+    return engine
+
+
+def instrument_statement_cache(engine: AsyncEngine, engine_name: str) -> None:
+    """Counts compiled-cache hits/misses of every statement executed on the engine."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count_cache_lookup(conn, cursor, statement, parameters, context, executemany):
+        if context is None:
+            return
+        result = _CACHE_RESULTS.get(getattr(context, "cache_hit", NO_CACHE_KEY), "no_key")
+        STATEMENT_CACHE_LOOKUPS.labels(engine=engine_name, result=result).inc()
+
+
+class QueryLog:
+    """SQL statements executed while a log is active; only the first `keep` texts are kept."""
+
+    def __init__(self, keep: int = 50):
+        self.keep = keep
+        self.count = 0
+        self.statements: list[str] = []
+
+    def record(self, statement: str) -> None:
+        self.count += 1
+        if len(self.statements) < self.keep:
+            self.statements.append(statement)
+
+
+# Logs of the enclosing track_queries() blocks; tasks started inside a block inherit them
+_active_query_logs: ContextVar[tuple[QueryLog, ...]] = ContextVar("active_query_logs", default=())
+
+
+@contextlib.contextmanager
+def track_queries(keep: int = 50):
+    """Records every statement executed on an instrumented engine within the block (and the tasks it starts)."""
+    log = QueryLog(keep)
+    token = _active_query_logs.set((*_active_query_logs.get(), log))
+    try:
+        yield log
+    finally:
+        _active_query_logs.reset(token)
+
+
+def instrument_query_log(engine: AsyncEngine) -> None:
+    """Feeds the statements executed on the engine to the active track_queries() logs."""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _record_query(conn, cursor, statement, parameters, context, executemany):
+        for log in _active_query_logs.get():
+            log.record(statement)
+
+
+def apply_sqlite_pragmas(engine: AsyncEngine, pragmas: dict | None = None) -> None:
+    """Runs the configured PRAGMA statements on every new DBAPI connection of the engine."""
+    pragmas = Config.SQLITE_PRAGMAS if pragmas is None else pragmas
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+class WriterRoutingSession(Session):
+    """
+    Session that sends flushes and INSERT/UPDATE/DELETE statements to the
+    engine stored in `info["writer_bind"]` and everything else to its default
+    bind. Once a transaction has written, its remaining statements also go to
+    the writer so they can see their own uncommitted changes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        writer_bind = self.info.get("writer_bind")
+        if writer_bind is not None and (
+            self.info.get("writing") or self._flushing or isinstance(clause, UpdateBase)
+        ):
+            self.info["writing"] = True
+            return writer_bind
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+@event.listens_for(WriterRoutingSession, "after_transaction_end")
+def _reset_writer_routing(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("writing", None)
+
+
+def build_engines(
+    url: str,
+    sqlite_production: bool | None = None,
+    pool_name: str = "primary",
+) -> tuple[AsyncEngine, AsyncEngine]:
+    """
+    Returns (read_engine, write_engine) for the given URL.
+
+    For file-based SQLite in production mode both engines get the WAL/pragma
+    profile and the write engine is limited to a single connection, so writes
+    are serialized inside the process instead of failing with
+    "database is locked". Otherwise both names point at the same engine.
+    """
+    sqlite_production = Config.SQLITE_PRODUCTION_MODE if sqlite_production is None else sqlite_production
+    engine = build_async_engine(url, pool_name=pool_name)
+    if not (sqlite_production and is_file_sqlite(url)):
+        return engine, engine
+
+    writer_engine = build_async_engine(url, pool_name=f"{pool_name}_writer", pool_size=1, max_overflow=0)
+    apply_sqlite_pragmas(engine)
+    apply_sqlite_pragmas(writer_engine)
+    return engine, writer_engine
+
+
+def build_session_factory(engine: AsyncEngine, writer_engine: AsyncEngine) -> async_sessionmaker:
+    """Session factory bound to `engine` that routes writes to `writer_engine` when it differs."""
+    if writer_engine is engine:
+        return async_sessionmaker(autoflush=False, autocommit=False, bind=engine)
+    return async_sessionmaker(
+        autoflush=False,
+        autocommit=False,
+        bind=engine,
+        sync_session_class=WriterRoutingSession,
+        info={"writer_bind": writer_engine.sync_engine},
+    )
+
+
+class ReadReplicaRouter:
+    """
+    Hands out session factories for read-only work. Each call moves to the next
+    replica (round-robin); with no replicas configured, or when the caller asks
+    for the primary, the primary session factory is returned.
+    """
+
+    def __init__(self, primary: async_sessionmaker, replicas: list[async_sessionmaker]):
+        self.primary = primary
+        self.replicas = replicas
+        self._cycle = itertools.cycle(replicas) if replicas else None
+
+    async def dispose(self) -> None:
+        """Closes the replica engines' pooled connections (the primary's belong to its owner)."""
+        for factory in self.replicas:
+            await factory.kw["bind"].dispose()
+
+    def session_factory(self, use_primary: bool = False) -> async_sessionmaker:
+        if use_primary or self._cycle is None:
+            return self.primary
+        return next(self._cycle)
+
+
+def build_read_router(urls: list[str], primary: async_sessionmaker) -> ReadReplicaRouter:
+    """Builds one pooled engine per replica URL (pool names `replica_0`, `replica_1`, ...)."""
+    replicas = []
+    for index, url in enumerate(urls):
+        replica_engine = build_async_engine(url, pool_name=f"replica_{index}")
+        if Config.SQLITE_PRODUCTION_MODE and is_file_sqlite(url):
+            apply_sqlite_pragmas(replica_engine)
+        replicas.append(async_sessionmaker(autoflush=False, autocommit=False, bind=replica_engine))
+    return ReadReplicaRouter(primary, replicas)
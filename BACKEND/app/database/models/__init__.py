@@ -1,9 +1,10 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from app.config import Config
+from app.database.engine import build_engines, build_session_factory, build_read_router
 from sqlalchemy.orm import declarative_base
 
-engine = create_async_engine(Config.DATABASE_URL)
-SessionLocal = async_sessionmaker(autoflush=False, autocommit = False, bind=engine)
+engine, writer_engine = build_engines(Config.DATABASE_URL)
+SessionLocal = build_session_factory(engine, writer_engine)
+read_router = build_read_router(Config.DATABASE_READ_REPLICA_URLS, SessionLocal)
 
 Base = declarative_base()
 
@@ -18,3 +19,9 @@ from .groups_roles_associations import GroupRole
 from .roles_permissions_associations import RolePermission
 from .password_reset_token import PasswordResetToken
 from .refresh_token import RefreshToken
+from .user_counter import UserCounter
+from .table_version import TableVersion
+from .rate_limit_bucket import RateLimitBucket
+from .read_pin import ReadPin
+from .invalidation_log import InvalidationLog
+from . import user_search
@@ -2,17 +2,20 @@ from typing import List, TYPE_CHECKING
 from sqlalchemy.orm import Mapped, relationship
 
 from . import Base
-from .mixins import TablenameMixin, TimestampMixin, StatusMixin, NamedEntityMixin
+from .mixins import TablenameMixin, TimestampMixin, StatusMixin, NamedEntityMixin, not_deleted_index
 if TYPE_CHECKING:
     from . import UserGroup, GroupRole
 
 class Group(Base, TablenameMixin, TimestampMixin, StatusMixin, NamedEntityMixin):
+    __table_args__ = (not_deleted_index("ix_groups_active_created", "created"),)
 
     # Relationships
+    # Not eager: the members of a popular group are a large share of all users,
+    # and each of them would eagerly load its own memberships in turn
     group_users: Mapped[List["UserGroup"]] = relationship(
         back_populates="group",
         foreign_keys="[UserGroup.group_id]",
-        lazy="selectin",
+        lazy="select",
     )
     group_roles: Mapped[List["GroupRole"]] = relationship(
         back_populates="group",
@@ -15,7 +15,7 @@ class GroupRole(Base, AuditMixin, ValidityMixin):
         Integer, ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True
     )
     role_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True
+        Integer, ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True, index=True
     )
 
     # Relationships
@@ -0,0 +1,23 @@
+from sqlalchemy import Float, Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from . import Base
+
+
+class InvalidationLog(Base):
+    """
+    Cache invalidation events for databases without LISTEN/NOTIFY (SQLite):
+    publishers append a row, every worker polls for ids above the last one
+    it has seen. The id is the bus version, so it must never be reused
+    (AUTOINCREMENT) even after old rows are pruned. `created` is Unix epoch
+    seconds.
+    """
+    __tablename__ = "invalidation_log"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    payload: Mapped[str] = mapped_column(Text, nullable=False)
+    created: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<InvalidationLog {self.id} {self.payload}>"
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Mapped, mapped_column, declared_attr, relationship
-from sqlalchemy import Integer, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Integer, String, Text, DateTime, Boolean, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from typing import Optional, TYPE_CHECKING
 from datetime import datetime, timezone
@@ -70,3 +70,12 @@ class TokenMetadataMixin:
         default=lambda: datetime.now(timezone.utc),
         nullable=False
     )
+
+def not_deleted_index(name: str, *columns: str) -> Index:
+    """Partial index over rows with is_deleted = false (Postgres and SQLite)."""
+    return Index(
+        name,
+        *columns,
+        postgresql_where=text("is_deleted = false"),
+        sqlite_where=text("is_deleted = 0"),
+    )
@@ -2,12 +2,13 @@ from typing import List, TYPE_CHECKING
 from sqlalchemy.orm import Mapped, relationship
 
 from . import Base
-from .mixins import TimestampMixin, StatusMixin, NamedEntityMixin, TablenameMixin
+from .mixins import TimestampMixin, StatusMixin, NamedEntityMixin, TablenameMixin, not_deleted_index
 if TYPE_CHECKING:
     from . import RolePermission
 
 
 class Permission(Base, TablenameMixin, TimestampMixin, StatusMixin, NamedEntityMixin):
+    __table_args__ = (not_deleted_index("ix_permissions_active_created", "created"),)
 
     permission_roles: Mapped[List["RolePermission"]] = relationship(
         back_populates="permission",
@@ -0,0 +1,25 @@
+from sqlalchemy import Boolean, Float, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from . import Base
+
+
+class RateLimitBucket(Base):
+    """
+    Token bucket shared by every worker (the "database" rate limit backend).
+
+    Times are Unix epoch seconds. `full_at` is when the bucket will have
+    refilled to capacity, after which the row carries no information and can
+    be swept; `allowed` is the outcome of the last request, returned by the
+    same upsert that consumed the token.
+    """
+    __tablename__ = "rate_limit_buckets"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    tokens: Mapped[float] = mapped_column(Float, nullable=False)
+    updated: Mapped[float] = mapped_column(Float, nullable=False)
+    full_at: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+    allowed: Mapped[bool] = mapped_column(Boolean, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<RateLimitBucket {self.key} tokens={self.tokens}>"
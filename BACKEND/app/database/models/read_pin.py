@@ -0,0 +1,19 @@
+from sqlalchemy import Float, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from . import Base
+
+
+class ReadPin(Base):
+    """
+    Read-your-writes pin shared by every worker (the "database" pin backend):
+    until `expires` (Unix epoch seconds) the token subject reads from the
+    primary. Expired rows carry no information and are swept.
+    """
+    __tablename__ = "read_pins"
+
+    subject: Mapped[str] = mapped_column(String(255), primary_key=True)
+    expires: Mapped[float] = mapped_column(Float, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<ReadPin {self.subject} expires={self.expires}>"
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 from datetime import datetime, timezone
-from sqlalchemy import String, Boolean
+from sqlalchemy import String, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database.models.mixins import TokenMetadataMixin
@@ -11,6 +11,7 @@ if TYPE_CHECKING:
 
 class RefreshToken(TokenMetadataMixin, Base):
     __tablename__ = "refresh_tokens"
+    __table_args__ = (Index("ix_refresh_tokens_user_id_revoked", "user_id", "revoked"),)
 
     refresh_token_hash: Mapped[str] = mapped_column(String(255), nullable=False, unique=True, index=True)
     revoked: Mapped[bool] = mapped_column(Boolean, default=False)
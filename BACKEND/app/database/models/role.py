@@ -3,16 +3,19 @@ from sqlalchemy.orm import Mapped, relationship
 from typing import TYPE_CHECKING
 
 from . import Base
-from .mixins import TimestampMixin, StatusMixin, NamedEntityMixin, TablenameMixin
+from .mixins import TimestampMixin, StatusMixin, NamedEntityMixin, TablenameMixin, not_deleted_index
 if TYPE_CHECKING:
     from . import UserRole, GroupRole, RolePermission
 
 class Role(Base, TablenameMixin, NamedEntityMixin, TimestampMixin, StatusMixin):
+    __table_args__ = (not_deleted_index("ix_roles_active_created", "created"),)
 
+    # Not eager: the members of a popular role are a large share of all users,
+    # and each of them would eagerly load its own memberships in turn
     role_users: Mapped[List["UserRole"]] = relationship(
         back_populates="role",
         foreign_keys="[UserRole.role_id]",
-        lazy="selectin",
+        lazy="select",
     )
     role_groups: Mapped[List["GroupRole"]] = relationship(
         back_populates="role",
@@ -15,7 +15,7 @@ class RolePermission(Base, AuditMixin, ValidityMixin):
         Integer, ForeignKey("roles.id", ondelete="CASCADE"), primary_key=True
     )
     permission_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("permissions.id", ondelete="CASCADE"), primary_key=True
+        Integer, ForeignKey("permissions.id", ondelete="CASCADE"), primary_key=True, index=True
     )
 
     # Relationships
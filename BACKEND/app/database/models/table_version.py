@@ -0,0 +1,85 @@
+from sqlalchemy import BigInteger, DDL, SmallInteger, String, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from . import Base
+
+# Tables whose writes bump their row in table_versions
+VERSIONED_TABLES = ("users", "roles", "groups", "permissions")
+# Rows each table's counter is split over on Postgres (SQLite has one writer at a time and uses one)
+TABLE_VERSION_SHARDS = 16
+
+
+class TableVersion(Base):
+    """
+    Change counter per table, bumped by triggers on every INSERT, UPDATE and
+    DELETE of the tables in VERSIONED_TABLES.
+
+    The bump belongs to the writing transaction, so a version is only visible
+    together with the rows it describes. ETags are derived from these
+    counters, which lets a conditional GET answer 304 without loading rows.
+
+    The bump row-locks the counter until the writer commits, which would
+    serialize every concurrent writer to a table (bulk imports, the seed
+    tool, parallel requests). On Postgres each table's counter is therefore
+    split over TABLE_VERSION_SHARDS rows; a transaction bumps the shard of
+    its backend (pg_backend_pid() mod shards), so concurrent writers rarely
+    wait on one another, and the version is the sum of the shards. Shards
+    only grow, so the sum still changes whenever committed rows do.
+    """
+    __tablename__ = "table_versions"
+
+    name: Mapped[str] = mapped_column(String(50), primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True, default=0)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<TableVersion {self.name}[{self.shard}]={self.version}>"
+
+
+def _seed(tables, shards: int = 1) -> str:
+    return "INSERT INTO table_versions (name, shard, version) VALUES " + ", ".join(
+        f"('{table}', {shard}, 0)" for table in tables for shard in range(shards)
+    )
+
+
+TABLE_VERSION_POSTGRES_FUNCTION = f"""
+    CREATE OR REPLACE FUNCTION bump_table_version() RETURNS trigger AS $$
+    BEGIN
+        UPDATE table_versions SET version = version + 1
+        WHERE name = TG_TABLE_NAME AND shard = mod(pg_backend_pid(), {TABLE_VERSION_SHARDS});
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+# Postgres: one statement-level trigger per table, so a multi-row write bumps once
+TABLE_VERSION_POSTGRES_DDL = [
+    _seed(VERSIONED_TABLES, TABLE_VERSION_SHARDS),
+    TABLE_VERSION_POSTGRES_FUNCTION,
+    *(
+        f"CREATE TRIGGER {table}_version AFTER INSERT OR UPDATE OR DELETE ON {table} "
+        f"FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+        for table in VERSIONED_TABLES
+    ),
+]
+
+# SQLite only has row-level triggers
+TABLE_VERSION_SQLITE_DDL = [
+    _seed(VERSIONED_TABLES),
+    *(
+        f"""
+        CREATE TRIGGER {table}_version_{operation.lower()} AFTER {operation} ON {table}
+        BEGIN
+            UPDATE table_versions SET version = version + 1 WHERE name = '{table}';
+        END
+        """
+        for table in VERSIONED_TABLES
+        for operation in ("INSERT", "UPDATE", "DELETE")
+    ),
+]
+
+# metadata-level so the versioned tables and table_versions all exist when create_all() runs these
+for statement in TABLE_VERSION_POSTGRES_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in TABLE_VERSION_SQLITE_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
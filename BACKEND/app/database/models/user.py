@@ -1,5 +1,5 @@
 from typing import List, Optional, TYPE_CHECKING
-from sqlalchemy import String, Integer, Boolean
+from sqlalchemy import String, Integer, Boolean, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from . import Base
@@ -8,6 +8,7 @@ if TYPE_CHECKING:
     from . import UserRole, UserGroup, PasswordResetToken
 
 class User(Base, TablenameMixin, TimestampMixin, StatusMixin):
+    __table_args__ = (Index("ix_users_status_created", "is_deleted", "is_active", "created"),)
 
     # User's data
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
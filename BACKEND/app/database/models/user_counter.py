@@ -0,0 +1,53 @@
+from sqlalchemy import Boolean, DDL, Integer, event
+from sqlalchemy.orm import Mapped, mapped_column
+
+from . import Base
+
+
+class UserCounter(Base):
+    """
+    Number of live (not soft-deleted) users per `is_active` value.
+
+    On SQLite the rows are kept current by triggers on `users`, which gives the
+    user listing a constant-time total estimate. Postgres uses planner
+    statistics instead (see UserService.estimate_user_count).
+    """
+    __tablename__ = "user_counters"
+
+    is_active: Mapped[bool] = mapped_column(Boolean, primary_key=True)
+    total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<UserCounter is_active={self.is_active} total={self.total}>"
+
+
+USER_COUNTER_SQLITE_DDL = [
+    """
+    INSERT INTO user_counters (is_active, total)
+    SELECT flag, (SELECT count(*) FROM users WHERE is_deleted = 0 AND is_active = flag)
+    FROM (SELECT 0 AS flag UNION ALL SELECT 1)
+    """,
+    """
+    CREATE TRIGGER users_counter_insert AFTER INSERT ON users WHEN NEW.is_deleted = 0
+    BEGIN
+        UPDATE user_counters SET total = total + 1 WHERE is_active = NEW.is_active;
+    END
+    """,
+    """
+    CREATE TRIGGER users_counter_delete AFTER DELETE ON users WHEN OLD.is_deleted = 0
+    BEGIN
+        UPDATE user_counters SET total = total - 1 WHERE is_active = OLD.is_active;
+    END
+    """,
+    """
+    CREATE TRIGGER users_counter_update AFTER UPDATE OF is_active, is_deleted ON users
+    BEGIN
+        UPDATE user_counters SET total = total - 1 WHERE OLD.is_deleted = 0 AND is_active = OLD.is_active;
+        UPDATE user_counters SET total = total + 1 WHERE NEW.is_deleted = 0 AND is_active = NEW.is_active;
+    END
+    """,
+]
+
+# metadata-level so `users` and `user_counters` both exist when create_all() runs these
+for statement in USER_COUNTER_SQLITE_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
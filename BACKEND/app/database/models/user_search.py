@@ -0,0 +1,55 @@
+from sqlalchemy import DDL, event
+
+from . import Base
+
+# Postgres: trigram GIN indexes serve substring LIKE. The prefix btrees are on
+# lower(column) COLLATE "C", which (unlike text_pattern_ops) serves both the
+# prefix LIKE and an ORDER BY of the same expression; see UserService.search_users.
+USER_SEARCH_POSTGRES_PREFIX_DDL = [
+    'CREATE INDEX ix_users_username_prefix ON users ((lower(username) COLLATE "C"))',
+    'CREATE INDEX ix_users_email_prefix ON users ((lower(email) COLLATE "C"))',
+]
+USER_SEARCH_POSTGRES_DDL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX ix_users_username_trgm ON users USING gin (lower(username) gin_trgm_ops)",
+    "CREATE INDEX ix_users_email_trgm ON users USING gin (lower(email) gin_trgm_ops)",
+    *USER_SEARCH_POSTGRES_PREFIX_DDL,
+]
+
+# SQLite: expression indexes serve prefix ranges, an external-content FTS5
+# table with the trigram tokenizer serves substring matches.
+USER_SEARCH_SQLITE_DDL = [
+    "CREATE INDEX ix_users_username_prefix ON users (lower(username))",
+    "CREATE INDEX ix_users_email_prefix ON users (lower(email))",
+    "CREATE VIRTUAL TABLE users_fts USING fts5(username, email, content='users', content_rowid='id', tokenize='trigram')",
+    "INSERT INTO users_fts(users_fts) VALUES ('rebuild')",
+    """
+    CREATE TRIGGER users_fts_insert AFTER INSERT ON users
+    BEGIN
+        INSERT INTO users_fts(rowid, username, email) VALUES (NEW.id, NEW.username, NEW.email);
+    END
+    """,
+    """
+    CREATE TRIGGER users_fts_delete AFTER DELETE ON users
+    BEGIN
+        INSERT INTO users_fts(users_fts, rowid, username, email) VALUES ('delete', OLD.id, OLD.username, OLD.email);
+    END
+    """,
+    """
+    CREATE TRIGGER users_fts_update AFTER UPDATE OF username, email ON users
+    BEGIN
+        INSERT INTO users_fts(users_fts, rowid, username, email) VALUES ('delete', OLD.id, OLD.username, OLD.email);
+        INSERT INTO users_fts(rowid, username, email) VALUES (NEW.id, NEW.username, NEW.email);
+    END
+    """,
+]
+
+for statement in USER_SEARCH_POSTGRES_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+for statement in USER_SEARCH_SQLITE_DDL:
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Alembic autogenerate filter: the FTS5 table and its shadow tables are managed by hand."""
+    return not (type_ == "table" and name.startswith("users_fts"))
@@ -16,7 +16,7 @@ class UserGroup(Base, AuditMixin, ValidityMixin):
         Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
     )
     group_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True
+        Integer, ForeignKey("groups.id", ondelete="CASCADE"), primary_key=True, index=True
     )
 
     # Relationships
@@ -21,6 +21,7 @@ class UserRole(Base, AuditMixin, ValidityMixin):
         Integer,
         ForeignKey("roles.id", ondelete="CASCADE"),
         primary_key=True,
+        index=True,
     )
 
     # Relationships
@@ -0,0 +1,113 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Select, and_, asc, desc, literal, or_, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+# Integers a cursor may carry: what a BIGINT column (and SQLite) can compare with
+INT64_RANGE = range(-2**63, 2**63)
+
+
+@dataclass(frozen=True)
+class KeysetCursor:
+    """Position after the last row of a page: the sort key and id of that row."""
+    sort_by: str
+    sort_order: str
+    value: Any
+    id: int
+
+
+class Keyset:
+    """
+    Opaque cursors and seek predicates for keyset pagination.
+
+    Rows are ordered by (sort column, id) and the next page starts strictly
+    after the (value, id) pair stored in the cursor, so the cost of a page no
+    longer grows with its depth the way OFFSET does. NULLs of a nullable sort
+    column come last in both directions; a row-value comparison with NULL is
+    NULL, so they get their own seek branches.
+    """
+
+    @staticmethod
+    def nullable(column: InstrumentedAttribute) -> bool:
+        return bool(getattr(column.expression, "nullable", False))
+
+    @staticmethod
+    def encode(sort_by: str, sort_order: str, value: Any, id: int) -> str:
+        if isinstance(value, datetime):
+            value = {"dt": value.isoformat()}
+        sort_order = "desc" if sort_order == "desc" else "asc"
+        payload = json.dumps([sort_by, sort_order, value, id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def decode(cursor: str) -> KeysetCursor:
+        """Raises ValueError when the cursor is malformed."""
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            sort_by, sort_order, value, id = json.loads(base64.urlsafe_b64decode(padded))
+            if isinstance(value, dict):
+                value = datetime.fromisoformat(value["dt"])
+        except (ValueError, TypeError, KeyError) as e:
+            raise ValueError("Invalid cursor") from e
+        if (
+            sort_order not in ("asc", "desc") or not isinstance(sort_by, str)
+            or isinstance(id, bool) or not isinstance(id, int) or id not in INT64_RANGE
+        ):
+            raise ValueError("Invalid cursor")
+        return KeysetCursor(sort_by, sort_order, value, id)
+
+    @staticmethod
+    def accepts(column: InstrumentedAttribute, value: Any) -> bool:
+        """Whether a decoded cursor value has the Python type of `column` (None only for nullable columns)."""
+        if value is None:
+            return Keyset.nullable(column)
+        python_type = column.type.python_type
+        if python_type is bool or isinstance(value, bool):
+            return python_type is bool and isinstance(value, bool)
+        if python_type is int:
+            return isinstance(value, int) and value in INT64_RANGE
+        return isinstance(value, python_type)
+
+    @staticmethod
+    def next_cursor(items: list, limit: int, sort_by: str, sort_order: str, column_name: str | None = None) -> str | None:
+        """Cursor pointing after the last item, or None when the page was not full."""
+        if not items or len(items) < limit:
+            return None
+        last = items[-1]
+        return Keyset.encode(sort_by, sort_order, getattr(last, column_name or sort_by), last.id)
+
+    @staticmethod
+    def order(query: Select, column: InstrumentedAttribute, id_column: InstrumentedAttribute, sort_order: str) -> Select:
+        direction = desc if sort_order == "desc" else asc
+        ordered = direction(column).nulls_last() if Keyset.nullable(column) else direction(column)
+        return query.order_by(ordered, direction(id_column))
+
+    @staticmethod
+    def seek(
+        query: Select,
+        column: InstrumentedAttribute,
+        id_column: InstrumentedAttribute,
+        cursor: KeysetCursor,
+        dialect_name: str,
+    ) -> Select:
+        descending = cursor.sort_order == "desc"
+        after_id = id_column < cursor.id if descending else id_column > cursor.id
+        if cursor.value is None:
+            # Already in the trailing NULLs: only ties broken by id remain
+            return query.where(column.is_(None), after_id)
+        value = cursor.value
+        if isinstance(value, datetime) and dialect_name == "sqlite":
+            # SQLite keeps datetimes as text; server defaults (CURRENT_TIMESTAMP)
+            # have no fractional part, so compare against the same text form.
+            value = literal(value.strftime("%Y-%m-%d %H:%M:%S") + (f".{value.microsecond:06d}" if value.microsecond else ""))
+        else:
+            value = literal(value, column.type)
+        row, after = tuple_(column, id_column), tuple_(value, literal(cursor.id))
+        seek = row < after if descending else row > after
+        if Keyset.nullable(column):
+            seek = or_(and_(column.is_not(None), seek), column.is_(None))
+        return query.where(seek)
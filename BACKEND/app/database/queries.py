@@ -0,0 +1,90 @@
+from sqlalchemy import lambda_stmt, select
+from sqlalchemy.orm import raiseload
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from app.database.models import User, Role, Permission, UserRole, UserGroup, GroupRole, RolePermission, RefreshToken
+
+
+class HotQueries:
+    """
+    Registry of the parameterized statements run on (almost) every request.
+
+    Every statement is a lambda_stmt(): SQLAlchemy analyses each lambda once
+    per code location and afterwards only extracts the closure values as bound
+    parameters, so the statement is neither rebuilt nor recompiled per call.
+    The compiled form is served from the engine's compiled cache (see
+    DATABASE_QUERY_CACHE_SIZE) and, on asyncpg, from the per-connection
+    prepared statement cache (DATABASE_PREPARED_STATEMENT_CACHE_SIZE).
+
+    Entities are loaded without their relationships (raiseload): callers
+    only read columns, and the models' selectin relationships would
+    otherwise add a cascade of queries to every authenticated request.
+    """
+
+    @staticmethod
+    def user_by_id(user_id: int) -> StatementLambdaElement:
+        return lambda_stmt(lambda: select(User).where(User.id == user_id, User.is_deleted == False).options(raiseload("*")))
+
+    @staticmethod
+    def user_by_username(username: str) -> StatementLambdaElement:
+        return lambda_stmt(lambda: select(User).where(User.username == username).options(raiseload("*")))
+
+    @staticmethod
+    def direct_roles_for_user(user_id: int) -> StatementLambdaElement:
+        return lambda_stmt(
+            lambda: select(Role)
+            .join(UserRole, UserRole.role_id == Role.id)
+            .where(
+                UserRole.user_id == user_id,
+                UserRole.is_deleted == False,
+                Role.is_deleted == False
+            )
+            .options(raiseload("*"))
+        )
+
+    @staticmethod
+    def group_roles_for_user(user_id: int) -> StatementLambdaElement:
+        return lambda_stmt(
+            lambda: select(Role)
+            .join(GroupRole, GroupRole.role_id == Role.id)
+            .join(UserGroup, UserGroup.group_id == GroupRole.group_id)
+            .where(
+                UserGroup.user_id == user_id,
+                UserGroup.is_deleted == False,
+                GroupRole.is_deleted == False,
+                Role.is_deleted == False
+            )
+            .options(raiseload("*"))
+        )
+
+    @staticmethod
+    def token_role_names(user_id: int) -> StatementLambdaElement:
+        """Names of the user's first five direct roles, embedded in access tokens."""
+        return lambda_stmt(
+            lambda: select(Role.name)
+            .join(UserRole, UserRole.role_id == Role.id)
+            .where(UserRole.user_id == user_id)
+            .limit(5)
+        )
+
+    @staticmethod
+    def permissions_for_roles(role_ids: list[int]) -> StatementLambdaElement:
+        return lambda_stmt(
+            lambda: select(Permission)
+            .join(RolePermission, RolePermission.permission_id == Permission.id)
+            .where(
+                RolePermission.role_id.in_(role_ids),
+                RolePermission.is_deleted == False,
+                Permission.is_deleted == False,
+            )
+            .options(raiseload("*"))
+        )
+
+    @staticmethod
+    def refresh_token_by_hash(token_hash: str, user_id: int) -> StatementLambdaElement:
+        return lambda_stmt(
+            lambda: select(RefreshToken).where(
+                RefreshToken.refresh_token_hash == token_hash,
+                RefreshToken.user_id == user_id
+            ).options(raiseload("*"))
+        )
@@ -6,3 +6,7 @@ from .users_groups_services import UserGroupService
 from .users_roles_services import UserRoleService
 from .groups_roles_services import GroupRoleService
 from .roles_permissions_services import RolePermissionService
+from .user_import_service import UserImportService
+from .user_export_service import UserExportService
+from .table_version_service import TableVersionService
+from .stats_service import StatsService
@@ -1,6 +1,7 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 
+from app.database.queries import HotQueries
 from app.database.services.refresh_token_service import RefreshTokenService
 from app.api.dependencies.auth import create_access_token, create_refresh_token
 from app.utils.logger import log
@@ -18,17 +19,20 @@ class AuthService:
 
         Returns a dictionary containing the new access token, refresh token, token type, and username.
         """
-        data_to_be_encoded={"sub": user.username, "user_id": user.id}
+        # Read before the commit below expires the instance
+        user_id, username = user.id, user.username
+        data_to_be_encoded={"sub": username, "user_id": user_id}
         refresh_token = create_refresh_token(data=data_to_be_encoded)
-        if len(user.user_roles) > 0:
-            data_to_be_encoded["roles"] = [role.role.name for role in user.user_roles[:5]]
+        role_names = (await db.execute(HotQueries.token_role_names(user_id))).scalars().all()
+        if role_names:
+            data_to_be_encoded["roles"] = list(role_names)
         access_token = create_access_token(data=data_to_be_encoded)
 
 
         refresh_token_entry = await RefreshTokenService.add_refresh_token_to_db(
             db=db,
             raw_token=refresh_token,
-            user_id=user.id,
+            user_id=user_id,
         )
 
         if not refresh_token_entry:
@@ -37,11 +41,11 @@ class AuthService:
                 detail="Failed to create refresh token. Please try again later."
             )
 
-        log.info("Access and refresh tokens generated", user_id=user.id, username=user.username)
+        log.info("Access and refresh tokens generated", user_id=user_id, username=username)
 
         return {
             "access_token": access_token,
             "refresh_token": refresh_token,
             "token_type": "bearer",
-            "user_name": user.username,
+            "user_name": username,
         }
\ No newline at end of file
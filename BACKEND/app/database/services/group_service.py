@@ -1,16 +1,22 @@
-from sqlalchemy import asc, desc, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 from sqlalchemy.exc import IntegrityError
+from app.database.pagination import Keyset, KeysetCursor
 from app.database.models import (
     Group, Role, User, Permission,
     GroupRole, UserGroup, RolePermission
 )
 from app.schemas.group import GroupCreate, GroupUpdate
+from app.utils.invalidation import EntityChanged, invalidation_bus
 
 
 class GroupService:
     """Async service layer for group operations"""
 
+    # Sort keys accepted by get_all_groups (and in their cursors); description is nullable
+    SORT_COLUMNS = ("id", "name", "description", "created", "updated", "is_active")
+
     # ---------- CRUD ----------
 
     @staticmethod
@@ -27,6 +33,7 @@ class GroupService:
         try:
             await db.commit()
             await db.refresh(group)
+            await invalidation_bus.publish(EntityChanged("groups", group.id))
             return group
         except IntegrityError:
             await db.rollback()
@@ -48,6 +55,7 @@ class GroupService:
         try:
             await db.commit()
             await db.refresh(group)
+            await invalidation_bus.publish(EntityChanged("groups", group.id))
             return group
         except IntegrityError:
             await db.rollback()
@@ -66,6 +74,7 @@ class GroupService:
         group.is_deleted = True
         try:
             await db.commit()
+            await invalidation_bus.publish(EntityChanged("groups", group_id))
             return True
         except IntegrityError:
             await db.rollback()
@@ -75,6 +84,7 @@ class GroupService:
     async def get_group_by_id(db: AsyncSession, group_id: int) -> Group | None:
         result = await db.execute(
             select(Group).where(Group.id == group_id, Group.is_deleted == False)
+            .options(raiseload("*"))
         )
         return result.scalar_one_or_none()
 
@@ -91,20 +101,21 @@ class GroupService:
         skip: int = 0,
         limit: int = 10,
         sort_by: str = "created",
-        sort_order: str = "desc"
+        sort_order: str = "desc",
+        cursor: KeysetCursor | None = None
     ) -> list[Group]:
-        if not hasattr(Group, sort_by):
+        """Offset pagination with `skip`, or keyset pagination after `cursor` (which then ignores `skip`)."""
+        if sort_by not in GroupService.SORT_COLUMNS:
             return []
 
-        order_by_clause = desc(getattr(Group, sort_by)) if sort_order == "desc" else asc(getattr(Group, sort_by))
+        sort_column = getattr(Group, sort_by)
+        query = select(Group).where(Group.is_deleted == False).options(raiseload("*"))
+        if cursor:
+            query = Keyset.seek(query, sort_column, Group.id, cursor, db.get_bind().dialect.name)
+        else:
+            query = query.offset(skip)
 
-        result = await db.execute(
-            select(Group)
-            .where(Group.is_deleted == False)
-            .order_by(order_by_clause)
-            .offset(skip)
-            .limit(limit)
-        )
+        result = await db.execute(Keyset.order(query, sort_column, Group.id, sort_order).limit(limit))
         return result.scalars().all()
 
     @staticmethod
@@ -3,7 +3,9 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
 from app.config import Config
+from app.database.bulk import BulkLinks
 from app.database.models import GroupRole, Role, Group
+from app.utils.invalidation import LinkChanged, invalidation_bus
 
 
 class GroupRoleService:
@@ -55,12 +57,45 @@ class GroupRoleService:
 
         try:
             await db.commit()
+            await invalidation_bus.publish(LinkChanged("groups_roles", group_id, role_id))
             await db.refresh(group_role)
             return group_role
         except IntegrityError:
             await db.rollback()
             return None
 
+    @staticmethod
+    async def assign_roles_to_group(
+        db: AsyncSession,
+        group_id: int,
+        role_ids: list[int],
+        valid_from: datetime | None = None,
+        valid_until: datetime | None = None,
+        created_by: int | None = None
+    ) -> dict[int, str] | None:
+        """
+        Bulk version of assign_group_role: per role id "created", "updated"
+        (existing or restored link) or "not_found". Returns None when the group
+        does not exist.
+        """
+        group = await db.execute(select(Group.id).where(Group.id == group_id, Group.is_deleted == False))
+        if group.scalar_one_or_none() is None:
+            return None
+        now = datetime.now(timezone.utc)
+        return await BulkLinks.assign(
+            db,
+            owner_column=GroupRole.group_id,
+            owner_id=group_id,
+            target_column=GroupRole.role_id,
+            target_ids=role_ids,
+            valid_targets=select(Role.id).where(Role.id.in_(role_ids), Role.is_deleted == False),
+            values={
+                "valid_from": valid_from or now,
+                "valid_until": valid_until or now + timedelta(days=Config.DEFAULT_GROUP_ROLE_VALIDITY),
+                "created_by": created_by,
+            },
+        )
+
     @staticmethod
     async def remove_group_role(db: AsyncSession, group_id: int, role_id: int) -> bool:
         """Soft-delete a group-role link."""
@@ -78,6 +113,7 @@ class GroupRoleService:
         group_role.is_deleted = True
         try:
             await db.commit()
+            await invalidation_bus.publish(LinkChanged("groups_roles", group_id, role_id))
             return True
         except IntegrityError:
             await db.rollback()
@@ -105,6 +141,7 @@ class GroupRoleService:
         group_role.valid_until = new_valid_until
         try:
             await db.commit()
+            await invalidation_bus.publish(LinkChanged("groups_roles", group_id, role_id))
             return True
         except IntegrityError:
             await db.rollback()
@@ -127,6 +164,7 @@ class GroupRoleService:
         group_role.valid_until = datetime.now(timezone.utc)
         try:
             await db.commit()
+            await invalidation_bus.publish(LinkChanged("groups_roles", group_id, role_id))
             return True
         except IntegrityError:
             await db.rollback()
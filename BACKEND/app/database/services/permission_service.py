@@ -1,15 +1,21 @@
-from sqlalchemy import asc, desc, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 from sqlalchemy.exc import IntegrityError
+from app.database.pagination import Keyset, KeysetCursor
 from app.database.models import (
     Permission, Role, Group, User,
     RolePermission, GroupRole, UserRole, UserGroup
 )
 from app.schemas.permission import PermissionCreate, PermissionUpdate
+from app.utils.invalidation import EntityChanged, invalidation_bus
 
 
 class PermissionService:
 
+    # Sort keys accepted by get_all_permissions (and in their cursors); description is nullable
+    SORT_COLUMNS = ("id", "name", "description", "created", "updated", "is_active")
+
     # ---------- CRUD ----------
 
     @staticmethod
@@ -25,6 +31,7 @@ class PermissionService:
         try:
             await db.commit()
             await db.refresh(permission)
+            await invalidation_bus.publish(EntityChanged("permissions", permission.id))
             return permission
         except IntegrityError:
             await db.rollback()
@@ -48,6 +55,7 @@ class PermissionService:
         try:
             await db.commit()
             await db.refresh(permission)
+            await invalidation_bus.publish(EntityChanged("permissions", permission.id))
             return permission
         except IntegrityError:
             await db.rollback()
@@ -68,6 +76,7 @@ class PermissionService:
         permission.is_deleted = True
         try:
             await db.commit()
+            await invalidation_bus.publish(EntityChanged("permissions", permission_id))
             return True
         except IntegrityError:
             await db.rollback()
@@ -80,6 +89,7 @@ class PermissionService:
                 Permission.id == permission_id,
                 Permission.is_deleted == False
             )
+            .options(raiseload("*"))
         )
         return result.scalar_one_or_none()
 
@@ -99,20 +109,21 @@ class PermissionService:
         skip: int = 0,
         limit: int = 10,
         sort_by: str = "created",
-        sort_order: str = "desc"
+        sort_order: str = "desc",
+        cursor: KeysetCursor | None = None
     ) -> list[Permission]:
-        if not hasattr(Permission, sort_by):
+        """Offset pagination with `skip`, or keyset pagination after `cursor` (which then ignores `skip`)."""
+        if sort_by not in PermissionService.SORT_COLUMNS:
             return []
 
-        order_by_clause = desc(getattr(Permission, sort_by)) if sort_order == "desc" else asc(getattr(Permission, sort_by))
+        sort_column = getattr(Permission, sort_by)
+        query = select(Permission).where(Permission.is_deleted == False).options(raiseload("*"))
+        if cursor:
+            query = Keyset.seek(query, sort_column, Permission.id, cursor, db.get_bind().dialect.name)
+        else:
+            query = query.offset(skip)
 
-        result = await db.execute(
-            select(Permission)
-            .where(Permission.is_deleted == False)
-            .order_by(order_by_clause)
-            .offset(skip)
-            .limit(limit)
-        )
+        result = await db.execute(Keyset.order(query, sort_column, Permission.id, sort_order).limit(limit))
         return result.scalars().all()
 
     @staticmethod
@@ -1,13 +1,18 @@
 import hashlib
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import update
 from datetime import datetime, timezone, timedelta
 from sqlalchemy.exc import IntegrityError
 
 from app.database.models import RefreshToken
+from app.database.queries import HotQueries
 from app.utils.logger import log
 from app.config import Config
 
+# Refreshed after commits: reloading the user relationship as well would
+# eagerly load the user's whole membership graph on every login
+TOKEN_COLUMNS = [column.key for column in RefreshToken.__table__.columns]
+
 
 class RefreshTokenService:
 
@@ -49,7 +54,7 @@ class RefreshTokenService:
         log.info("New Refresh Token created", user_id=user_id)
         try:
             await db.commit()
-            await db.refresh(token_entry)
+            await db.refresh(token_entry, TOKEN_COLUMNS)
             log.info("Refresh Token added to DB", user_id = user_id)
             return token_entry
         except IntegrityError as e:
@@ -65,7 +70,7 @@ class RefreshTokenService:
         token.used = True
         db.add(token)
         await db.commit()
-        await db.refresh(token)
+        await db.refresh(token, TOKEN_COLUMNS)
         log.info("Refresh Token used", token_id=token.id)
 
 
@@ -75,11 +80,7 @@ class RefreshTokenService:
         Retrieves a RefreshToken by its hash and associated user_id.
         Returns None if not found.
         """
-        query = select(RefreshToken).where(
-            RefreshToken.refresh_token_hash == token_hash,
-            RefreshToken.user_id == user_id
-        )
-        result = await db.execute(query)
+        result = await db.execute(HotQueries.refresh_token_by_hash(token_hash, user_id))
         log.info("Refresh Token retrieved from DB", user_id=user_id, token_hash=token_hash)
         return result.scalar_one_or_none()
     
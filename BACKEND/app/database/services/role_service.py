@@ -1,16 +1,22 @@
-from sqlalchemy import asc, desc, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
 from sqlalchemy.exc import IntegrityError
+from app.database.pagination import Keyset, KeysetCursor
 from app.database.models import (
     Role, Permission, RolePermission,
     Group, GroupRole,
     User, UserRole, UserGroup
 )
 from app.schemas.role import RoleCreate, RoleUpdate
+from app.utils.invalidation import EntityChanged, invalidation_bus
 
 
 class RoleService:
 
+    # Sort keys accepted by get_all_roles (and in their cursors); description is nullable
+    SORT_COLUMNS = ("id", "name", "description", "created", "updated", "is_active")
+
     # -------- CRUD -------- #
 
     @staticmethod
@@ -23,6 +29,7 @@ class RoleService:
         try:
             await db.commit()
             await db.refresh(role)
+            await invalidation_bus.publish(EntityChanged("roles", role.id))
             return role
         except IntegrityError:
             await db.rollback()
@@ -43,6 +50,7 @@ class RoleService:
         try:
             await db.commit()
             await db.refresh(role)
+            await invalidation_bus.publish(EntityChanged("roles", role.id))
             return role
         except IntegrityError:
             await db.rollback()
@@ -60,6 +68,7 @@ class RoleService:
         role.is_deleted = True
         try:
             await db.commit()
+            await invalidation_bus.publish(EntityChanged("roles", role_id))
             return True
         except IntegrityError:
             await db.rollback()
@@ -69,6 +78,7 @@ class RoleService:
     async def get_role_by_id(db: AsyncSession, role_id: int) -> Role | None:
         result = await db.execute(
             select(Role).where(Role.id == role_id, Role.is_deleted == False)
+            .options(raiseload("*"))
         )
         return result.scalar_one_or_none()
 
@@ -85,20 +95,21 @@ class RoleService:
         skip: int = 0,
         limit: int = 10,
         sort_by: str = "created",
-        sort_order: str = "desc"
+        sort_order: str = "desc",
+        cursor: KeysetCursor | None = None
     ) -> list[Role]:
-        if not hasattr(Role, sort_by):
+        """Offset pagination with `skip`, or keyset pagination after `cursor` (which then ignores `skip`)."""
+        if sort_by not in RoleService.SORT_COLUMNS:
             return []
 
-        order_by_clause = desc(getattr(Role, sort_by)) if sort_order == "desc" else asc(getattr(Role, sort_by))
+        sort_column = getattr(Role, sort_by)
+        query = select(Role).where(Role.is_deleted == False).options(raiseload("*"))
+        if cursor:
+            query = Keyset.seek(query, sort_column, Role.id, cursor, db.get_bind().dialect.name)
+        else:
+            query = query.offset(skip)
 
-        result = await db.execute(
-            select(Role)
-            .where(Role.is_deleted == False)
-            .order_by(order_by_clause)
-            .offset(skip)
-            .limit(limit)
-        )
+        result = await db.execute(Keyset.order(query, sort_column, Role.id, sort_order).limit(limit))
         return result.scalars().all()
 
     @staticmethod
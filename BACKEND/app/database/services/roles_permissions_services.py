@@ -1,7 +1,9 @@
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from app.database.bulk import BulkLinks
 from app.database.models import RolePermission, Role, Permission
+from app.utils.invalidation import LinkChanged, invalidation_bus
 
 
 class RolePermissionService:
@@ -48,12 +50,38 @@ class RolePermissionService:
 
         try:
             await db.commit()
+            await invalidation_bus.publish(LinkChanged("roles_permissions", role_id, permission_id))
             await db.refresh(role_permission)
             return role_permission
         except IntegrityError:
             await db.rollback()
             return None
 
+    @staticmethod
+    async def assign_permissions_to_role(
+        db: AsyncSession,
+        role_id: int,
+        permission_ids: list[int],
+        created_by: int | None = None
+    ) -> dict[int, str] | None:
+        """
+        Bulk version of assign_role_permission: per permission id "created",
+        "updated" (existing or restored link) or "not_found". Returns None when
+        the role does not exist.
+        """
+        role = await db.execute(select(Role.id).where(Role.id == role_id, Role.is_deleted == False))
+        if role.scalar_one_or_none() is None:
+            return None
+        return await BulkLinks.assign(
+            db,
+            owner_column=RolePermission.role_id,
+            owner_id=role_id,
+            target_column=RolePermission.permission_id,
+            target_ids=permission_ids,
+            valid_targets=select(Permission.id).where(Permission.id.in_(permission_ids), Permission.is_deleted == False),
+            values={"created_by": created_by},
+        )
+
     @staticmethod
     async def remove_role_permission(db: AsyncSession, role_id: int, permission_id: int) -> bool:
         """Soft delete a role-permission mapping."""
@@ -71,6 +99,7 @@ class RolePermissionService:
         rp.is_deleted = True
         try:
             await db.commit()
+            await invalidation_bus.publish(LinkChanged("roles_permissions", role_id, permission_id))
             return True
         except IntegrityError:
             await db.rollback()
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import Select, func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import Config
+from app.database.models import User, Role, Group, Permission, UserRole, UserGroup, GroupRole
+
+
+class StatsService:
+    """
+    Dashboard summary. Every count comes from a single statement (users are
+    counted in one pass with FILTER clauses, the other tables as scalar
+    subqueries); the recent sign-ups and the soonest expiring assignments are
+    two more small statements on the same connection, so the summary costs
+    three round trips however large the tables are.
+    """
+
+    @staticmethod
+    def expiring_assignments(now: datetime, horizon: datetime) -> Select:
+        """Live user-role, user-group and group-role links whose valid_until falls in (now, horizon]."""
+
+        def links(kind: str, link, subject, subject_id, subject_name, target, target_id):
+            return (
+                select(
+                    literal(kind).label("kind"),
+                    subject_id.label("subject_id"),
+                    subject_name.label("subject_name"),
+                    target_id.label("target_id"),
+                    target.name.label("target_name"),
+                    link.valid_until.label("valid_until"),
+                )
+                .join(subject, subject.id == subject_id)
+                .join(target, target.id == target_id)
+                .where(
+                    link.is_deleted == False,
+                    link.valid_until > now,
+                    link.valid_until <= horizon,
+                    subject.is_deleted == False,
+                    target.is_deleted == False,
+                )
+            )
+
+        return union_all(
+            links("user_role", UserRole, User, UserRole.user_id, User.username, Role, UserRole.role_id),
+            links("user_group", UserGroup, User, UserGroup.user_id, User.username, Group, UserGroup.group_id),
+            links("group_role", GroupRole, Group, GroupRole.group_id, Group.name, Role, GroupRole.role_id),
+        )
+
+    @staticmethod
+    async def get_summary(
+        db: AsyncSession,
+        signup_days: int | None = None,
+        expiring_days: int | None = None,
+        limit: int | None = None,
+    ) -> dict:
+        signup_days = Config.STATS_RECENT_SIGNUP_DAYS if signup_days is None else signup_days
+        expiring_days = Config.STATS_EXPIRING_WITHIN_DAYS if expiring_days is None else expiring_days
+        limit = Config.STATS_LIST_LIMIT if limit is None else limit
+        now = datetime.now(timezone.utc)
+        signed_up_since = now - timedelta(days=signup_days)
+        expiring = StatsService.expiring_assignments(now, now + timedelta(days=expiring_days)).subquery()
+
+        def live_count(model):
+            return select(func.count()).select_from(model).where(model.is_deleted == False).scalar_subquery()
+
+        users = select(
+            func.count().filter(User.is_deleted == False, User.is_active == True).label("active"),
+            func.count().filter(User.is_deleted == False, User.is_active == False).label("inactive"),
+            func.count().filter(User.is_deleted == True).label("deleted"),
+            func.count().filter(User.is_deleted == False, User.created >= signed_up_since).label("signups"),
+        ).subquery()
+        counts = (
+            await db.execute(
+                select(
+                    users,
+                    live_count(Role).label("roles"),
+                    live_count(Group).label("groups"),
+                    live_count(Permission).label("permissions"),
+                    select(func.count()).select_from(expiring).scalar_subquery().label("expiring"),
+                )
+            )
+        ).one()
+
+        signups = await db.execute(
+            select(User.id, User.username, User.email, User.created)
+            .where(User.is_deleted == False, User.created >= signed_up_since)
+            .order_by(User.created.desc(), User.id.desc())
+            .limit(limit)
+        )
+        assignments = await db.execute(
+            select(expiring).order_by(expiring.c.valid_until, expiring.c.kind, expiring.c.subject_id).limit(limit)
+        )
+
+        return {
+            "generated_at": now,
+            "users": {"active": counts.active, "inactive": counts.inactive, "deleted": counts.deleted},
+            "roles": counts.roles,
+            "groups": counts.groups,
+            "permissions": counts.permissions,
+            "recent_signups": {"days": signup_days, "count": counts.signups, "users": signups.all()},
+            "expiring_assignments": {"within_days": expiring_days, "count": counts.expiring, "assignments": assignments.all()},
+        }
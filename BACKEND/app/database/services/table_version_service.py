@@ -0,0 +1,17 @@
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import TableVersion
+
+
+class TableVersionService:
+
+    @staticmethod
+    async def get_versions(db: AsyncSession, tables: tuple[str, ...]) -> dict[str, int]:
+        """Current change counter of each table: the sum of its shards, read by primary key in one query."""
+        result = await db.execute(
+            select(TableVersion.name, func.sum(TableVersion.version))
+            .where(TableVersion.name.in_(tables))
+            .group_by(TableVersion.name)
+        )
+        return {name: int(version) for name, version in result.all()}
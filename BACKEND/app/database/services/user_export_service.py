@@ -0,0 +1,95 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import Config
+from app.database.models import User
+from app.database.services.user_service import UserService
+
+EXPORT_COLUMNS = ("id", "firstname", "middlename", "lastname", "username", "email", "is_active", "is_verified", "created", "updated")
+
+
+class UserExportService:
+    """
+    Streams live users with their active role and group names.
+
+    Rows come from a server-side cursor (AsyncSession.stream) in partitions of
+    USER_EXPORT_CHUNK_SIZE, and memberships are aggregated per user in SQL, so
+    memory use does not depend on the number of users. Each partition is
+    encoded into one response chunk.
+    """
+
+    @staticmethod
+    def export_query(status: bool | None = None) -> Select:
+        query = (
+            select(
+                *(getattr(User, column) for column in EXPORT_COLUMNS),
+                UserService.membership_names("roles").label("roles"),
+                UserService.membership_names("groups").label("groups"),
+            )
+            .where(User.is_deleted == False)
+            .order_by(User.id)
+        )
+        if status is not None:
+            query = query.where(User.is_active == status)
+        return query
+
+    @staticmethod
+    async def stream_rows(
+        db: AsyncSession, status: bool | None = None, chunk_size: int | None = None
+    ) -> AsyncIterator[list[dict]]:
+        """Yields lists of at most `chunk_size` exported rows, in id order."""
+        query = UserExportService.export_query(status).execution_options(
+            yield_per=chunk_size or Config.USER_EXPORT_CHUNK_SIZE
+        )
+        result = await db.stream(query)
+        async for partition in result.mappings().partitions():
+            yield [UserExportService._export_row(row) for row in partition]
+
+    @staticmethod
+    async def ndjson(chunks: AsyncIterator[list[dict]]) -> AsyncIterator[bytes]:
+        async for rows in chunks:
+            yield "".join(json.dumps(row, default=UserExportService._json_default) + "\n" for row in rows).encode()
+
+    @staticmethod
+    async def csv(chunks: AsyncIterator[list[dict]]) -> AsyncIterator[bytes]:
+        """CSV with a header row; role and group names are joined with "|"."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([*EXPORT_COLUMNS, "roles", "groups"])
+        async for rows in chunks:
+            for row in rows:
+                writer.writerow([
+                    *(UserExportService._csv_value(row[column]) for column in EXPORT_COLUMNS),
+                    "|".join(row["roles"]),
+                    "|".join(row["groups"]),
+                ])
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            # header only: no users matched
+            yield buffer.getvalue().encode()
+
+    @staticmethod
+    def _export_row(row) -> dict:
+        exported = {column: row[column] for column in EXPORT_COLUMNS}
+        exported["roles"] = UserService.split_names(row["roles"])
+        exported["groups"] = UserService.split_names(row["groups"])
+        return exported
+
+    @staticmethod
+    def _json_default(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+    @staticmethod
+    def _csv_value(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return "" if value is None else value
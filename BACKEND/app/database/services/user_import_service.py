@@ -0,0 +1,227 @@
+import codecs
+import csv
+import json
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
+from pydantic import ValidationError
+from sqlalchemy import insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+
+from app.auth.password_hash import PasswordHasher
+from app.config import Config
+from app.database.models import User, UserRole
+from app.schemas.user import UserCreate, UserImportReport, UserImportRowError
+from app.utils.logger import log
+from app.utils.invalidation import EntityChanged, LinkChanged, invalidation_bus
+
+# (row, record, error): record is None when the line could not be parsed
+ImportRecord = tuple[int, dict | None, str | None]
+
+
+class UserImportService:
+    """
+    Bulk user creation from a streamed CSV or NDJSON body.
+
+    Records are processed in chunks of USER_IMPORT_CHUNK_SIZE: validated
+    against UserCreate, checked for existing usernames/emails with one query,
+    hashed on the password hashing pool and written with a single multi-row
+    INSERT per chunk. Only the current chunk is held in memory.
+    """
+
+    @staticmethod
+    async def read_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+        """Splits a byte stream into UTF-8 lines (BOM tolerated). Raises UnicodeDecodeError on bad input."""
+        decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        buffer = ""
+        async for chunk in chunks:
+            buffer += decoder.decode(chunk)
+            *lines, buffer = buffer.split("\n")
+            for line in lines:
+                yield line.rstrip("\r")
+        buffer += decoder.decode(b"", final=True)
+        if buffer:
+            yield buffer.rstrip("\r")
+
+    @staticmethod
+    async def read_records(lines: AsyncIterator[str], file_format: str) -> AsyncIterator[ImportRecord]:
+        """
+        Parses lines into records, numbering rows from 1. CSV needs a header
+        row and one record per line; empty CSV cells are read as missing.
+        Blank lines are skipped.
+        """
+        header = None
+        row = 0
+        async for line in lines:
+            if not line.strip():
+                continue
+            if file_format == "csv":
+                values = next(csv.reader([line]))
+                if header is None:
+                    header = [name.strip() for name in values]
+                    continue
+                row += 1
+                if len(values) != len(header):
+                    yield row, None, f"Expected {len(header)} columns, got {len(values)}"
+                    continue
+                yield row, {name: value for name, value in zip(header, values) if value != ""}, None
+            else:
+                row += 1
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    yield row, None, "Invalid JSON"
+                    continue
+                if not isinstance(record, dict):
+                    yield row, None, "Expected a JSON object"
+                    continue
+                yield row, record, None
+
+    @staticmethod
+    async def import_users(
+        db: AsyncSession,
+        records: AsyncIterator[ImportRecord],
+        role_id: int | None = None,
+        created_by: int | None = None,
+        chunk_size: int | None = None,
+    ) -> UserImportReport:
+        """Creates users from `records`, committing per chunk, and reports every rejected row."""
+        chunk_size = chunk_size or Config.USER_IMPORT_CHUNK_SIZE
+        report = UserImportReport()
+        seen: tuple[set[str], set[str]] = (set(), set())  # usernames, emails accepted so far
+        chunk: list[ImportRecord] = []
+        async for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                await UserImportService._import_chunk(db, chunk, seen, report, role_id, created_by)
+                chunk = []
+        if chunk:
+            await UserImportService._import_chunk(db, chunk, seen, report, role_id, created_by)
+        report.errors.sort(key=lambda error: error.row)
+        log.info("Users imported", total=report.total, created=report.created, failed=report.failed)
+        return report
+
+    @staticmethod
+    async def _import_chunk(
+        db: AsyncSession,
+        chunk: list[ImportRecord],
+        seen: tuple[set[str], set[str]],
+        report: UserImportReport,
+        role_id: int | None,
+        created_by: int | None,
+    ) -> None:
+        report.total += len(chunk)
+        seen_usernames, seen_emails = seen
+        valid: list[tuple[int, UserCreate]] = []
+        for row, record, error in chunk:
+            if error:
+                UserImportService._reject(report, row, record, [error])
+                continue
+            try:
+                user = UserCreate.model_validate(record)
+            except ValidationError as e:
+                errors = [f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()]
+                UserImportService._reject(report, row, record, errors)
+                continue
+            errors = []
+            if user.username in seen_usernames:
+                errors.append("username: Duplicate in import")
+            if user.email in seen_emails:
+                errors.append("email: Duplicate in import")
+            if errors:
+                UserImportService._reject(report, row, record, errors)
+                continue
+            seen_usernames.add(user.username)
+            seen_emails.add(user.email)
+            valid.append((row, user))
+
+        valid = await UserImportService._drop_existing(db, valid, report)
+        if not valid:
+            return
+        hashes = dict(zip(
+            (row for row, _ in valid),
+            await PasswordHasher.hash_many([user.password for _, user in valid]),
+        ))
+
+        # A concurrent writer can take a username/email between the check and
+        # the INSERT: re-check once and retry with the remaining rows
+        for attempt in range(2):
+            now = datetime.now(timezone.utc)
+            try:
+                user_ids = (await db.execute(
+                    insert(User).returning(User.id),
+                    [
+                        {
+                            "firstname": user.firstname,
+                            "middlename": user.middlename,
+                            "lastname": user.lastname,
+                            "username": user.username,
+                            "email": user.email,
+                            "password": hashes[row],
+                        }
+                        for row, user in valid
+                    ],
+                )).scalars().all()
+                if role_id is not None:
+                    await db.execute(insert(UserRole), [
+                        {
+                            "user_id": user_id,
+                            "role_id": role_id,
+                            "valid_from": now,
+                            "valid_until": now + timedelta(days=Config.DEFAULT_USER_ROLE_VALIDITY),
+                            "created_by": created_by,
+                        }
+                        for user_id in user_ids
+                    ])
+                await db.commit()
+                await invalidation_bus.publish(EntityChanged("users"))
+                if role_id is not None:
+                    await invalidation_bus.publish(LinkChanged("users_roles", right_id=role_id))
+                report.created += len(user_ids)
+                return
+            except IntegrityError:
+                await db.rollback()
+                if attempt == 0:
+                    valid = await UserImportService._drop_existing(db, valid, report)
+                    if not valid:
+                        return
+        log.error("User import chunk failed", rows=len(valid))
+        for row, user in valid:
+            UserImportService._reject(report, row, {"username": user.username}, ["Conflicts with a concurrent write"])
+
+    @staticmethod
+    async def _drop_existing(
+        db: AsyncSession, valid: list[tuple[int, UserCreate]], report: UserImportReport
+    ) -> list[tuple[int, UserCreate]]:
+        """Rejects rows whose username or email is already taken, with one query for the chunk."""
+        if not valid:
+            return valid
+        usernames = [user.username for _, user in valid]
+        emails = [user.email for _, user in valid]
+        existing = (await db.execute(
+            select(User.username, User.email).where(or_(User.username.in_(usernames), User.email.in_(emails)))
+        )).all()
+        taken_usernames = {username for username, _ in existing}
+        taken_emails = {email for _, email in existing}
+        kept = []
+        for row, user in valid:
+            errors = []
+            if user.username in taken_usernames:
+                errors.append("username: Already exists")
+            if user.email in taken_emails:
+                errors.append("email: Already exists")
+            if errors:
+                UserImportService._reject(report, row, {"username": user.username}, errors)
+            else:
+                kept.append((row, user))
+        return kept
+
+    @staticmethod
+    def _reject(report: UserImportReport, row: int, record: dict | None, errors: list[str]) -> None:
+        username = record.get("username") if isinstance(record, dict) else None
+        report.failed += 1
+        report.errors.append(UserImportRowError(
+            row=row,
+            username=str(username) if username is not None else None,
+            errors=errors,
+        ))
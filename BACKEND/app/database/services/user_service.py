@@ -1,20 +1,29 @@
-from sqlalchemy import asc, desc, select, func, or_
+from sqlalchemy import Row, select, func, or_, text, literal_column, table
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 import json
 import os
 from datetime import datetime
 
-from app.database.models import User, Role, Group, Permission, RolePermission, UserRole, UserGroup, GroupRole
+from app.database.models import User, Role, Group, Permission, UserRole, UserGroup, UserCounter
 from app.schemas.user import UserCreate, UserUpdate
 from app.auth.password_hash import PasswordHasher
 from app.utils.email_service import EmailService
 from app.database.services.password_reset_token_service import PasswordResetTokenService
+from app.database.queries import HotQueries
+from app.database.pagination import Keyset, KeysetCursor
 from app.config import Config
+from app.utils.invalidation import EntityChanged, invalidation_bus
+
+# Joins aggregated membership names in SQL; a control character cannot clash with a name
+NAME_SEPARATOR = "\x1f"
 
 class UserService:
 
+    # Sort keys accepted by get_all_users -> User attribute they order by
+    SORT_COLUMNS = {"id": "id", "username": "username", "email": "email", "status": "is_active", "created": "created"}
+
     @staticmethod
     async def create_user(db: AsyncSession, user_data: UserCreate) -> User | None:
         if await UserService.check_username_exists(db, user_data.username):
@@ -36,6 +45,7 @@ class UserService:
         try:
             await db.commit()
             await db.refresh(user)
+            await invalidation_bus.publish(EntityChanged("users", user.id))
             return user
         except IntegrityError:
             await db.rollback()
@@ -59,6 +69,7 @@ class UserService:
         try:
             await db.commit()
             await db.refresh(user)
+            await invalidation_bus.publish(EntityChanged("users", user.id))
             return user
         except IntegrityError:
             await db.rollback()
@@ -76,6 +87,7 @@ class UserService:
         user.is_deleted = True
         try:
             await db.commit()
+            await invalidation_bus.publish(EntityChanged("users", user_id))
             return True
         except IntegrityError:
             await db.rollback()
@@ -98,6 +110,7 @@ class UserService:
         try:
             await db.commit()
             await db.refresh(user)
+            await invalidation_bus.publish(EntityChanged("users", user.id))
             return True
         except IntegrityError:
             await db.rollback()
@@ -105,16 +118,12 @@ class UserService:
 
     @staticmethod
     async def get_user_by_id(db: AsyncSession, user_id: int) -> User | None:
-        result = await db.execute(
-            select(User).where(User.id == user_id, User.is_deleted == False)
-        )
+        result = await db.execute(HotQueries.user_by_id(user_id))
         return result.scalar_one_or_none()
 
     @staticmethod
     async def get_user_by_username(db: AsyncSession, username: str) -> User | None:
-        result = await db.execute(
-            select(User).where(User.username == username)
-        )
+        result = await db.execute(HotQueries.user_by_username(username))
         return result.scalar_one_or_none()
     
     @staticmethod
@@ -135,60 +144,239 @@ class UserService:
         role: str | None = None,
         group: str | None = None,
         search: str | None = None,
-    ) -> tuple[int, list[User]]:
-        allowed_sort_fields = {"id", "username", "email", "status", "created"}
-        if sort_by not in allowed_sort_fields:
+        cursor: KeysetCursor | None = None,
+        total_mode: str = "exact",
+        columns: list[str] | None = None,
+        expand: list[str] | None = None,
+    ) -> tuple[int | None, list[User] | list[Row]]:
+        """
+        Returns (total, users). `total_mode` selects how the total is obtained:
+        "exact" counts in the page query itself (window function), "estimate"
+        uses estimate_user_count and "none" skips counting (total is None).
+        With `columns` (User attribute names) or `expand` ("roles", "groups"),
+        users are plain rows holding those columns plus id and the sort
+        column, and no relationship is loaded: each expanded membership is a
+        NAME_SEPARATOR-joined string aggregated in the same query (see
+        split_names).
+        """
+        if sort_by not in UserService.SORT_COLUMNS:
             sort_by = "created"
-        order_expr = desc(getattr(User, sort_by)) if sort_order.lower() == "desc" else asc(getattr(User, sort_by))
-        query = (
-            select(User)
-            .options(
-                selectinload(User.user_roles).selectinload(UserRole.role),
-                selectinload(User.user_groups).selectinload(UserGroup.group)
-            )
-            .where(User.is_deleted == False)
-        )
-        filters = []
-        # Filter by active status (assuming status is "active" or "inactive", map accordingly)
-        if status:
-            filters.append(User.is_active == True)
-        else:
-            filters.append(User.is_active == False)
-        # Filter by Role name:
+        sort_column = getattr(User, UserService.SORT_COLUMNS[sort_by])
+        sort_order = "desc" if sort_order.lower() == "desc" else "asc"
+        filters = [User.is_deleted == False, User.is_active == bool(status)]
+        # Role/group filters are EXISTS subqueries, so a user matching through
+        # several rows is neither duplicated nor counted twice
         if role:
-            query = query.join(User.user_roles).join(UserRole.role)
-            filters.append(func.lower(Role.name) == role.lower())
-        # Filter by Group name:
+            filters.append(User.user_roles.any(UserRole.role.has(func.lower(Role.name) == role.lower())))
         if group:
-            query = query.join(User.user_groups).join(UserGroup.group)
-            filters.append(func.lower(Group.name) == group.lower())
+            filters.append(User.user_groups.any(UserGroup.group.has(func.lower(Group.name) == group.lower())))
         # Search by username or email (case insensitive partial match)
         if search:
-            search_pattern = f"%{search.lower()}%"
-            filters.append(
-                or_(
-                    func.lower(User.username).like(search_pattern),
-                    func.lower(User.email).like(search_pattern),
+            filters.append(UserService._substring_match(search.lower(), db.get_bind().dialect.name))
+
+        as_rows = bool(columns or expand)
+        if as_rows:
+            names = dict.fromkeys(["id", UserService.SORT_COLUMNS[sort_by], *(columns or [])])
+            query = select(
+                *(getattr(User, name) for name in names),
+                *(UserService.membership_names(kind).label(kind) for kind in expand or [])
+            ).where(*filters)
+        else:
+            query = (
+                select(User)
+                .options(
+                    selectinload(User.user_roles).selectinload(UserRole.role),
+                    selectinload(User.user_groups).selectinload(UserGroup.group)
                 )
+                .where(*filters)
             )
-        if filters:
-            query = query.where(*filters)
-        # Count total with same filters
-        count_query = select(func.count()).select_from(User).where(User.is_deleted == False)
-        if filters:
-            if role:
-                count_query = count_query.join(User.user_roles).join(UserRole.role)
-            if group:
-                count_query = count_query.join(User.user_groups).join(UserGroup.group)
-            count_query = count_query.where(*filters)
-        total_result = await db.execute(count_query)
-        total = total_result.scalar_one()
-        # Pagination:
-        offset = (page - 1) * limit
-        query = query.order_by(order_expr).offset(offset).limit(limit)
+        # The window count sees every filtered row before LIMIT/OFFSET, but not
+        # rows before a cursor, so cursor pages count separately.
+        count_in_page = total_mode == "exact" and cursor is None
+        if count_in_page:
+            query = query.add_columns(func.count().over().label("total"))
+        # Pagination: seek after the cursor when given, otherwise page offset
+        if cursor:
+            query = Keyset.seek(query, sort_column, User.id, cursor, db.get_bind().dialect.name)
+        else:
+            query = query.offset((page - 1) * limit)
+        query = Keyset.order(query, sort_column, User.id, sort_order).limit(limit)
         result = await db.execute(query)
-        users = result.scalars().unique().all()
+
+        total = None
+        if count_in_page:
+            rows = result.all()
+            users = rows if as_rows else [row.User for row in rows]
+            total = rows[0].total if rows else (0 if page == 1 else None)
+        else:
+            users = result.all() if as_rows else result.scalars().all()
+
+        if total_mode == "exact" and total is None:
+            # cursor page, or a page past the end where no row carried the count
+            total = (await db.execute(select(func.count()).select_from(User).where(*filters))).scalar_one()
+        elif total_mode == "estimate":
+            total = await UserService.estimate_user_count(db, filters, status, exact_fallback=bool(role or group or search))
         return total, users
+
+    @staticmethod
+    def membership_names(kind: str):
+        """
+        Correlated scalar subquery with the names of the user's live roles
+        (kind "roles") or groups ("groups"), joined with NAME_SEPARATOR; NULL
+        when there are none. string_agg on Postgres, group_concat on SQLite.
+        """
+        if kind == "roles":
+            target, link, link_target = Role, UserRole, UserRole.role_id
+        else:
+            target, link, link_target = Group, UserGroup, UserGroup.group_id
+        return (
+            select(func.aggregate_strings(target.name, NAME_SEPARATOR))
+            .join(link, link_target == target.id)
+            .where(link.user_id == User.id, link.is_deleted == False, target.is_deleted == False)
+            .scalar_subquery()
+        )
+
+    @staticmethod
+    def split_names(value: str | None) -> list[str]:
+        """Sorted names out of a membership_names value."""
+        return sorted(value.split(NAME_SEPARATOR)) if value else []
+
+    @staticmethod
+    async def search_users(db: AsyncSession, q: str, limit: int = 10) -> list[User]:
+        """
+        Autocomplete over live users: username prefix matches, then email
+        prefix matches, then substring matches anywhere (3+ characters).
+        The prefix phases read a range of the lower(column) prefix index in
+        index order up to the LIMIT, so their cost depends on `limit` rather
+        than on the number of users. The substring phase takes the first
+        matches the trigram index yields, in no particular order, and only
+        ranks those: it fills the remaining slots, it does not look for the
+        best substring matches among every user.
+        """
+        q = q.strip().lower()
+        if not q:
+            return []
+        dialect = db.get_bind().dialect.name
+        found: dict[int, User] = {}
+
+        for column in (User.username, User.email):
+            if len(found) >= limit:
+                break
+            key = UserService._prefix_key(column, dialect)
+            query = (
+                select(User)
+                .options(raiseload("*"))
+                .where(UserService._live_match(dialect), UserService._prefix_match(key, q, dialect))
+                .order_by(key)
+                .limit(limit - len(found))
+            )
+            if found:
+                query = query.where(User.id.not_in(list(found)))
+            # Index order is alphabetical; shorter (closer) completions first
+            matches = sorted((await db.execute(query)).scalars().all(), key=lambda u: len(getattr(u, column.key)))
+            for user in matches:
+                found[user.id] = user
+
+        if len(found) < limit and len(q) >= 3:
+            query = (
+                select(User)
+                .options(raiseload("*"))
+                .where(UserService._live_match(dialect), UserService._substring_match(q, dialect))
+                .limit(limit - len(found))
+            )
+            if found:
+                query = query.where(User.id.not_in(list(found)))
+
+            def position(user: User) -> tuple[int, int]:
+                index = user.username.lower().find(q)
+                return (index if index >= 0 else len(user.username), len(user.username))
+
+            for user in sorted((await db.execute(query)).scalars().all(), key=position):
+                found[user.id] = user
+        return list(found.values())
+
+    @staticmethod
+    def _live_match(dialect: str):
+        """Not soft-deleted, without steering the planner onto ix_users_status_created."""
+        if dialect == "sqlite":
+            # Without statistics SQLite rates is_deleted = 0 as selective and
+            # prefers the status index over the search indexes; likely() says otherwise
+            return func.likely(User.is_deleted == False)
+        return User.is_deleted == False
+
+    @staticmethod
+    def _prefix_key(column, dialect: str):
+        """
+        lower(column) as the prefix indexes store it. On Postgres that is under
+        the "C" collation: a text_pattern_ops or database-collation index could
+        serve the prefix LIKE or the ORDER BY, not both.
+        """
+        lowered = func.lower(column)
+        return lowered.collate("C") if dialect == "postgresql" else lowered
+
+    @staticmethod
+    def _prefix_match(lowered_column, q: str, dialect: str):
+        """`lowered_column` (a _prefix_key) starts with `q`, in a form the prefix indexes can serve."""
+        if dialect == "sqlite":
+            # SQLite only uses an index for LIKE under case_sensitive_like, so seek a range
+            return (lowered_column >= q) & (lowered_column < q + "\U0010ffff")
+        return lowered_column.like(UserService._escape_like(q) + "%", escape="/")
+
+    @staticmethod
+    def _substring_match(q: str, dialect: str):
+        """Username or email contains `q` (already lowercased)."""
+        if dialect == "sqlite" and len(q) >= 3:
+            # The trigram FTS5 index needs at least one full trigram
+            phrase = '"' + q.replace('"', '""') + '"'
+            fts_ids = (
+                select(literal_column("rowid"))
+                .select_from(table("users_fts"))
+                .where(text("users_fts MATCH :fts_phrase").bindparams(fts_phrase=phrase))
+            )
+            return User.id.in_(fts_ids)
+        # Postgres serves these from the pg_trgm GIN indexes on lower(column)
+        pattern = f"%{UserService._escape_like(q)}%"
+        return or_(
+            func.lower(User.username).like(pattern, escape="/"),
+            func.lower(User.email).like(pattern, escape="/"),
+        )
+
+    @staticmethod
+    def _escape_like(value: str) -> str:
+        return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+    @staticmethod
+    async def estimate_user_count(db: AsyncSession, filters: list, status: bool, exact_fallback: bool = False) -> int:
+        """
+        Cheap estimate of the number of users matching `filters`.
+
+        Postgres: the planner's row estimate for the filtered query (EXPLAIN),
+        which uses table statistics and never touches the rows.
+        Other databases: the `user_counters` row for `status`, kept by triggers.
+        Filters the estimate is poor for (`exact_fallback`: role, group, search)
+        or a missing counter fall back to an exact count.
+        """
+        count_query = select(func.count()).select_from(User).where(*filters)
+        if db.get_bind().dialect.name == "postgresql" and not exact_fallback:
+            # Values stay bound parameters: rendered into the SQL text, a ":word"
+            # inside a search term would be read as a parameter of its own
+            compiled = select(User.id).where(*filters).compile(
+                dialect=db.get_bind().dialect, compile_kwargs={"render_postcompile": True}
+            )
+            params = compiled.params
+            if compiled.positional:
+                params = tuple(params[name] for name in compiled.positiontup)
+            conn = await db.connection()
+            plan = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)).scalar_one()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            return int(plan[0]["Plan"]["Plan Rows"])
+        if not exact_fallback:
+            counter = (await db.execute(
+                select(UserCounter.total).where(UserCounter.is_active == bool(status))
+            )).scalar_one_or_none()
+            if counter is not None:
+                return counter
+        return (await db.execute(count_query)).scalar_one()
     
     @staticmethod
     async def check_username_exists(db: AsyncSession, username: str) -> bool:
@@ -228,31 +416,8 @@ class UserService:
         - Roles from groups via UserGroup -> GroupRole
         Removes duplicates.
         """
-        # Direct roles
-        direct_roles_query = (
-            select(Role)
-            .join(UserRole, UserRole.role_id == Role.id)
-            .where(
-                UserRole.user_id == user_id,
-                UserRole.is_deleted == False,
-                Role.is_deleted == False
-            )
-        )
-        # Roles via groups
-        group_roles_query = (
-            select(Role)
-            .join(GroupRole, GroupRole.role_id == Role.id)
-            .join(UserGroup, UserGroup.group_id == GroupRole.group_id)
-            .where(
-                UserGroup.user_id == user_id,
-                UserGroup.is_deleted == False,
-                GroupRole.is_deleted == False,
-                Role.is_deleted == False
-            )
-        )
-        # Execute queries
-        direct_roles_result = await db.execute(direct_roles_query)
-        group_roles_result = await db.execute(group_roles_query)
+        direct_roles_result = await db.execute(HotQueries.direct_roles_for_user(user_id))
+        group_roles_result = await db.execute(HotQueries.group_roles_for_user(user_id))
         # Combine and ensure unique Role IDs
         all_roles = {role.id: role for role in (direct_roles_result.scalars().all() + group_roles_result.scalars().all())}
         return list(all_roles.values())
@@ -266,15 +431,7 @@ class UserService:
         if not roles:
             return []
         role_ids = [role.id for role in roles]
-        result = await db.execute(
-            select(Permission)
-            .join(RolePermission, RolePermission.permission_id == Permission.id)
-            .where(
-                RolePermission.role_id.in_(role_ids),
-                RolePermission.is_deleted == False,
-                Permission.is_deleted == False,
-            )
-        )
+        result = await db.execute(HotQueries.permissions_for_roles(role_ids))
         return list({permission.id: permission.name for permission in result.scalars().all()}.values())
         
     @staticmethod
@@ -293,6 +450,7 @@ class UserService:
         try:
             await db.commit()
             await db.refresh(user)
+            await invalidation_bus.publish(EntityChanged("users", user.id))
             return True
         except IntegrityError:
             await db.rollback()
@@ -317,6 +475,7 @@ class UserService:
         try:
             await db.commit()
             await db.refresh(user)
+            await invalidation_bus.publish(EntityChanged("users", user.id))
             return True
         except IntegrityError:
             await db.rollback()
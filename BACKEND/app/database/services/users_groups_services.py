@@ -2,8 +2,11 @@ from datetime import datetime, timedelta, timezone
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import raiseload
 from app.config import Config
+from app.database.bulk import BulkLinks
 from app.database.models import UserGroup, Group, User
+from app.utils.invalidation import LinkChanged, invalidation_bus
 
 
 class UserGroupService:
@@ -65,12 +68,45 @@ class UserGroupService:
 
         try:
             await db.commit()
+            await invalidation_bus.publish(LinkChanged("users_groups", user_id, group_id))
             await db.refresh(user_group)
             return user_group
         except IntegrityError:
             await db.rollback()
             return None
 
+    @staticmethod
+    async def assign_users_to_group(
+        db: AsyncSession,
+        group_id: int,
+        user_ids: list[int],
+        valid_from: datetime | None = None,
+        valid_until: datetime | None = None,
+        created_by: int | None = None
+    ) -> dict[int, str] | None:
+        """
+        Bulk version of assign_user_group: per user id "created", "updated"
+        (existing or restored link) or "not_found" (missing or inactive user).
+        Returns None when the group does not exist.
+        """
+        group = await db.execute(select(Group.id).where(Group.id == group_id, Group.is_deleted == False))
+        if group.scalar_one_or_none() is None:
+            return None
+        now = datetime.now(timezone.utc)
+        return await BulkLinks.assign(
+            db,
+            owner_column=UserGroup.group_id,
+            owner_id=group_id,
+            target_column=UserGroup.user_id,
+            target_ids=user_ids,
+            valid_targets=select(User.id).where(User.id.in_(user_ids), User.is_active == True),
+            values={
+                "valid_from": valid_from or now,
+                "valid_until": valid_until or now + timedelta(days=Config.DEFAULT_USER_GROUP_VALIDITY),
+                "created_by": created_by,
+            },
+        )
+
     @staticmethod
     async def remove_user_group(db: AsyncSession, user_id: int, group_id: int) -> bool:
         """Soft-delete a user-group link."""
@@ -88,6 +124,7 @@ class UserGroupService:
         user_group.is_deleted = True
         try:
             await db.commit()
+            await invalidation_bus.publish(LinkChanged("users_groups", user_id, group_id))
             return True
         except IntegrityError:
             await db.rollback()
@@ -115,6 +152,7 @@ class UserGroupService:
         user_group.valid_until = new_valid_until
         try:
             await db.commit()
+            await invalidation_bus.publish(LinkChanged("users_groups", user_id, group_id))
             return True
         except IntegrityError:
             await db.rollback()
@@ -137,6 +175,7 @@ class UserGroupService:
         user_group.valid_until = datetime.now(timezone.utc)
         try:
             await db.commit()
+            await invalidation_bus.publish(LinkChanged("users_groups", user_id, group_id))
             return True
         except IntegrityError:
             await db.rollback()
@@ -177,7 +216,7 @@ class UserGroupService:
     async def get_all_groups_for_user(db: AsyncSession, user_id: int) -> list:
         """Get all groups for a user."""
         #check if user exists
-        result = await db.execute(select(User).where(User.id == user_id))
+        result = await db.execute(select(User).where(User.id == user_id).options(raiseload("*")))
         user = result.scalar_one_or_none()
         if not user:
             return None
@@ -189,5 +228,6 @@ class UserGroupService:
                 UserGroup.is_deleted == False,
                 Group.is_deleted == False
             )
+            .options(raiseload("*"))
         )
         return result.scalars().all()
\ No newline at end of file
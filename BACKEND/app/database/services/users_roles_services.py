@@ -2,9 +2,12 @@ from datetime import datetime, timedelta, timezone
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import raiseload
 from app.config import Config
+from app.database.bulk import BulkLinks
 from app.database.models import UserRole, Role, User
 from app.utils.logger import log
+from app.utils.invalidation import LinkChanged, invalidation_bus
 
 
 class UserRoleService:
@@ -66,6 +69,7 @@ class UserRoleService:
 
         try:
             await db.commit()
+            await invalidation_bus.publish(LinkChanged("users_roles", user_id, role_id))
             await db.refresh(user_role)
             log.info("User role assigned", user_id=user_id, role_id=role_id)
             return user_role
@@ -74,6 +78,38 @@ class UserRoleService:
             log.error("Failed to assign user role", user_id=user_id, role_id=role_id)
             return None
 
+    @staticmethod
+    async def assign_roles_to_user(
+        db: AsyncSession,
+        user_id: int,
+        role_ids: list[int],
+        valid_from: datetime | None = None,
+        valid_until: datetime | None = None,
+        created_by: int | None = None
+    ) -> dict[int, str] | None:
+        """
+        Bulk version of assigne_user_role: per role id "created", "updated"
+        (existing or restored link) or "not_found". Returns None when the user
+        does not exist or is inactive.
+        """
+        user = await db.execute(select(User.id).where(User.id == user_id, User.is_active == True))
+        if user.scalar_one_or_none() is None:
+            return None
+        now = datetime.now(timezone.utc)
+        return await BulkLinks.assign(
+            db,
+            owner_column=UserRole.user_id,
+            owner_id=user_id,
+            target_column=UserRole.role_id,
+            target_ids=role_ids,
+            valid_targets=select(Role.id).where(Role.id.in_(role_ids), Role.is_deleted == False),
+            values={
+                "valid_from": valid_from or now,
+                "valid_until": valid_until or now + timedelta(days=Config.DEFAULT_USER_ROLE_VALIDITY),
+                "created_by": created_by,
+            },
+        )
+
     @staticmethod
     async def remove_user_role(db: AsyncSession, user_id: int, role_id: int) -> bool:
         """Soft-delete a user-role link."""
@@ -91,6 +127,7 @@ class UserRoleService:
         user_role.is_deleted = True
         try:
             await db.commit()
+            await invalidation_bus.publish(LinkChanged("users_roles", user_id, role_id))
             log.info("User role deleted", user_id=user_id, role_id=role_id)
             return True
         except IntegrityError:
@@ -120,6 +157,7 @@ class UserRoleService:
         user_role.valid_until = new_valid_until
         try:
             await db.commit()
+            await invalidation_bus.publish(LinkChanged("users_roles", user_id, role_id))
             return True
         except IntegrityError:
             await db.rollback()
@@ -142,6 +180,7 @@ class UserRoleService:
         user_role.valid_until = datetime.now(timezone.utc)
         try:
             await db.commit()
+            await invalidation_bus.publish(LinkChanged("users_roles", user_id, role_id))
             log.info("User role expired", user_id=user_id, role_id=role_id)
             return True
         except IntegrityError:
@@ -165,7 +204,7 @@ class UserRoleService:
     async def get_all_roles_for_user(db: AsyncSession, user_id: int) -> list[UserRole]:
         """Fetch all active roles assigned to a user."""
         #check if user exists
-        user_result = await db.execute(select(User).where(User.id == user_id))
+        user_result = await db.execute(select(User).where(User.id == user_id).options(raiseload("*")))
         user = user_result.scalar_one_or_none()
         if not user:
             return None
@@ -177,6 +216,7 @@ class UserRoleService:
                 UserRole.is_deleted == False,
                 Role.is_deleted == False
             )
+            .options(raiseload("*"))
         )
         return result.scalars().all()
     
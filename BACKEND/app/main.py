@@ -1,16 +1,39 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_fastapi_instrumentator import Instrumentator
 from app.config import Config
-from app.api.routers import users, auth, permissions, groups, roles, health
+from app.api.routers import users, auth, permissions, groups, roles, health, stats, debug
+from app.auth.password_hash import PasswordHasher
 from app.middlewares.logger_middlewares import LogCorrelationIdMiddleware
+from app.middlewares.query_budget import QueryBudgetMiddleware
+from app.middlewares.read_your_writes import ReadYourWritesMiddleware
+from app.utils.invalidation import invalidation_bus
+from app.utils.loop_monitor import loop_monitor
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Connects this worker to the cache invalidation bus of the other workers
+    await invalidation_bus.start()
+    if Config.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    yield
+    if Config.LOOP_MONITOR_ENABLED:
+        await loop_monitor.stop()
+    await invalidation_bus.stop()
+    await PasswordHasher.shutdown()
+
 
 app = FastAPI(
     title="Users Module",
     description="Endpoints related to users authentications and authorizations.",
-    version=Config.VERSION
+    version=Config.VERSION,
+    lifespan=lifespan
 )
 
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(QueryBudgetMiddleware)
 app.add_middleware(LogCorrelationIdMiddleware)
 
 # Enable CORS for frontend requests — registered last so it executes FIRST on incoming requests
@@ -28,6 +51,8 @@ app.include_router(users.router)
 app.include_router(groups.router)
 app.include_router(roles.router)
 app.include_router(permissions.router)
+app.include_router(stats.router)
+app.include_router(debug.router)
 
 # Instrument Prometheus metrics and expose endpoint
 Instrumentator().instrument(app).expose(
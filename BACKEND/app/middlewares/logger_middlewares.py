@@ -1,6 +1,7 @@
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware
 import structlog
+import time
 import uuid
 
 from app.utils.logger import log
@@ -20,6 +21,7 @@ class LogCorrelationIdMiddleware(BaseHTTPMiddleware):
         )
 
         log.info("request_received")
+        started = time.perf_counter()
 
         try:
             response = await call_next(request)
@@ -32,7 +34,8 @@ class LogCorrelationIdMiddleware(BaseHTTPMiddleware):
         finally:
             if 'response' in locals():
                 response.headers["X-Correlation-ID"] = correlation_id
-                log.info("request_completed", status_code=response.status_code)
+                duration_ms = round((time.perf_counter() - started) * 1000, 2)
+                log.info("request_completed", status_code=response.status_code, duration_ms=duration_ms)
             structlog.contextvars.clear_contextvars()
 
         response.headers["X-Correlation-ID"] = correlation_id
@@ -0,0 +1,53 @@
+from fastapi import Request
+from prometheus_client import Counter
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.config import Config
+from app.database.engine import track_queries
+from app.utils.logger import log
+from app.utils.monitoring import DB_QUERIES_PER_REQUEST
+
+QUERY_BUDGET_EXCEEDED = Counter(
+    "query_budget_exceeded_total",
+    "Requests that ran more SQL statements than their route's budget.",
+    ["route"],
+)
+
+
+def route_name(request: Request) -> str | None:
+    """Name of the route that handled the request (set by the router), None when nothing matched."""
+    route = request.scope.get("route")
+    return getattr(route, "name", None)
+
+
+def query_budget(name: str) -> int:
+    return Config.QUERY_BUDGETS.get(name, Config.QUERY_BUDGET_DEFAULT)
+
+
+class QueryBudgetMiddleware(BaseHTTPMiddleware):
+    """
+    Counts the SQL statements each request runs, into db_queries_per_request,
+    and, when a route goes over its budget (QUERY_BUDGETS, by route name,
+    else QUERY_BUDGET_DEFAULT), logs a warning with the first statements and
+    increments query_budget_exceeded_total. Statements run while a streaming
+    body is sent are not counted. The same budgets are asserted by the test
+    suite.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        with track_queries(keep=Config.QUERY_BUDGET_LOG_STATEMENTS) as queries:
+            response = await call_next(request)
+        name = route_name(request)
+        if name is None:
+            return response
+        DB_QUERIES_PER_REQUEST.labels(route=name).observe(queries.count)
+        if Config.QUERY_BUDGET_MODE != "off" and queries.count > query_budget(name):
+            QUERY_BUDGET_EXCEEDED.labels(route=name).inc()
+            log.warning(
+                "Query budget exceeded",
+                route=name,
+                queries=queries.count,
+                budget=query_budget(name),
+                statements=queries.statements,
+            )
+        return response
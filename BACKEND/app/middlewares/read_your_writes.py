@@ -0,0 +1,147 @@
+import importlib
+import time
+from typing import Callable
+
+from fastapi import Request
+from jwt import PyJWTError
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.auth.jwt import JWTManager
+from app.config import Config
+from app.database.models import ReadPin, SessionLocal
+
+UNSAFE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+class PinBackend:
+    """
+    Storage of read-your-writes pins: token subject -> expiry. A write served
+    by one worker must pin the reads served by every other worker, so with
+    read replicas and several workers the backend has to be shared; select
+    one with READ_YOUR_WRITES_BACKEND.
+    """
+
+    async def pin(self, subject: str, seconds: float) -> None:
+        raise NotImplementedError
+
+    async def pinned(self, subject: str) -> bool:
+        raise NotImplementedError
+
+
+class MemoryPinBackend(PinBackend):
+    """
+    Per-process dict of expiries. A live pin is never evicted; expired ones
+    are dropped by a sweep at most every `sweep_interval` seconds.
+    """
+
+    def __init__(self, sweep_interval: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+        self.pins: dict[str, float] = {}
+        self.next_sweep = clock() + sweep_interval
+
+    async def pin(self, subject: str, seconds: float) -> None:
+        now = self.clock()
+        if now >= self.next_sweep:
+            self.pins = {key: expires for key, expires in self.pins.items() if expires > now}
+            self.next_sweep = now + self.sweep_interval
+        self.pins[subject] = now + seconds
+
+    async def pinned(self, subject: str) -> bool:
+        return self.pins.get(subject, 0.0) > self.clock()
+
+
+class DatabasePinBackend(PinBackend):
+    """
+    Pins in the read_pins table on the primary, shared by every worker using
+    the database: one upsert per write and one primary key lookup per
+    authenticated read. Expired rows are deleted at most every
+    `sweep_interval` seconds.
+    """
+
+    def __init__(self, session_factory=SessionLocal, sweep_interval: float = 60.0, clock: Callable[[], float] = time.time):
+        self.session_factory = session_factory
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+        self.next_sweep = clock() + sweep_interval
+
+    async def pin(self, subject: str, seconds: float) -> None:
+        now = self.clock()
+        async with self.session_factory() as db:
+            if now >= self.next_sweep:
+                self.next_sweep = now + self.sweep_interval
+                await db.execute(delete(ReadPin).where(ReadPin.expires <= now))
+            await db.execute(self.upsert(db.get_bind().dialect.name, subject, now + seconds))
+            await db.commit()
+
+    async def pinned(self, subject: str) -> bool:
+        async with self.session_factory() as db:
+            expires = (await db.execute(select(ReadPin.expires).where(ReadPin.subject == subject))).scalar_one_or_none()
+        return expires is not None and expires > self.clock()
+
+    @staticmethod
+    def upsert(dialect: str, subject: str, expires: float):
+        if dialect == "postgresql":
+            statement = postgresql.insert(ReadPin)
+        elif dialect == "sqlite":
+            statement = sqlite.insert(ReadPin)
+        else:
+            raise NotImplementedError(f"Database read pins are not supported on {dialect}")
+        return statement.values(subject=subject, expires=expires).on_conflict_do_update(
+            index_elements=["subject"], set_={"expires": expires},
+        )
+
+
+def load_pin_backend(spec: str) -> PinBackend:
+    """"memory", "database", or "package.module:ClassName" of a PinBackend built without arguments."""
+    if spec == "memory":
+        if Config.DATABASE_READ_REPLICA_URLS and Config.WEB_CONCURRENCY > 1:
+            raise RuntimeError(
+                f"READ_YOUR_WRITES_BACKEND=memory cannot pin reads across {Config.WEB_CONCURRENCY} workers; "
+                "use a shared backend (e.g. READ_YOUR_WRITES_BACKEND=database)"
+            )
+        return MemoryPinBackend(Config.READ_YOUR_WRITES_SWEEP_SECONDS)
+    if spec == "database":
+        return DatabasePinBackend(sweep_interval=Config.READ_YOUR_WRITES_SWEEP_SECONDS)
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+read_pins = load_pin_backend(Config.READ_YOUR_WRITES_BACKEND)
+
+
+def token_subject(request: Request) -> str | None:
+    """Subject (username) of the request's bearer access token, None when absent or invalid."""
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return JWTManager.decode_access_token(token).get("sub")
+    except PyJWTError:
+        return None
+
+
+async def pinned_to_primary(request: Request) -> bool:
+    """True while the request's user is inside the read-your-writes window of one of their writes."""
+    subject = token_subject(request)
+    return subject is not None and await read_pins.pinned(subject)
+
+
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """
+    After a successful write, pins the user's reads to the primary for
+    READ_YOUR_WRITES_SECONDS, so they never read a replica that has not yet
+    caught up with their own write. The pin is kept server-side, per token
+    subject, in `read_pins`: the frontend calls cross-origin with a bearer
+    token and no credentials, so a cookie would never come back.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if request.method in UNSAFE_METHODS and response.status_code < 400 and Config.DATABASE_READ_REPLICA_URLS:
+            subject = token_subject(request)
+            if subject is not None:
+                await read_pins.pin(subject, Config.READ_YOUR_WRITES_SECONDS)
+        return response
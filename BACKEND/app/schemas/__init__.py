@@ -1,5 +1,6 @@
-from .user import UserCreate, UserUpdate, UserOut, UsersResponse
+from .user import UserCreate, UserUpdate, UserOut, UsersResponse, UserPartialOut, UsersPartialResponse, UserImportRowError, UserImportReport
 from .role import RoleCreate, RoleUpdate, RoleOut
 from .group import GroupCreate, GroupUpdate, GroupOut
 from .permission import PermissionCreate, PermissionUpdate, PermissionOut
-from .association_schemas import AddUserToGroupForGroup, AddUserToGroupForUser, AddRoleToUserForRole, AddRoleToUserForUser, AddRoleToGroupForGroup, AddRoleToGroupForRole, AddPermissionToRoleForPermission, AddPermissionToRoleForRole
\ No newline at end of file
+from .association_schemas import AddUserToGroupForGroup, AddUserToGroupForUser, AddRoleToUserForRole, AddRoleToUserForUser, AddRoleToGroupForGroup, AddRoleToGroupForRole, AddPermissionToRoleForPermission, AddPermissionToRoleForRole, AddUsersToGroup, AddRolesToUser, AddRolesToGroup, AddPermissionsToRole, BulkAssignResult, BulkAssignResponse
+from .stats import StatsSummary
@@ -1,6 +1,7 @@
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel
+from typing import Literal, Optional
+from pydantic import BaseModel, Field
+from app.config import Config
 from .permission import PermissionOut
 from .user import UserOut
 from .group import GroupOut
@@ -34,6 +35,37 @@ class AddPermissionToRoleForRole(ValiditySchema):
 
 class AddPermissionToRoleForPermission(ValiditySchema):
     role_id: int
+
+# Bulk association requests: up to Config.BULK_ASSIGN_MAX_IDS ids per call
+
+class AddUsersToGroup(ValiditySchema):
+    user_ids: list[int] = Field(..., min_length=1, max_length=Config.BULK_ASSIGN_MAX_IDS)
+
+class AddRolesToUser(ValiditySchema):
+    role_ids: list[int] = Field(..., min_length=1, max_length=Config.BULK_ASSIGN_MAX_IDS)
+
+class AddRolesToGroup(ValiditySchema):
+    role_ids: list[int] = Field(..., min_length=1, max_length=Config.BULK_ASSIGN_MAX_IDS)
+
+class AddPermissionsToRole(BaseModel):
+    permission_ids: list[int] = Field(..., min_length=1, max_length=Config.BULK_ASSIGN_MAX_IDS)
+
+class BulkAssignResult(BaseModel):
+    id: int
+    status: Literal["created", "updated", "not_found"]
+
+class BulkAssignResponse(BaseModel):
+    created: int
+    updated: int
+    not_found: int
+    results: list[BulkAssignResult]
+
+    @classmethod
+    def from_statuses(cls, statuses: dict[int, str]) -> "BulkAssignResponse":
+        counts = {status: 0 for status in ("created", "updated", "not_found")}
+        for status in statuses.values():
+            counts[status] += 1
+        return cls(**counts, results=[BulkAssignResult(id=id, status=status) for id, status in statuses.items()])
     
 class RolesWithPermissions(BaseModel):
     id: int
@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import List, Literal
+from pydantic import BaseModel, ConfigDict
+
+
+class UserCounts(BaseModel):
+    active: int
+    inactive: int
+    deleted: int
+
+
+class RecentSignup(BaseModel):
+    id: int
+    username: str
+    email: str
+    created: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RecentSignups(BaseModel):
+    days: int
+    count: int
+    users: List[RecentSignup]
+
+
+# A user-role, user-group or group-role link; the subject is the user or group holding the target
+class ExpiringAssignment(BaseModel):
+    kind: Literal["user_role", "user_group", "group_role"]
+    subject_id: int
+    subject_name: str
+    target_id: int
+    target_name: str
+    valid_until: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ExpiringAssignments(BaseModel):
+    within_days: int
+    count: int
+    assignments: List[ExpiringAssignment]
+
+
+class StatsSummary(BaseModel):
+    generated_at: datetime
+    users: UserCounts
+    roles: int
+    groups: int
+    permissions: int
+    recent_signups: RecentSignups
+    expiring_assignments: ExpiringAssignments
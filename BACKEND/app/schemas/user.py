@@ -52,5 +52,42 @@ class UserDetail(UserOut):
 class UsersResponse(BaseModel):
     page: int
     limit: int
-    total: int
+    total: Optional[int]
+    total_mode: str = "exact"
     users: List[UserOut]
+    next_cursor: Optional[str] = None
+
+
+# ✅ Listing item for fields= / expand=: only the selected fields are rendered (exclude_unset)
+class UserPartialOut(BaseModel):
+    id: int
+    firstname: Optional[str] = None
+    middlename: Optional[str] = None
+    lastname: Optional[str] = None
+    username: Optional[str] = None
+    email: Optional[str] = None
+    is_active: Optional[bool] = None
+    is_verified: Optional[bool] = None
+    is_deleted: Optional[bool] = None
+    created: Optional[datetime] = None
+    updated: Optional[datetime] = None
+    roles: Optional[List[str]] = None
+    groups: Optional[List[str]] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class UsersPartialResponse(UsersResponse):
+    users: List[UserPartialOut]
+
+
+# ✅ Bulk import report: one entry per rejected row (rows are 1-based, header excluded)
+class UserImportRowError(BaseModel):
+    row: int
+    username: Optional[str] = None
+    errors: List[str]
+
+class UserImportReport(BaseModel):
+    total: int = 0
+    created: int = 0
+    failed: int = 0
+    errors: List[UserImportRowError] = []
@@ -0,0 +1,255 @@
+"""
+Synthetic dataset for scale testing.
+
+Adds users, roles, groups, permissions and their associations to the
+configured database (DATABASE_URL, migrations applied). Memberships follow
+power laws: the entity of rank r is picked with weight 1 / r ** skew, so a
+few roles and groups hold most members (skew 0 picks uniformly). How many
+roles and groups each user gets, roles each group grants and permissions
+each role carries are drawn uniformly from ranges such as "1-3".
+
+Every user gets the same password (--password), hashed once with bcrypt.
+Rows are written through the writer engine in chunks of --chunk rows, with
+COPY on Postgres and multi-row INSERTs elsewhere. Ids are assigned here,
+above the current maximum of each table, so associations need no lookups.
+Names start with --prefix, so several datasets can share a database.
+
+Run from BACKEND/:
+
+    python -m app.tools.seed --users 1000000
+    python -m app.tools.seed --users 50000 --roles 200 --role-skew 1.5 --prefix load
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Iterator
+
+from sqlalchemy import Table, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.auth.password_hash import PasswordHasher
+from app.database.models import (
+    Group, GroupRole, Permission, Role, RolePermission, User, UserGroup, UserRole, writer_engine,
+)
+
+
+def parse_range(spec: str) -> tuple[int, int]:
+    """"1-3" -> (1, 3); "2" -> (2, 2)."""
+    low, _, high = spec.partition("-")
+    try:
+        bounds = int(low), int(high or low)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected N or N-M, got {spec!r}")
+    if not 0 <= bounds[0] <= bounds[1]:
+        raise argparse.ArgumentTypeError(f"invalid range {spec!r}")
+    return bounds
+
+
+class Picker:
+    """Draws distinct ids from a power-law distribution over `ids` (the first id is the most popular)."""
+
+    def __init__(self, rng: random.Random, ids: range, skew: float):
+        self.rng = rng
+        self.ids = ids
+        weights = [1 / (rank + 1) ** skew for rank in range(len(ids))]
+        self.cumulative = list(itertools.accumulate(weights))
+
+    def pick(self, count_range: tuple[int, int]) -> set[int]:
+        count = min(self.rng.randint(*count_range), len(self.ids))
+        picked: set[int] = set()
+        # Redraw duplicates, with a bound for heavily skewed distributions
+        for _ in range(count * 4):
+            if len(picked) == count:
+                break
+            picked.update(self.rng.choices(self.ids, cum_weights=self.cumulative, k=count - len(picked)))
+        return picked
+
+
+async def next_id(engine: AsyncEngine, table: Table) -> int:
+    async with engine.connect() as conn:
+        return ((await conn.execute(select(func.max(table.c.id)))).scalar() or 0) + 1
+
+
+async def copy_rows(conn: AsyncConnection, table: Table, rows: list[dict]) -> None:
+    columns = list(rows[0])
+    driver = (await conn.get_raw_connection()).driver_connection
+    await driver.copy_records_to_table(
+        table.name, records=[tuple(row[column] for column in columns) for row in rows], columns=columns,
+    )
+
+
+async def insert_rows(engine: AsyncEngine, table: Table, rows: Iterable[dict], chunk: int) -> int:
+    """Writes `rows` in transactions of `chunk` rows; returns how many were written."""
+    written = 0
+    batch: list[dict] = []
+
+    async def flush() -> None:
+        async with engine.begin() as conn:
+            if conn.dialect.name == "postgresql":
+                await copy_rows(conn, table, batch)
+            else:
+                await conn.execute(insert(table), batch)
+
+    for row in rows:
+        batch.append(row)
+        if len(batch) == chunk:
+            await flush()
+            written += len(batch)
+            batch = []
+    if batch:
+        await flush()
+        written += len(batch)
+    return written
+
+
+async def sync_sequences(engine: AsyncEngine, tables: list[Table]) -> None:
+    """Ids were set explicitly: move the Postgres sequences past them."""
+    async with engine.begin() as conn:
+        if conn.dialect.name != "postgresql":
+            return
+        for table in tables:
+            await conn.execute(text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', 'id'), (SELECT max(id) FROM {table.name}))"
+            ))
+
+
+async def seed(
+    users: int,
+    roles: int = 200,
+    groups: int = 1000,
+    permissions: int = 100,
+    roles_per_user: tuple[int, int] = (1, 3),
+    groups_per_user: tuple[int, int] = (0, 2),
+    roles_per_group: tuple[int, int] = (1, 3),
+    permissions_per_role: tuple[int, int] = (3, 12),
+    role_skew: float = 1.0,
+    group_skew: float = 1.0,
+    permission_skew: float = 1.0,
+    prefix: str = "seed",
+    password: str = "password",
+    valid_days: int = 365,
+    chunk: int = 10_000,
+    rng: random.Random | None = None,
+    engine: AsyncEngine = writer_engine,
+) -> dict:
+    """
+    Generates the dataset and returns, per table, the rows written and, for
+    the entities, the first id (ids are consecutive from there).
+    """
+    rng = rng or random.Random()
+    started = time.perf_counter()
+    now = datetime.now(timezone.utc)
+    valid_until = now + timedelta(days=valid_days)
+    password_hash = PasswordHasher.get_password_hash(password)
+
+    ids = {}
+    for model, count in ((Permission, permissions), (Role, roles), (Group, groups), (User, users)):
+        first = await next_id(engine, model.__table__)
+        ids[model] = range(first, first + count)
+    permission_picker = Picker(rng, ids[Permission], permission_skew)
+    role_picker = Picker(rng, ids[Role], role_skew)
+    group_picker = Picker(rng, ids[Group], group_skew)
+
+    summary = {}
+
+    async def write(model, rows: Iterable[dict]) -> None:
+        summary[model.__tablename__] = {"rows": await insert_rows(engine, model.__table__, rows, chunk)}
+        if model in ids:
+            summary[model.__tablename__]["first_id"] = ids[model].start
+
+    def entities(name: str, model) -> Iterator[dict]:
+        for number, id in enumerate(ids[model], 1):
+            yield {"id": id, "name": f"{prefix}_{name}_{number}", "is_active": True, "is_deleted": False}
+
+    def links(left: str, right: str, owners: range, picker: Picker, count_range, **values) -> Iterator[dict]:
+        for owner in owners:
+            for target in picker.pick(count_range):
+                yield {left: owner, right: target, "is_deleted": False, **values}
+
+    await write(Permission, entities("permission", Permission))
+    await write(Role, entities("role", Role))
+    await write(Group, entities("group", Group))
+    await write(User, (
+        {
+            "id": id,
+            "firstname": "Seed",
+            "lastname": f"User{number}",
+            "username": f"{prefix}_{number}",
+            "email": f"{prefix}_{number}@example.com",
+            "password": password_hash,
+            "is_verified": True,
+            "is_active": True,
+            "is_deleted": False,
+            "created": now - timedelta(seconds=rng.randint(0, 365 * 86400)),
+        }
+        for number, id in enumerate(ids[User])
+    ))
+    await write(RolePermission, links(
+        "role_id", "permission_id", ids[Role], permission_picker, permissions_per_role,
+    ))
+    await write(GroupRole, links(
+        "group_id", "role_id", ids[Group], role_picker, roles_per_group, valid_until=valid_until,
+    ))
+    await write(UserRole, links(
+        "user_id", "role_id", ids[User], role_picker, roles_per_user, valid_until=valid_until,
+    ))
+    await write(UserGroup, links(
+        "user_id", "group_id", ids[User], group_picker, groups_per_user, valid_until=valid_until,
+    ))
+    await sync_sequences(engine, [Permission.__table__, Role.__table__, Group.__table__, User.__table__])
+    summary["seconds"] = round(time.perf_counter() - started, 1)
+    return summary
+
+
+async def main(args) -> dict:
+    try:
+        async with writer_engine.connect() as conn:
+            taken = (await conn.execute(select(User.id).where(User.username == f"{args.prefix}_0"))).first()
+        if taken:
+            raise SystemExit(f"Users named {args.prefix}_* already exist; pass another --prefix")
+        return await seed(
+            users=args.users,
+            roles=args.roles,
+            groups=args.groups,
+            permissions=args.permissions,
+            roles_per_user=args.roles_per_user,
+            groups_per_user=args.groups_per_user,
+            roles_per_group=args.roles_per_group,
+            permissions_per_role=args.permissions_per_role,
+            role_skew=args.role_skew,
+            group_skew=args.group_skew,
+            permission_skew=args.permission_skew,
+            prefix=args.prefix,
+            password=args.password,
+            valid_days=args.valid_days,
+            chunk=args.chunk,
+            rng=random.Random(args.seed),
+        )
+    finally:
+        await writer_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--roles", type=int, default=200)
+    parser.add_argument("--groups", type=int, default=1000)
+    parser.add_argument("--permissions", type=int, default=100)
+    parser.add_argument("--roles-per-user", type=parse_range, default=(1, 3))
+    parser.add_argument("--groups-per-user", type=parse_range, default=(0, 2))
+    parser.add_argument("--roles-per-group", type=parse_range, default=(1, 3))
+    parser.add_argument("--permissions-per-role", type=parse_range, default=(3, 12))
+    parser.add_argument("--role-skew", type=float, default=1.0, help="Power-law exponent of role popularity (0 = uniform)")
+    parser.add_argument("--group-skew", type=float, default=1.0, help="Power-law exponent of group popularity (0 = uniform)")
+    parser.add_argument("--permission-skew", type=float, default=1.0, help="Power-law exponent of permission popularity (0 = uniform)")
+    parser.add_argument("--prefix", default="seed", help="Start of every generated name; must not be in use yet")
+    parser.add_argument("--password", default="password", help="Password of every generated user")
+    parser.add_argument("--valid-days", type=int, default=365, help="Validity of the generated assignments")
+    parser.add_argument("--chunk", type=int, default=10_000, help="Rows per INSERT/COPY transaction")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(main(args)), indent=2))
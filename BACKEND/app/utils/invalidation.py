@@ -0,0 +1,291 @@
+import asyncio
+import dataclasses
+import importlib
+import json
+import time
+import uuid
+from typing import Awaitable, Callable
+
+from prometheus_client import Counter
+from sqlalchemy import delete, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.config import Config
+from app.database.models import InvalidationLog, engine, writer_engine
+from app.utils.logger import log
+
+INVALIDATION_EVENTS = Counter(
+    "invalidation_events_total",
+    "Cache invalidation events handled, by event type and source (local publish or another worker).",
+    ["type", "source"],
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class Invalidation:
+    """Base of the events services publish after committing a write."""
+
+
+@dataclasses.dataclass(frozen=True)
+class EntityChanged(Invalidation):
+    """A row of `resource` ("users", "roles", ...) was created, updated or deleted; id None stands for any row."""
+    resource: str
+    id: int | None = None
+
+
+@dataclasses.dataclass(frozen=True)
+class LinkChanged(Invalidation):
+    """
+    Association rows of `table` ("users_roles", "users_groups", "groups_roles",
+    "roles_permissions") were added, removed or changed validity. `left_id`
+    and `right_id` follow the table's key columns (users_roles: user_id,
+    role_id); None stands for any id, as after a bulk assignment.
+    """
+    table: str
+    left_id: int | None = None
+    right_id: int | None = None
+
+
+EVENT_TYPES = {cls.__name__: cls for cls in (EntityChanged, LinkChanged)}
+
+Handler = Callable[[Invalidation], Awaitable[None]]
+Receiver = Callable[[str], Awaitable[None]]
+
+
+class InvalidationBackend:
+    """
+    Transport of encoded events between workers. `start` begins handing the
+    payloads published by any worker (this one included) to `receive`;
+    `send` publishes one.
+    """
+
+    async def start(self, receive: Receiver) -> None:
+        pass
+
+    async def send(self, payload: str) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class LocalBackend(InvalidationBackend):
+    """Single-process deployments: events only reach this worker's subscribers."""
+
+
+class PostgresNotifyBackend(InvalidationBackend):
+    """
+    NOTIFY on `channel` after the write committed, LISTEN on one connection
+    of the engine's pool held for the worker's lifetime. Payloads are small
+    (Postgres caps them at 8000 bytes). When the listening connection drops
+    it is re-established after `reconnect_delay` seconds; events sent in
+    between are missed, which the caches' TTL bounds.
+    """
+
+    def __init__(self, engine: AsyncEngine, channel: str, reconnect_delay: float = 1.0):
+        self.engine = engine
+        self.channel = channel
+        self.reconnect_delay = reconnect_delay
+        self.connection: AsyncConnection | None = None
+        self.receive: Receiver | None = None
+        self.tasks: set[asyncio.Task] = set()
+        self.stopped = False
+
+    async def start(self, receive: Receiver) -> None:
+        self.receive = receive
+        self.stopped = False
+        await self._listen()
+
+    async def send(self, payload: str) -> None:
+        async with self.engine.begin() as conn:
+            await conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": self.channel, "payload": payload})
+
+    async def stop(self) -> None:
+        self.stopped = True
+        for task in list(self.tasks):
+            task.cancel()
+        if self.connection is not None:
+            await self.connection.close()
+            self.connection = None
+
+    async def _listen(self) -> None:
+        self.connection = await self.engine.connect()
+        driver = (await self.connection.get_raw_connection()).driver_connection
+        await driver.add_listener(self.channel, self._on_notify)
+        driver.add_termination_listener(self._on_terminated)
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        self._spawn(self.receive(payload))
+
+    def _on_terminated(self, connection) -> None:
+        if not self.stopped:
+            log.warning("Invalidation listener connection lost; reconnecting", channel=self.channel)
+            self._spawn(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        if self.connection is not None:
+            await self.connection.invalidate()
+            self.connection = None
+        while not self.stopped:
+            await asyncio.sleep(self.reconnect_delay)
+            try:
+                await self._listen()
+                return
+            except Exception as exc:
+                log.warning("Invalidation listener reconnect failed", channel=self.channel, error=str(exc))
+
+    def _spawn(self, coroutine) -> None:
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+
+class PollingBackend(InvalidationBackend):
+    """
+    For SQLite: events are rows appended to invalidation_log through the
+    writer engine, and every worker reads the rows above the last id it has
+    seen every `interval` seconds. Rows older than `retention` seconds are
+    pruned by whichever worker polls next.
+    """
+
+    def __init__(self, engine: AsyncEngine, writer_engine: AsyncEngine, interval: float, retention: float):
+        self.engine = engine
+        self.writer_engine = writer_engine
+        self.interval = interval
+        self.retention = retention
+        self.last_id = 0
+        self.next_prune = 0.0
+        self.receive: Receiver | None = None
+        self.task: asyncio.Task | None = None
+
+    async def start(self, receive: Receiver) -> None:
+        self.receive = receive
+        async with self.engine.connect() as conn:
+            self.last_id = (await conn.execute(select(func.max(InvalidationLog.id)))).scalar() or 0
+        self.task = asyncio.get_running_loop().create_task(self._run())
+
+    async def send(self, payload: str) -> None:
+        async with self.writer_engine.begin() as conn:
+            await conn.execute(insert(InvalidationLog).values(payload=payload, created=time.time()))
+
+    async def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def poll(self) -> None:
+        async with self.engine.connect() as conn:
+            rows = (await conn.execute(
+                select(InvalidationLog.id, InvalidationLog.payload)
+                .where(InvalidationLog.id > self.last_id)
+                .order_by(InvalidationLog.id)
+            )).all()
+        for row in rows:
+            self.last_id = row.id
+            await self.receive(row.payload)
+        now = time.time()
+        if now >= self.next_prune:
+            self.next_prune = now + self.retention
+            async with self.writer_engine.begin() as conn:
+                await conn.execute(delete(InvalidationLog).where(InvalidationLog.created < now - self.retention))
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.poll()
+            except Exception as exc:
+                log.warning("Invalidation poll failed", error=str(exc))
+
+
+def load_backend(spec: str) -> InvalidationBackend:
+    """
+    "auto" (by the database dialect), "postgres", "sqlite", "local", or
+    "package.module:ClassName" of an InvalidationBackend built without arguments.
+    """
+    if spec == "auto":
+        spec = {"postgresql": "postgres", "sqlite": "sqlite"}.get(writer_engine.dialect.name, "local")
+    if spec == "local":
+        return LocalBackend()
+    if spec == "postgres":
+        return PostgresNotifyBackend(writer_engine, Config.INVALIDATION_BUS_CHANNEL)
+    if spec == "sqlite":
+        return PollingBackend(engine, writer_engine, Config.INVALIDATION_POLL_SECONDS, Config.INVALIDATION_LOG_RETENTION_SECONDS)
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+class InvalidationBus:
+    """
+    Pub/sub of cache invalidation events between the workers of a deployment.
+
+    Services publish an event after their write has committed; subscribers
+    (in-process caches) drop what the event makes stale. Publishing runs this
+    worker's subscribers right away, then hands the event to the backend for
+    the other workers, which ignore their own events when they come back.
+    Until `start()` (application startup) events stay in-process. A failed
+    send is logged rather than raised: the write has already committed, and
+    cache TTLs bound how long other workers stay stale.
+    """
+
+    def __init__(self, backend: InvalidationBackend, origin: str | None = None):
+        self.backend = backend
+        self.origin = origin or uuid.uuid4().hex
+        self.handlers: list[Handler] = []
+        self.started = False
+
+    def subscribe(self, handler: Handler) -> Handler:
+        """Registers `handler` for every event; usable as a decorator."""
+        self.handlers.append(handler)
+        return handler
+
+    async def publish(self, event: Invalidation) -> None:
+        await self._deliver(event, "local")
+        if not self.started:
+            return
+        try:
+            await self.backend.send(self.encode(event))
+        except Exception as exc:
+            log.warning("Invalidation publish failed", invalidation=repr(event), error=str(exc))
+
+    async def start(self) -> None:
+        try:
+            await self.backend.start(self._receive)
+        except Exception as exc:
+            # e.g. migrations not applied yet: keep serving, with in-process invalidation only
+            log.warning("Invalidation bus unavailable; events stay in this process", error=str(exc))
+            return
+        self.started = True
+
+    async def stop(self) -> None:
+        self.started = False
+        await self.backend.stop()
+
+    def encode(self, event: Invalidation) -> str:
+        return json.dumps({"type": type(event).__name__, "origin": self.origin, **dataclasses.asdict(event)})
+
+    @staticmethod
+    def decode(payload: str) -> tuple[str, Invalidation]:
+        fields = json.loads(payload)
+        origin = fields.pop("origin")
+        return origin, EVENT_TYPES[fields.pop("type")](**fields)
+
+    async def _receive(self, payload: str) -> None:
+        try:
+            origin, event = self.decode(payload)
+        except (ValueError, KeyError, TypeError) as exc:
+            log.warning("Invalid invalidation payload", payload=payload, error=str(exc))
+            return
+        if origin != self.origin:
+            await self._deliver(event, "remote")
+
+    async def _deliver(self, event: Invalidation, source: str) -> None:
+        INVALIDATION_EVENTS.labels(type=type(event).__name__, source=source).inc()
+        for handler in self.handlers:
+            try:
+                await handler(event)
+            except Exception as exc:
+                log.warning("Invalidation handler failed", invalidation=repr(event), error=str(exc))
+
+
+invalidation_bus = InvalidationBus(load_backend(Config.INVALIDATION_BUS_BACKEND))
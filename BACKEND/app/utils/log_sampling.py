@@ -0,0 +1,65 @@
+import random
+from typing import Callable
+
+import structlog
+from prometheus_client import Counter
+
+from app.config import Config
+
+# Levels that are never sampled out, whatever the per-event rate says.
+ALWAYS_KEEP_LEVELS = {"warning", "warn", "error", "exception", "critical"}
+
+LOG_EVENTS_SUPPRESSED = Counter(
+    "log_events_suppressed_total",
+    "Number of log events dropped by the sampling processor.",
+    ["event"],
+)
+
+
+class LogSampler:
+    """
+    structlog processor that keeps only a fraction of high-volume events.
+
+    - Events not listed in `rates` are always kept.
+    - Events at warning level or above are always kept.
+    - `request_completed` events for slow (>= slow_request_ms) or failed
+      (status >= 500) requests are always kept.
+    - Every dropped event increments `log_events_suppressed_total{event=...}`.
+    """
+
+    def __init__(
+        self,
+        rates: dict[str, float],
+        slow_request_ms: float,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.rates = rates
+        self.slow_request_ms = slow_request_ms
+        self.rng = rng
+
+    def should_keep(self, event_dict: dict) -> bool:
+        event = event_dict.get("event")
+        rate = self.rates.get(event)
+        if rate is None or rate >= 1:
+            return True
+        if event_dict.get("level") in ALWAYS_KEEP_LEVELS:
+            return True
+        status_code = event_dict.get("status_code")
+        if isinstance(status_code, int) and status_code >= 500:
+            return True
+        duration_ms = event_dict.get("duration_ms")
+        if duration_ms is not None and duration_ms >= self.slow_request_ms:
+            return True
+        return rate > 0 and self.rng() < rate
+
+    def __call__(self, logger, method_name: str, event_dict: dict) -> dict:
+        if self.should_keep(event_dict):
+            return event_dict
+        LOG_EVENTS_SUPPRESSED.labels(event=event_dict.get("event")).inc()
+        raise structlog.DropEvent
+
+
+log_sampler = LogSampler(
+    rates=Config.LOG_SAMPLE_RATES,
+    slow_request_ms=Config.LOG_SAMPLE_SLOW_REQUEST_MS,
+)
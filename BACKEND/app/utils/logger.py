@@ -4,6 +4,7 @@ import logging
 import os
 
 from app.config import Config
+from app.utils.log_sampling import log_sampler
 
 os.makedirs(Config.LOG_FOLDERNAME, exist_ok=True)
 
@@ -27,8 +28,9 @@ logging.basicConfig(
 structlog.configure(
     processors=[
         structlog.contextvars.merge_contextvars,
-        structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.add_log_level,
+        log_sampler,
+        structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
         structlog.processors.JSONRenderer()
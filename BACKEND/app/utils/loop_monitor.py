@@ -0,0 +1,132 @@
+import asyncio
+import contextvars
+import sys
+import threading
+import time
+import traceback
+import weakref
+
+from prometheus_client import Counter, Histogram
+from structlog.contextvars import STRUCTLOG_KEY_PREFIX
+
+from app.config import Config
+from app.utils.logger import log
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between when the monitor's timer was due and when the event loop ran it.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+EVENT_LOOP_BLOCKED = Counter(
+    "event_loop_blocked_total",
+    "Times the event loop stayed busy past LOOP_BLOCKED_THRESHOLD_SECONDS without reaching the monitor.",
+)
+
+
+def bound_log_context(context: contextvars.Context) -> dict:
+    """The structlog context variables (correlation_id, path, ...) set in `context`."""
+    return {
+        var.name[len(STRUCTLOG_KEY_PREFIX):]: value
+        for var, value in context.items()
+        if var.name.startswith(STRUCTLOG_KEY_PREFIX) and value is not Ellipsis
+    }
+
+
+class LoopMonitor:
+    """
+    Measures event loop scheduling lag and reports callbacks that block it.
+
+    A task on the loop sleeps `interval` seconds at a time and records how
+    late it wakes up (event_loop_lag_seconds); each wake-up is a heartbeat.
+    A watchdog thread checks the heartbeat, and when the loop has not
+    reached it for `threshold` seconds it captures the loop thread's stack,
+    which shows the callback that is blocking. It then logs a warning with
+    the stack and the log context (correlation ID, path, method) of the
+    running task, and counts it in event_loop_blocked_total. Each stall is
+    reported once, however long it lasts.
+
+    To know the running task's context, the monitor installs a task factory
+    that remembers the context every task is created with (Python 3.11 tasks
+    do not expose it). An existing task factory is left in place, and stalls
+    are then reported without the log context.
+    """
+
+    def __init__(self, interval: float, threshold: float, stack_limit: int = 30):
+        self.interval = interval
+        self.threshold = threshold
+        self.stack_limit = stack_limit
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.loop_thread_id: int | None = None
+        self.heartbeat = 0.0
+        self.task: asyncio.Task | None = None
+        self.watchdog: threading.Thread | None = None
+        self.stopped = threading.Event()
+        self.contexts: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def start(self) -> None:
+        """Call from the running loop (application startup)."""
+        self.loop = asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        if self.loop.get_task_factory() is None:
+            self.loop.set_task_factory(self._create_task)
+        self.heartbeat = time.monotonic()
+        self.stopped.clear()
+        self.task = self.loop.create_task(self._measure())
+        self.watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self.watchdog.start()
+
+    async def stop(self) -> None:
+        self.stopped.set()
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        if self.loop is not None and self.loop.get_task_factory() == self._create_task:
+            self.loop.set_task_factory(None)
+        if self.watchdog is not None:
+            await asyncio.to_thread(self.watchdog.join)
+            self.watchdog = None
+
+    def _create_task(self, loop, coro, context=None):
+        context = context if context is not None else contextvars.copy_context()
+        task = asyncio.Task(coro, loop=loop, context=context)
+        self.contexts[task] = context
+        return task
+
+    async def _measure(self) -> None:
+        while True:
+            due = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            EVENT_LOOP_LAG.observe(max(0.0, now - due))
+            self.heartbeat = now
+
+    def _watch(self) -> None:
+        reported = None
+        while not self.stopped.wait(min(self.interval, self.threshold) / 2):
+            heartbeat = self.heartbeat
+            blocked = time.monotonic() - heartbeat - self.interval
+            if blocked >= self.threshold and reported != heartbeat:
+                reported = heartbeat
+                self.report(blocked)
+
+    def report(self, blocked: float) -> None:
+        """Runs on the watchdog thread while the loop is blocked."""
+        frame = sys._current_frames().get(self.loop_thread_id)
+        stack = "".join(traceback.format_stack(frame, limit=self.stack_limit)) if frame is not None else None
+        task = asyncio.current_task(self.loop)
+        context = self.contexts.get(task) if task is not None else None
+        EVENT_LOOP_BLOCKED.inc()
+        log.warning(
+            "Event loop blocked",
+            blocked_ms=round(blocked * 1000, 1),
+            task=task.get_name() if task is not None else None,
+            stack=stack,
+            **(bound_log_context(context) if context is not None else {}),
+        )
+
+
+loop_monitor = LoopMonitor(
+    interval=Config.LOOP_MONITOR_INTERVAL_SECONDS,
+    threshold=Config.LOOP_BLOCKED_THRESHOLD_SECONDS,
+    stack_limit=Config.LOOP_BLOCKED_STACK_LIMIT,
+)
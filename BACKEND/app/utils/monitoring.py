@@ -0,0 +1,180 @@
+import functools
+import hashlib
+import os
+import re
+import sys
+import time
+
+import greenlet
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import Config
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "SQL statement execution time, by statement fingerprint and the app function that issued it.",
+    ["fingerprint", "caller"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+DB_QUERY_ROWS = Histogram(
+    "db_query_rows",
+    "Rows returned (SELECT) or affected (INSERT/UPDATE/DELETE) per statement, by fingerprint.",
+    ["fingerprint"],
+    buckets=(0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000),
+)
+DB_STATEMENTS = Gauge(
+    "db_statement_info",
+    "Normalized SQL text of each statement fingerprint (always 1).",
+    ["fingerprint", "statement"],
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements run per HTTP request, by route name.",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_TRANSACTION_DURATION = Histogram(
+    "db_transaction_duration_seconds",
+    "Time from BEGIN to COMMIT or ROLLBACK, by engine and outcome (commit, rollback, close).",
+    ["engine", "outcome"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+DB_TRANSACTIONS = Counter(
+    "db_transactions_total",
+    "Transactions ended, by engine and outcome (commit, rollback, close: rolled back without writing).",
+    ["engine", "outcome"],
+)
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Frames attributed to the caller: the app's, minus the instrumentation itself
+CALLER_ROOTS = (APP_DIR + os.sep,)
+SKIPPED_FILES = frozenset({os.path.abspath(__file__), os.path.join(APP_DIR, "database", "engine.py")})
+
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|(?<!:):\w+|\(?__\[POSTCOMPILE_\w+\]\)?")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_REPEATED_LIST = re.compile(r"\(\?\)(?:\s*,\s*\(\?\))+")
+_SPACE = re.compile(r"\s+")
+
+_fingerprints: set[str] = set()
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_statement(statement: str) -> str:
+    """
+    SQL text with literals and bound parameters replaced by ?, value lists
+    (IN lists, multi-row VALUES) collapsed to a single (?) and whitespace
+    collapsed, so every execution of one query shape gets the same text.
+    """
+    statement = _PARAMETER.sub("?", statement)
+    statement = _LITERAL.sub("?", statement)
+    statement = _SPACE.sub(" ", statement).strip()
+    statement = _LIST.sub("(?)", statement)
+    return _REPEATED_LIST.sub("(?)", statement)
+
+
+@functools.lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """
+    Short hash of the normalized statement. Past DB_METRICS_MAX_FINGERPRINTS
+    distinct ones, new shapes share "other" to bound the label cardinality.
+    """
+    normalized = normalize_statement(statement)
+    digest = hashlib.sha1(normalized.encode()).hexdigest()[:12]
+    if digest not in _fingerprints:
+        if len(_fingerprints) >= Config.DB_METRICS_MAX_FINGERPRINTS:
+            return "other"
+        _fingerprints.add(digest)
+        DB_STATEMENTS.labels(fingerprint=digest, statement=normalized[:Config.DB_METRICS_STATEMENT_LENGTH]).set(1)
+    return digest
+
+
+def query_caller() -> str:
+    """
+    Qualified name of the innermost app function on the stack (e.g.
+    "UserService.search_users"). Under the async engine the statement runs
+    in a greenlet whose stack stops at SQLAlchemy; the awaiting coroutines
+    are on the stack of the greenlet that spawned it.
+    """
+    current = greenlet.getcurrent()
+    frame = current.parent.gr_frame if current.parent is not None else sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(CALLER_ROOTS) and filename not in SKIPPED_FILES:
+            return frame.f_code.co_qualname
+        frame = frame.f_back
+    return "other"
+
+
+def result_rows(cursor, context) -> int | None:
+    """Rows a SELECT returned, or the rowcount of a DML statement; None when unknown (server-side cursors)."""
+    if cursor.description is None:
+        return cursor.rowcount if cursor.rowcount >= 0 else None
+    if context is not None and context.execution_options.get("stream_results"):
+        return None
+    # The async dialects' cursor adapters buffer the whole result on execute
+    rows = getattr(cursor, "_rows", None)
+    return len(rows) if rows is not None else None
+
+
+# First keywords of textual statements that do not write
+READ_KEYWORDS = frozenset({"select", "with", "explain", "show", "pragma", "values"})
+
+
+def writes(statement: str, context) -> bool:
+    """Whether a statement is DML or DDL: from the compiled construct, or the first keyword of text()."""
+    if context is not None and not context.is_text:
+        return bool(context.isinsert or context.isupdate or context.isdelete or context.isddl)
+    keyword = statement.lstrip(" \t\n(").split(None, 1)[:1]
+    return not keyword or keyword[0].lower() not in READ_KEYWORDS
+
+
+def instrument_database(engine: AsyncEngine, engine_name: str) -> None:
+    """Records statement latency and rows, and transaction duration and outcome, for the engine."""
+    if not Config.DB_METRICS_ENABLED:
+        return
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _start_query(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+        if not conn.info.get("transaction_wrote") and writes(statement, context):
+            conn.info["transaction_wrote"] = True
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _record_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        key = fingerprint(statement)
+        DB_QUERY_DURATION.labels(fingerprint=key, caller=query_caller()).observe(elapsed)
+        rows = result_rows(cursor, context)
+        if rows is not None:
+            DB_QUERY_ROWS.labels(fingerprint=key).observe(rows)
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _discard_query(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
+
+    @event.listens_for(sync_engine, "begin")
+    def _start_transaction(conn):
+        conn.info["transaction_started"] = time.perf_counter()
+
+    def _end_transaction(conn, outcome: str) -> None:
+        started = conn.info.pop("transaction_started", None)
+        conn.info.pop("transaction_wrote", None)
+        DB_TRANSACTIONS.labels(engine=engine_name, outcome=outcome).inc()
+        if started is not None:
+            DB_TRANSACTION_DURATION.labels(engine=engine_name, outcome=outcome).observe(time.perf_counter() - started)
+
+    @event.listens_for(sync_engine, "commit")
+    def _commit(conn):
+        _end_transaction(conn, "commit")
+
+    @event.listens_for(sync_engine, "rollback")
+    def _rollback(conn):
+        # Sessions end read-only transactions (every close) with a rollback;
+        # "rollback" only counts the ones that threw away writes
+        _end_transaction(conn, "rollback" if conn.info.get("transaction_wrote") else "close")
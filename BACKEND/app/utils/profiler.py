@@ -0,0 +1,200 @@
+import asyncio
+import collections
+import dataclasses
+import functools
+import os
+import sys
+import threading
+import time
+
+from app.utils.logger import log
+
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Longest first, so site-packages wins over the interpreter's lib directory
+PATH_ROOTS = tuple(sorted(
+    {os.path.abspath(path) + os.sep for path in (*sys.path, APP_ROOT) if path and os.path.isdir(path)},
+    key=len, reverse=True,
+))
+
+
+@functools.lru_cache(maxsize=8192)
+def frame_label(code) -> str:
+    """ "UserService.search_users (app/database/services/user_service.py:245)" for a code object."""
+    filename = code.co_filename
+    for root in PATH_ROOTS:
+        if filename.startswith(root):
+            filename = filename[len(root):]
+            break
+    return f"{code.co_qualname} ({filename}:{code.co_firstlineno})"
+
+
+def thread_stack(frame) -> tuple[str, ...]:
+    """Labels of a thread's frames, outermost first."""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame.f_code))
+        frame = frame.f_back
+    return tuple(reversed(labels))
+
+
+def await_chain(task: asyncio.Task) -> tuple[str, ...]:
+    """
+    Labels of the coroutines a task is suspended in, from its root coroutine
+    down to the innermost one awaiting a future (or running, for the task
+    that holds the loop).
+    """
+    labels = []
+    coro = task.get_coro()
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            break
+        labels.append(frame_label(frame.f_code))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return tuple(labels)
+
+
+@dataclasses.dataclass
+class Profile:
+    """
+    Samples of one profiling run. `stacks` counts the event loop thread's
+    stacks; `task_stacks` counts, per sample, the await chain of every task
+    alive on the loop, so a count times `sample_seconds` is the wall time
+    tasks spent at that point (running or suspended). `tasks` is the number
+    of distinct tasks seen per root coroutine.
+    """
+    duration: float
+    samples: int
+    stacks: collections.Counter = dataclasses.field(default_factory=collections.Counter)
+    task_stacks: collections.Counter = dataclasses.field(default_factory=collections.Counter)
+    tasks: dict[str, set] = dataclasses.field(default_factory=lambda: collections.defaultdict(set))
+
+    @property
+    def sample_seconds(self) -> float:
+        return self.duration / self.samples if self.samples else 0.0
+
+    def collapsed(self) -> str:
+        """Event loop thread stacks in the collapsed format of flamegraph.pl / speedscope / inferno."""
+        return "".join(f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common())
+
+    def coroutines(self) -> list[dict]:
+        """Wall time per root coroutine, with the points its tasks spent the longest at."""
+        by_root: dict[str, dict] = {}
+        for stack, count in self.task_stacks.items():
+            entry = by_root.setdefault(stack[0], {"samples": 0, "awaiting": collections.Counter()})
+            entry["samples"] += count
+            entry["awaiting"][stack[-1]] += count
+        return sorted(
+            (
+                {
+                    "coroutine": root,
+                    "tasks": len(self.tasks[root]),
+                    "wall_seconds": round(entry["samples"] * self.sample_seconds, 4),
+                    "awaiting": [
+                        {"frame": frame, "wall_seconds": round(count * self.sample_seconds, 4)}
+                        for frame, count in entry["awaiting"].most_common(5)
+                    ],
+                }
+                for root, entry in by_root.items()
+            ),
+            key=lambda entry: entry["wall_seconds"],
+            reverse=True,
+        )
+
+    def speedscope(self) -> dict:
+        """
+        The speedscope file format (https://www.speedscope.app), with two
+        sampled profiles: the event loop thread's CPU stacks and the
+        coroutines' wall time, both weighted in seconds.
+        """
+        frames: dict[str, int] = {}
+
+        def sampled(name: str, counter: collections.Counter) -> dict:
+            stacks = counter.most_common()
+            return {
+                "type": "sampled",
+                "name": name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": round(self.duration, 6),
+                "samples": [[frames.setdefault(label, len(frames)) for label in stack] for stack, _ in stacks],
+                "weights": [round(count * self.sample_seconds, 6) for _, count in stacks],
+            }
+
+        profiles = [sampled("Event loop thread", self.stacks), sampled("Coroutines (wall time)", self.task_stacks)]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": f"{self.duration:.1f}s profile",
+            "exporter": "app.utils.profiler",
+            "activeProfileIndex": 0,
+            "shared": {"frames": [{"name": label} for label in frames]},
+            "profiles": profiles,
+        }
+
+
+class Profiler:
+    """
+    Statistical profiler for the running worker. While `profile()` awaits,
+    a thread wakes every `interval` seconds and records the event loop
+    thread's stack (sys._current_frames) and the await chain of every task
+    on the loop. Nothing is installed in the profiled code, so the overhead
+    is one stack walk per sample, taken between the loop's bytecodes, and
+    nothing at all when no profile runs.
+
+    Only the worker process that serves the request is profiled. One
+    profile runs at a time per process.
+    """
+
+    def __init__(self):
+        self.running = False
+
+    async def profile(self, seconds: float, interval: float) -> Profile:
+        if self.running:
+            raise RuntimeError("A profile is already running")
+        self.running = True
+        try:
+            loop = asyncio.get_running_loop()
+            profile = Profile(duration=0.0, samples=0)
+            stopped = threading.Event()
+            sampler = threading.Thread(
+                target=self._sample,
+                args=(profile, loop, threading.get_ident(), asyncio.current_task(), interval, stopped),
+                name="profiler",
+                daemon=True,
+            )
+            sampler.start()
+            try:
+                await asyncio.sleep(seconds)
+            finally:
+                stopped.set()
+                await asyncio.to_thread(sampler.join)
+            return profile
+        finally:
+            self.running = False
+
+    @staticmethod
+    def _sample(profile: Profile, loop, loop_thread_id: int, own_task, interval: float, stopped: threading.Event) -> None:
+        started = time.perf_counter()
+        try:
+            while not stopped.wait(interval):
+                frame = sys._current_frames().get(loop_thread_id)
+                if frame is not None:
+                    profile.stacks[thread_stack(frame)] += 1
+                del frame
+                for task in asyncio.all_tasks(loop):
+                    if task is own_task:
+                        continue
+                    stack = await_chain(task)
+                    if stack:
+                        profile.task_stacks[stack] += 1
+                        profile.tasks[stack[0]].add(id(task))
+                profile.samples += 1
+        except Exception as exc:
+            # Reading another thread's tasks can race with the loop (e.g. the
+            # task set changing size mid-iteration); keep the samples taken so far
+            log.warning("Profiler sampling stopped early", samples=profile.samples, error=str(exc))
+        finally:
+            profile.duration = time.perf_counter() - started
+
+
+profiler = Profiler()
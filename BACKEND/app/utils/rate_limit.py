@@ -0,0 +1,283 @@
+import hashlib
+import importlib
+import math
+import time
+from typing import Awaitable, Callable
+
+from fastapi import HTTPException, Request, status
+from prometheus_client import Counter
+from sqlalchemy import case, delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.config import Config
+from app.database.models import RateLimitBucket, SessionLocal
+from app.utils.logger import log
+
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total",
+    "Requests rejected by the rate limiter, per route and bucket kind.",
+    ["scope", "kind"],
+)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+def parse_rate(rate: str | None) -> tuple[int, float] | None:
+    """"10/minute" -> (capacity 10, refill 10/60 tokens per second); empty -> None (no limit)."""
+    if not rate:
+        return None
+    count, _, period = rate.partition("/")
+    capacity = int(count)
+    return capacity, capacity / PERIODS[period.strip().rstrip("s")]
+
+
+class RateLimitBackend:
+    """
+    Token bucket storage. `consume` takes `cost` tokens from the bucket at
+    `key` (created full, holding `capacity` tokens and refilling `rate` per
+    second) and returns 0 when they were available, otherwise the seconds
+    until they will be. `peek` returns the tokens a bucket holds without
+    taking any. A shared backend enforces the limits across workers; select
+    one with RATE_LIMIT_BACKEND.
+    """
+
+    async def consume(self, key: str, capacity: int, rate: float, cost: int = 1) -> float:
+        raise NotImplementedError
+
+    async def peek(self, key: str, capacity: int, rate: float) -> float:
+        raise NotImplementedError
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    Per-process buckets in a dict: O(1) per request. Buckets that have
+    refilled carry no state, so they are dropped by a sweep at most every
+    `sweep_interval` seconds.
+    """
+
+    def __init__(self, sweep_interval: float = 60.0, clock: Callable[[], float] = time.monotonic):
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+        self.buckets: dict[str, tuple[float, float, float]] = {}  # key -> (tokens, updated, full_at)
+        self.next_sweep = clock() + sweep_interval
+
+    async def consume(self, key: str, capacity: int, rate: float, cost: int = 1) -> float:
+        now = self.clock()
+        if now >= self.next_sweep:
+            self.sweep(now)
+        bucket = self.buckets.get(key)
+        tokens = capacity if bucket is None else min(capacity, bucket[0] + (now - bucket[1]) * rate)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        self.buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+        return 0.0 if allowed else (cost - tokens) / rate
+
+    async def peek(self, key: str, capacity: int, rate: float) -> float:
+        bucket = self.buckets.get(key)
+        return capacity if bucket is None else min(capacity, bucket[0] + (self.clock() - bucket[1]) * rate)
+
+    def sweep(self, now: float) -> None:
+        self.buckets = {key: bucket for key, bucket in self.buckets.items() if bucket[2] > now}
+        self.next_sweep = now + self.sweep_interval
+
+    async def clear(self) -> None:
+        self.buckets.clear()
+
+
+class DatabaseRateLimitBackend(RateLimitBackend):
+    """
+    Buckets in the rate_limit_buckets table, shared by every worker using
+    the database. Refill, consume and the outcome happen in one atomic
+    INSERT ... ON CONFLICT DO UPDATE ... RETURNING on the primary; refilled
+    rows are deleted at most every `sweep_interval` seconds.
+    """
+
+    def __init__(self, session_factory=SessionLocal, sweep_interval: float = 60.0, clock: Callable[[], float] = time.time):
+        self.session_factory = session_factory
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+        self.next_sweep = clock() + sweep_interval
+
+    async def consume(self, key: str, capacity: int, rate: float, cost: int = 1) -> float:
+        now = self.clock()
+        async with self.session_factory() as db:
+            if now >= self.next_sweep:
+                self.next_sweep = now + self.sweep_interval
+                await db.execute(delete(RateLimitBucket).where(RateLimitBucket.full_at <= now))
+            result = await db.execute(self.upsert(db.get_bind().dialect.name, key, capacity, rate, cost, now))
+            tokens, allowed = result.one()
+            await db.commit()
+        return 0.0 if allowed else (cost - tokens) / rate
+
+    async def peek(self, key: str, capacity: int, rate: float) -> float:
+        async with self.session_factory() as db:
+            bucket = (await db.execute(
+                select(RateLimitBucket.tokens, RateLimitBucket.updated).where(RateLimitBucket.key == key)
+            )).one_or_none()
+        return capacity if bucket is None else min(capacity, bucket.tokens + (self.clock() - bucket.updated) * rate)
+
+    @staticmethod
+    def upsert(dialect: str, key: str, capacity: int, rate: float, cost: int, now: float):
+        if dialect == "postgresql":
+            statement = postgresql.insert(RateLimitBucket)
+        elif dialect == "sqlite":
+            statement = sqlite.insert(RateLimitBucket)
+        else:
+            raise NotImplementedError(f"Database rate limiting is not supported on {dialect}")
+        bucket = RateLimitBucket.__table__.c
+        # Column references in the DO UPDATE clause read the stored row
+        grown = bucket.tokens + (now - bucket.updated) * rate
+        refilled = case((grown > capacity, float(capacity)), else_=grown)
+        tokens = case((refilled >= cost, refilled - cost), else_=refilled)
+        statement = statement.values(
+            key=key, tokens=float(capacity - cost), updated=now, full_at=now + cost / rate, allowed=capacity >= cost,
+        )
+        return statement.on_conflict_do_update(
+            index_elements=["key"],
+            set_={
+                "tokens": tokens,
+                "updated": now,
+                "full_at": now + (capacity - tokens) / rate,
+                "allowed": refilled >= cost,
+            },
+        ).returning(bucket.tokens, bucket.allowed)
+
+    async def clear(self) -> None:
+        async with self.session_factory() as db:
+            await db.execute(delete(RateLimitBucket))
+            await db.commit()
+
+
+def load_backend(spec: str) -> RateLimitBackend:
+    """"memory", "database", or "package.module:ClassName" of a RateLimitBackend built without arguments."""
+    if spec == "memory":
+        return MemoryRateLimitBackend(Config.RATE_LIMIT_SWEEP_SECONDS)
+    if spec == "database":
+        return DatabaseRateLimitBackend(sweep_interval=Config.RATE_LIMIT_SWEEP_SECONDS)
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def client_ip(request: Request) -> str:
+    """
+    Peer address or, behind RATE_LIMIT_TRUSTED_PROXIES trusted proxies, the
+    address the outermost one saw: each proxy appends its peer to
+    X-Forwarded-For, so that is the Nth hop from the right. Hops further left
+    are whatever the client sent and are never used.
+    """
+    if Config.RATE_LIMIT_TRUST_FORWARDED_FOR and Config.RATE_LIMIT_TRUSTED_PROXIES > 0:
+        hops = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+        if len(hops) >= Config.RATE_LIMIT_TRUSTED_PROXIES:
+            return hops[-Config.RATE_LIMIT_TRUSTED_PROXIES]
+    return request.client.host if request.client else "unknown"
+
+
+def bucket_key(scope: str, kind: str, value: str) -> str:
+    """Fixed-length bucket key: the value (a submitted username, a forwarded address) is hashed, not embedded."""
+    return f"rate-limit:{scope}:{kind}:{hashlib.sha256(value.encode()).hexdigest()}"
+
+
+def form_field(name: str) -> Callable[[Request], Awaitable[str | None]]:
+    """Identity read from a form body field (FastAPI has already parsed and cached the form)."""
+    async def read(request: Request) -> str | None:
+        value = (await request.form()).get(name)
+        return value if isinstance(value, str) else None
+    return read
+
+
+def json_field(name: str) -> Callable[[Request], Awaitable[str | None]]:
+    """Identity read from a JSON body field (the body is cached on the request)."""
+    async def read(request: Request) -> str | None:
+        try:
+            body = await request.json()
+        except ValueError:
+            return None
+        value = body.get(name) if isinstance(body, dict) else None
+        return value if isinstance(value, str) else None
+    return read
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiting for expensive unauthenticated routes (bcrypt
+    verification, password hashing, reset emails). Each limited route has a
+    bucket per client IP and, optionally, one per identity submitted in the
+    body (username or email), so neither one address nor a botnet aimed at
+    one account can drain the hash executor. Rejections are 429 responses
+    with a Retry-After header, raised by a route dependency before the
+    endpoint runs.
+
+    With `identity_failure_status`, the identity bucket is only charged when
+    the endpoint fails with that status (e.g. 401 for a wrong password), and
+    a client IP that succeeded for the identity within `known_client_seconds`
+    skips it: whoever floods a username with wrong passwords cannot lock its
+    owner out, they only exhaust their own IP bucket.
+    """
+
+    def __init__(self, backend: RateLimitBackend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+
+    def limit(
+        self,
+        scope: str,
+        per_ip: str | None = None,
+        per_identity: str | None = None,
+        identity: Callable[[Request], Awaitable[str | None]] | None = None,
+        identity_failure_status: int | None = None,
+        known_client_seconds: float = 0,
+    ):
+        """Route dependency; `scope` names the route in the bucket keys and metrics."""
+        ip_rate = parse_rate(per_ip)
+        identity_rate = parse_rate(per_identity) if identity else None
+        charge_failures = identity_rate is not None and identity_failure_status is not None
+
+        async def check(request: Request):
+            if not self.enabled:
+                yield
+                return
+            ip = client_ip(request)
+            value = await identity(request) if identity_rate else None
+            value = value.strip().lower() if value else None
+            identity_key = bucket_key(scope, "identity", value) if value else None
+            known_key = bucket_key(scope, "known", f"{value}\n{ip}") if value and charge_failures and known_client_seconds else None
+
+            waits = []
+            if ip_rate:
+                waits.append(("ip", await self.backend.consume(bucket_key(scope, "ip", ip), *ip_rate)))
+            if identity_key and not charge_failures:
+                waits.append(("identity", await self.backend.consume(identity_key, *identity_rate)))
+            elif identity_key:
+                known = known_key is not None and await self.backend.peek(known_key, 1, 1 / known_client_seconds) < 1
+                if not known:
+                    capacity, rate = identity_rate
+                    tokens = await self.backend.peek(identity_key, capacity, rate)
+                    waits.append(("identity", (1 - tokens) / rate if tokens < 1 else 0.0))
+            retry_after = 0.0
+            for kind, wait in waits:
+                if wait:
+                    RATE_LIMIT_REJECTIONS.labels(scope=scope, kind=kind).inc()
+                    retry_after = max(retry_after, wait)
+            if retry_after:
+                log.warning("Rate limit exceeded", scope=scope, client_ip=ip, retry_after=retry_after)
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many requests. Please try again later.",
+                    headers={"Retry-After": str(math.ceil(retry_after))},
+                )
+
+            try:
+                yield
+            except HTTPException as exc:
+                if identity_key and charge_failures and exc.status_code == identity_failure_status:
+                    await self.backend.consume(identity_key, *identity_rate)
+                raise
+            if known_key:
+                # An empty one-token bucket marks the client as known until it refills
+                await self.backend.consume(known_key, 1, 1 / known_client_seconds)
+
+        return check
+
+
+rate_limiter = RateLimiter(load_backend(Config.RATE_LIMIT_BACKEND), enabled=Config.RATE_LIMIT_ENABLED)
@@ -0,0 +1,256 @@
+import functools
+import importlib
+import inspect
+import math
+import time
+import urllib.parse
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable
+
+import orjson
+from fastapi import Request, Response
+from prometheus_client import Counter
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+
+from app.api.responses import type_adapter
+from app.config import Config
+from app.utils.invalidation import EntityChanged, Invalidation, invalidation_bus
+
+RESPONSE_CACHE_LOOKUPS = Counter(
+    "response_cache_lookups_total",
+    "Response cache lookups per resource, by outcome.",
+    ["resource", "result"],
+)
+RESPONSE_CACHE_INVALIDATIONS = Counter(
+    "response_cache_invalidations_total",
+    "Response cache namespaces invalidated by writes, per resource.",
+    ["resource"],
+)
+
+
+class CacheBackend:
+    """
+    Storage for the response cache. Only plain key/value operations are
+    needed (invalidation swaps generation keys), so a shared store such as
+    Redis or memcached can back it; select one with RESPONSE_CACHE_BACKEND.
+    """
+
+    async def get(self, key: str) -> bytes | None:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process LRU with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.clock = clock
+        self.entries: OrderedDict[str, tuple[bytes, float | None]] = OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        value, expires = entry
+        if expires is not None and expires <= self.clock():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float | None = None) -> None:
+        self.entries[key] = (value, self.clock() + ttl if ttl is not None else None)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self.entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+
+def load_backend(spec: str) -> CacheBackend:
+    """"memory", or "package.module:ClassName" of a CacheBackend built without arguments."""
+    if spec == "memory":
+        return MemoryCacheBackend(Config.RESPONSE_CACHE_MAX_ENTRIES)
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+class ResponseCache:
+    """
+    Read-through cache of serialized GET responses for rarely changing
+    resources (roles, groups, permissions).
+
+    Entries are keyed by path and sorted query parameters under a namespace:
+    "<resource>:list" for listings, "<resource>:<id>" for one entity. Every
+    namespace has a generation token stored in the backend and part of its
+    keys, so invalidating swaps one token instead of scanning keys: creating
+    an entity invalidates the listings, updating or deleting one invalidates
+    the listings and that entity only. Writes reach the cache as
+    EntityChanged events of the invalidation bus, which also carries them to
+    the other workers; entries also expire after `ttl` seconds, which bounds
+    staleness when an event is lost. A generation token also records when
+    it was swapped (`clock`, Unix epoch seconds), see fill_allowed.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float, enabled: bool = True, clock: Callable[[], float] = time.time):
+        self.backend = backend
+        self.ttl = ttl
+        self.enabled = enabled
+        self.clock = clock
+        self.lookups: dict[str, list[int]] = {}  # resource -> [hits, misses], for the hit ratio gauge
+        self.resources: set[str] = set()  # resources with cached endpoints
+
+    async def invalidate(self, resource: str, id: int | None = None) -> None:
+        """Call after the write has been committed."""
+        if not self.enabled:
+            return
+        namespaces = [f"{resource}:list"] + ([f"{resource}:{id}"] if id is not None else [])
+        for namespace in namespaces:
+            await self.backend.set(self._generation_key(namespace), self._generation(self.clock()))
+        RESPONSE_CACHE_INVALIDATIONS.labels(resource=resource).inc()
+
+    async def on_invalidation(self, event: Invalidation) -> None:
+        """Invalidation bus subscriber."""
+        if isinstance(event, EntityChanged) and event.resource in self.resources:
+            await self.invalidate(event.resource, event.id)
+
+    def cached(self, resource: str, response_model: Any, id_param: str | None = None):
+        """
+        Decorator for a GET endpoint whose body depends only on `resource` rows
+        (the entity named by the `id_param` path parameter, or the listing).
+        It must sit under the route decorator, so dependencies such as
+        authentication run before a cached body is served. Headers the
+        endpoint sets on its Response (e.g. X-Next-Cursor) are cached with
+        the body; headers set by dependencies (e.g. ETag) are not.
+        """
+        adapter = type_adapter(response_model)
+        self.resources.add(resource)
+
+        def decorator(endpoint):
+            signature = inspect.signature(endpoint)
+            # FastAPI injects a single Request/Response parameter per endpoint:
+            # the added ones below, which are handed on to the endpoint's own
+            own = {
+                name: param.annotation for name, param in signature.parameters.items()
+                if param.annotation in (Request, Response)
+            }
+            extra = [
+                inspect.Parameter("_cache_request", inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Request),
+                inspect.Parameter("_cache_response", inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Response),
+            ]
+
+            @functools.wraps(endpoint)
+            async def wrapper(*args, _cache_request: Request | None = None, _cache_response: Response | None = None, **kwargs):
+                # Called directly (not through a request), or disabled: plain endpoint
+                if _cache_request is None or not self.enabled:
+                    return await endpoint(*args, **kwargs)
+                for name, annotation in own.items():
+                    kwargs[name] = _cache_request if annotation is Request else _cache_response
+                namespace = f"{resource}:{kwargs[id_param]}" if id_param else f"{resource}:list"
+                started = self.clock()
+                key, invalidated_at = await self._key(namespace, _cache_request)
+                if self.lookup_allowed(_cache_request):
+                    cached = await self.backend.get(key)
+                    self._count(resource, cached is not None)
+                    if cached is not None:
+                        headers, body = self._decode(cached)
+                        return Response(body, media_type="application/json", headers={**_cache_response.headers, **headers})
+
+                before = dict(_cache_response.headers)
+                result = await endpoint(*args, **kwargs)
+                body = adapter.dump_json(adapter.validate_python(result))
+                headers = {name: value for name, value in _cache_response.headers.items() if before.get(name) != value}
+                if self.fill_allowed(_cache_request, started - invalidated_at):
+                    await self.backend.set(key, self._encode(headers, body), self.ttl)
+                return Response(body, media_type="application/json", headers=dict(_cache_response.headers))
+
+            wrapper.__signature__ = signature.replace(parameters=[*signature.parameters.values(), *extra])
+            return wrapper
+
+        return decorator
+
+    @staticmethod
+    def lookup_allowed(request: Request) -> bool:
+        """False for requests pinned to the primary (read-your-writes): a cached body may predate their write."""
+        return not getattr(request.state, "primary_requested", False)
+
+    @staticmethod
+    def fill_allowed(request: Request, since_invalidation: float = math.inf) -> bool:
+        """
+        False when the body was read from a replica less than
+        READ_YOUR_WRITES_SECONDS (the replica lag the read-your-writes window
+        already assumes) after the namespace was invalidated, counted from
+        when the request started: a lagging replica would refill the new
+        generation with stale rows, served to everyone until the entry
+        expires. Later replica reads, and primary reads, fill.
+        """
+        if not getattr(request.state, "read_from_replica", False):
+            return True
+        return since_invalidation >= Config.READ_YOUR_WRITES_SECONDS
+
+    def hit_ratios(self) -> dict[str, float]:
+        return {resource: hits / (hits + misses) for resource, (hits, misses) in self.lookups.items() if hits + misses}
+
+    def collect(self):
+        """Prometheus collector hook: hit ratio per resource since process start."""
+        gauge = GaugeMetricFamily(
+            "response_cache_hit_ratio",
+            "Share of response cache lookups served from the cache, per resource.",
+            labels=["resource"],
+        )
+        for resource, ratio in self.hit_ratios().items():
+            gauge.add_metric([resource], ratio)
+        yield gauge
+
+    async def _key(self, namespace: str, request: Request) -> tuple[str, float]:
+        """Cache key of the request, and when its namespace was last invalidated (0 if never)."""
+        generation_key = self._generation_key(namespace)
+        generation = await self.backend.get(generation_key)
+        if generation is None:
+            generation = self._generation(0.0)
+            await self.backend.set(generation_key, generation)
+        token, _, invalidated_at = generation.decode().partition(":")
+        query = urllib.parse.urlencode(sorted(request.query_params.multi_items()))
+        return f"response:{Config.VERSION}:{namespace}:{token}:{request.url.path}?{query}", float(invalidated_at or 0)
+
+    @staticmethod
+    def _generation_key(namespace: str) -> str:
+        return f"response-generation:{namespace}"
+
+    @staticmethod
+    def _generation(invalidated_at: float) -> bytes:
+        return f"{uuid.uuid4().hex}:{invalidated_at}".encode()
+
+    def _count(self, resource: str, hit: bool) -> None:
+        RESPONSE_CACHE_LOOKUPS.labels(resource=resource, result="hit" if hit else "miss").inc()
+        counts = self.lookups.setdefault(resource, [0, 0])
+        counts[0 if hit else 1] += 1
+
+    @staticmethod
+    def _encode(headers: dict[str, str], body: bytes) -> bytes:
+        return orjson.dumps(headers) + b"\n" + body
+
+    @staticmethod
+    def _decode(value: bytes) -> tuple[dict[str, str], bytes]:
+        headers, _, body = value.partition(b"\n")
+        return orjson.loads(headers), body
+
+
+response_cache = ResponseCache(
+    load_backend(Config.RESPONSE_CACHE_BACKEND),
+    ttl=Config.RESPONSE_CACHE_TTL_SECONDS,
+    enabled=Config.RESPONSE_CACHE_ENABLED,
+)
+REGISTRY.register(response_cache)
+invalidation_bus.subscribe(response_cache.on_invalidation)
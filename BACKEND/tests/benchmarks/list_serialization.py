@@ -0,0 +1,156 @@
+"""
+Serialization benchmark for a 100-row /users/get_all_users page.
+
+Compares the previous response path (ORM objects with roles/groups loaded,
+UserOut.model_validate per user, then FastAPI re-validating the
+response_model and rendering with json) against the fast path (column rows
+validated once by a cached TypeAdapter and rendered by its JSON serializer):
+
+- "serialize": turning an already loaded page into response bytes,
+- "endpoint": the full request through FastAPI over httpx's ASGITransport,
+  database query included.
+
+Run from BACKEND/:
+
+    python -m tests.benchmarks.list_serialization --iterations 2000
+
+Prints one JSON document with per-call latency percentiles for each path.
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+from fastapi import Depends, FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.api.responses import ORJSONResponse, validated_response
+from app.api.routers.users import USER_OUT_COLUMNS
+from app.database.engine import build_engines, build_session_factory
+from app.database.models import Base, User
+from app.database.services.user_service import UserService
+from app.schemas.user import UserOut, UsersResponse
+
+PAGE_SIZE = 100
+
+
+async def seed_users(SessionLocal, count: int) -> None:
+    async with SessionLocal() as db:
+        db.add_all(
+            User(
+                firstname="Bench",
+                lastname="User",
+                username=f"bench_{i}",
+                email=f"bench_{i}@example.com",
+                password="not-a-real-hash",
+            )
+            for i in range(count)
+        )
+        await db.commit()
+
+
+def legacy_page(users: list) -> UsersResponse:
+    return UsersResponse(page=1, limit=PAGE_SIZE, total=len(users), users=[UserOut.model_validate(u) for u in users])
+
+
+def legacy_bytes(users: list) -> bytes:
+    # What FastAPI does with the returned model: validate against response_model, encode, render
+    page = UsersResponse.model_validate(legacy_page(users).model_dump())
+    return JSONResponse(jsonable_encoder(page)).body
+
+
+def fast_bytes(rows: list) -> bytes:
+    return validated_response(UsersResponse, {"page": 1, "limit": PAGE_SIZE, "total": len(rows), "users": rows}).body
+
+
+def percentiles(latencies: list[float]) -> dict:
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "calls": len(latencies),
+        "p50_us": round(quantiles[49] * 1e6, 1),
+        "p95_us": round(quantiles[94] * 1e6, 1),
+        "p99_us": round(quantiles[98] * 1e6, 1),
+    }
+
+
+def time_calls(fn, arg, iterations: int) -> dict:
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn(arg)
+        latencies.append(time.perf_counter() - started)
+    return percentiles(latencies)
+
+
+async def time_requests(client: httpx.AsyncClient, path: str, iterations: int) -> dict:
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        response = await client.get(path)
+        latencies.append(time.perf_counter() - started)
+        response.raise_for_status()
+    return percentiles(latencies)
+
+
+def build_app(SessionLocal) -> FastAPI:
+    async def get_session():
+        async with SessionLocal() as session:
+            yield session
+
+    bench = FastAPI()
+
+    @bench.get("/legacy", response_model=UsersResponse)
+    async def legacy(session=Depends(get_session)):
+        _, users = await UserService.get_all_users(session, limit=PAGE_SIZE, total_mode="none")
+        return legacy_page(users)
+
+    @bench.get("/fast", response_model=UsersResponse, response_class=ORJSONResponse)
+    async def fast(session=Depends(get_session)):
+        _, rows = await UserService.get_all_users(session, limit=PAGE_SIZE, total_mode="none", columns=USER_OUT_COLUMNS)
+        return validated_response(UsersResponse, {"page": 1, "limit": PAGE_SIZE, "total": len(rows), "users": rows})
+
+    return bench
+
+
+async def main(args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine, writer_engine = build_engines(url, pool_name="bench_serialization")
+        SessionLocal = build_session_factory(engine, writer_engine)
+        async with writer_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await seed_users(SessionLocal, PAGE_SIZE)
+
+        async with SessionLocal() as db:
+            _, users = await UserService.get_all_users(db, limit=PAGE_SIZE, total_mode="none")
+            _, rows = await UserService.get_all_users(db, limit=PAGE_SIZE, total_mode="none", columns=USER_OUT_COLUMNS)
+        assert json.loads(legacy_bytes(users)) == json.loads(fast_bytes(rows)), "paths render different bodies"
+
+        serialize = {
+            "legacy": time_calls(legacy_bytes, users, args.iterations),
+            "fast": time_calls(fast_bytes, rows, args.iterations),
+        }
+        transport = httpx.ASGITransport(app=build_app(SessionLocal))
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            endpoint = {
+                "legacy": await time_requests(client, "/legacy", args.requests),
+                "fast": await time_requests(client, "/fast", args.requests),
+            }
+        await engine.dispose()
+        await writer_engine.dispose()
+
+    for result in (serialize, endpoint):
+        result["p50_speedup"] = round(result["legacy"]["p50_us"] / result["fast"]["p50_us"], 2)
+    return {"config": {**vars(args), "page_size": PAGE_SIZE}, "serialize": serialize, "endpoint": endpoint}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000, help="serialization calls per path")
+    parser.add_argument("--requests", type=int, default=500, help="HTTP requests per path")
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
@@ -0,0 +1,285 @@
+"""
+End-to-end load benchmark for the whole ASGI app.
+
+Seeds a database with `--users` users (10k, 100k, 1M, ...) through
+app.tools.seed, holding a realistic role/group fan-out: a few popular roles
+and groups carry most memberships (power-law), users hold 1-3 roles and 0-2
+groups, groups grant 1-3 roles and roles 3-12 permissions. Then `--clients` concurrent clients
+drive app.main:app in-process over httpx's ASGITransport for `--seconds`,
+each logged in as its own user with the search_user permission, picking
+scenarios by weight:
+
+- login:     POST /auth/token as a random seeded user (bcrypt verify)
+- me:        GET /users/me
+- get_user:  GET /users/{id}, permission-guarded
+- roles:     GET /roles/ (conditional GET + response cache)
+- group:     GET /groups/{id}
+- list:      GET /users/get_all_users, a random page of 50
+- search:    GET /users/search?q=<username prefix>
+- refresh:   POST /auth/token/refresh with the client's refresh token
+
+Run from BACKEND/:
+
+    python -m tests.benchmarks.load --users 100000 --clients 32 --seconds 30 --output load.json
+    python -m tests.benchmarks.load --users 100000 --compare load.json
+
+Prints one JSON document with p50/p95/p99 latency, requests/sec and errors
+per scenario and overall, the configuration and the git commit; with
+--compare, also the relative change of each figure against an earlier run.
+The database is a temporary SQLite file unless DATABASE_URL is set; an
+already seeded database is reused as is, so large populations are seeded
+once. Rate limiting is disabled and cache invalidation stays in-process.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+
+# Before the app modules read their configuration
+WORKDIR = tempfile.mkdtemp(prefix="load-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{os.path.join(WORKDIR, 'bench.db')}")
+os.environ.setdefault("LOG_FOLDERNAME", os.path.join(WORKDIR, "logs"))
+os.environ.setdefault("INVALIDATION_BUS_BACKEND", "local")
+os.environ["RATE_LIMIT_ENABLED"] = "false"
+
+import httpx  # noqa: E402
+from sqlalchemy import func, insert, select  # noqa: E402
+
+from app.database.models import (  # noqa: E402
+    Base, Group, Permission, Role, RolePermission, User, UserRole, engine, writer_engine,
+)
+from app.main import app  # noqa: E402
+from app.tools.seed import seed  # noqa: E402
+
+PASSWORD = "benchpassword"
+CHUNK = 10_000
+SCENARIOS = {
+    "login": 5,
+    "me": 25,
+    "get_user": 15,
+    "roles": 10,
+    "group": 10,
+    "list": 15,
+    "search": 15,
+    "refresh": 5,
+}
+
+
+def parse_weights(spec: str) -> dict[str, int]:
+    """"me=50,login=0" -> the default scenario weights with these replaced."""
+    weights = dict(SCENARIOS)
+    for item in filter(None, spec.split(",")):
+        name, _, weight = item.partition("=")
+        if name.strip() not in SCENARIOS:
+            raise argparse.ArgumentTypeError(f"unknown scenario {name.strip()!r}")
+        weights[name.strip()] = int(weight)
+    return weights
+
+
+async def seed_population(users: int, clients: int, rng: random.Random) -> dict:
+    """
+    app.tools.seed's dataset, plus a role granting search_user given to the
+    clients' users (bench_0 .. bench_<clients - 1>).
+    """
+    async with writer_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        existing = (await conn.execute(select(func.count()).select_from(User))).scalar()
+    if existing:
+        return {"seeded": False, "users": existing}
+
+    population = await seed(
+        users, roles=max(20, users // 2000), groups=max(10, users // 500), permissions=50,
+        prefix="bench", password=PASSWORD, chunk=CHUNK, rng=rng,
+    )
+    first_user = population["users"]["first_id"]
+    async with writer_engine.begin() as conn:
+        permission_id = (await conn.execute(insert(Permission).values(name="search_user").returning(Permission.id))).scalar()
+        role_id = (await conn.execute(insert(Role).values(name="bench_clients").returning(Role.id))).scalar()
+        await conn.execute(insert(RolePermission).values(role_id=role_id, permission_id=permission_id))
+        await conn.execute(insert(UserRole), [
+            {"user_id": user_id, "role_id": role_id} for user_id in range(first_user, first_user + clients)
+        ])
+    return {"seeded": True, "users": users, "seconds": population["seconds"]}
+
+
+class Client:
+    """One simulated user: bench_<index>, logged in before the measurement starts."""
+
+    def __init__(
+        self, http: httpx.AsyncClient, index: int, clients: int, users: int, groups: int,
+        weights: dict[str, int], rng: random.Random,
+    ):
+        self.http = http
+        self.username = f"bench_{index}"
+        self.clients = clients
+        self.users = users
+        self.groups = groups
+        self.weights = weights
+        self.rng = rng
+        self.headers: dict[str, str] = {}
+        self.refresh_token = ""
+        self.issued = 0.0
+
+    async def login(self, username: str) -> httpx.Response:
+        response = await self.http.post("/auth/token", data={"username": username, "password": PASSWORD})
+        if username == self.username and response.status_code == 200:
+            self.store(response.json())
+        return response
+
+    def store(self, tokens: dict) -> None:
+        self.headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+        self.refresh_token = tokens["refresh_token"]
+        self.issued = time.monotonic()
+
+    async def run(self, scenario: str) -> httpx.Response:
+        rng = self.rng
+        if scenario == "login":
+            # Another user than the clients': a login revokes the user's refresh tokens
+            return await self.login(f"bench_{rng.randrange(self.clients, self.users)}")
+        if scenario == "me":
+            return await self.http.get("/users/me", headers=self.headers)
+        if scenario == "get_user":
+            return await self.http.get(f"/users/{rng.randint(1, self.users)}", headers=self.headers)
+        if scenario == "roles":
+            return await self.http.get("/roles/", headers=self.headers)
+        if scenario == "group":
+            return await self.http.get(f"/groups/{rng.randint(1, self.groups)}", headers=self.headers)
+        if scenario == "list":
+            return await self.http.get(
+                "/users/get_all_users", params={"page": rng.randint(1, 20), "limit": 50}, headers=self.headers,
+            )
+        if scenario == "search":
+            return await self.http.get(
+                "/users/search", params={"q": f"bench_{rng.randrange(self.users)}"[:rng.randint(7, 9)]}, headers=self.headers,
+            )
+        response = await self.http.post("/auth/token/refresh", data={"refresh_token": self.refresh_token})
+        if response.status_code == 200:
+            self.store(response.json())
+        return response
+
+    def pick(self) -> str:
+        scenario = self.rng.choices(list(self.weights), list(self.weights.values()))[0]
+        # Tokens carry second-resolution timestamps: one issued in the same
+        # second as the previous one would be identical
+        if scenario == "refresh" and time.monotonic() - self.issued < 1.1:
+            return "me"
+        return scenario
+
+
+async def drive(client: Client, deadline: float, stats: dict) -> None:
+    while time.perf_counter() < deadline:
+        scenario = client.pick()
+        started = time.perf_counter()
+        response = await client.run(scenario)
+        elapsed = time.perf_counter() - started
+        entry = stats[scenario]
+        if response.status_code >= 400:
+            entry["errors"] += 1
+        else:
+            entry["latencies"].append(elapsed)
+
+
+def summarize(latencies: list[float], errors: int, seconds: float) -> dict:
+    requests = len(latencies)
+    latencies = sorted(latencies) or [0.0]
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "requests": requests,
+        "errors": errors,
+        "requests_per_sec": round(requests / seconds, 1),
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p95_ms": round(quantiles[94] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+    }
+
+
+def compare(current: dict, baseline: dict) -> dict:
+    """Relative change (+0.12 = 12% higher) of every figure present in both runs."""
+    changes = {}
+    runs = {**current["scenarios"], "total": current["total"]}
+    baseline_runs = {**baseline.get("scenarios", {}), "total": baseline.get("total")}
+    for name, figures in runs.items():
+        before = baseline_runs.get(name)
+        if not before:
+            continue
+        changes[name] = {
+            key: round((value - before[key]) / before[key], 3)
+            for key, value in figures.items()
+            if key in ("requests_per_sec", "p50_ms", "p95_ms", "p99_ms") and before.get(key)
+        }
+    return changes
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args) -> dict:
+    rng = random.Random(args.seed)
+    population = await seed_population(args.users, args.clients, rng)
+    async with engine.connect() as conn:
+        groups = (await conn.execute(select(func.count()).select_from(Group))).scalar()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        clients = [
+            Client(http, index, args.clients, population["users"], groups, args.weights, random.Random(args.seed + index))
+            for index in range(args.clients)
+        ]
+        for client in clients:
+            response = await client.login(client.username)
+            response.raise_for_status()
+
+        stats = {scenario: {"latencies": [], "errors": 0} for scenario in SCENARIOS}
+        started = time.perf_counter()
+        await asyncio.gather(*(drive(client, started + args.seconds, stats) for client in clients))
+        # Requests in flight at the deadline still complete and count
+        elapsed = time.perf_counter() - started
+
+    await engine.dispose()
+    await writer_engine.dispose()
+
+    result = {
+        "commit": git_commit(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "database": population,
+        "elapsed_seconds": round(elapsed, 2),
+        "scenarios": {name: summarize(entry["latencies"], entry["errors"], elapsed) for name, entry in stats.items()},
+        "total": summarize(
+            [latency for entry in stats.values() for latency in entry["latencies"]],
+            sum(entry["errors"] for entry in stats.values()),
+            elapsed,
+        ),
+    }
+    if args.compare:
+        with open(args.compare) as baseline:
+            result["compared_to"] = args.compare
+            result["changes"] = compare(result, json.load(baseline))
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--weights", type=parse_weights, default=dict(SCENARIOS), help="Scenario weights, e.g. login=0,me=50")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed of the population and the scenario mix")
+    parser.add_argument("--output", help="Also write the JSON document to this file")
+    parser.add_argument("--compare", help="JSON document of an earlier run to compare against")
+    args = parser.parse_args()
+    document = json.dumps(asyncio.run(main(args)), indent=2)
+    print(document)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(document)
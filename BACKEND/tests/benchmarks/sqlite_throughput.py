@@ -0,0 +1,112 @@
+"""
+Mixed login/read throughput benchmark for the SQLite profiles.
+
+Each simulated client loops until the deadline and either
+- "logs in": loads the user by username and stores a new refresh token, or
+- "reads": loads the user by username and resolves its permissions.
+
+Run from BACKEND/:
+
+    python -m tests.benchmarks.sqlite_throughput --clients 32 --seconds 10 --login-ratio 0.3
+
+Prints one JSON document with ops/sec, latency percentiles and
+"database is locked" errors for the default and production profiles.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+
+from sqlalchemy.exc import OperationalError
+
+from app.database.engine import build_engines, build_session_factory
+from app.database.models import Base, User
+from app.database.services.refresh_token_service import RefreshTokenService
+from app.database.services.user_service import UserService
+
+
+async def seed_users(SessionLocal, count: int) -> list[str]:
+    usernames = [f"bench_{i}" for i in range(count)]
+    async with SessionLocal() as db:
+        db.add_all(
+            User(
+                firstname="Bench",
+                lastname="User",
+                username=username,
+                email=f"{username}@example.com",
+                password="not-a-real-hash",
+            )
+            for username in usernames
+        )
+        await db.commit()
+    return usernames
+
+
+async def client(SessionLocal, usernames: list[str], deadline: float, login_ratio: float, stats: dict):
+    while time.perf_counter() < deadline:
+        is_login = random.random() < login_ratio
+        started = time.perf_counter()
+        try:
+            async with SessionLocal() as db:
+                user = await UserService.get_user_by_username(db, random.choice(usernames))
+                if is_login:
+                    await RefreshTokenService.add_refresh_token_to_db(db, raw_token=uuid.uuid4().hex, user_id=user.id)
+                else:
+                    await UserService.get_all_permissions_for_user(db, user.id)
+        except OperationalError as exc:
+            stats["locked" if "locked" in str(exc) else "errors"] += 1
+            continue
+        stats["logins" if is_login else "reads"] += 1
+        stats["latencies"].append(time.perf_counter() - started)
+
+
+async def run_profile(name: str, sqlite_production: bool, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        engine, writer_engine = build_engines(url, sqlite_production=sqlite_production, pool_name=f"bench_{name}")
+        SessionLocal = build_session_factory(engine, writer_engine)
+        async with writer_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        usernames = await seed_users(SessionLocal, args.users)
+
+        stats = {"logins": 0, "reads": 0, "locked": 0, "errors": 0, "latencies": []}
+        deadline = time.perf_counter() + args.seconds
+        await asyncio.gather(*(
+            client(SessionLocal, usernames, deadline, args.login_ratio, stats) for _ in range(args.clients)
+        ))
+        await engine.dispose()
+        await writer_engine.dispose()
+
+    latencies = sorted(stats.pop("latencies")) or [0.0]
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    ops = stats["logins"] + stats["reads"]
+    return {
+        **stats,
+        "ops": ops,
+        "ops_per_sec": round(ops / args.seconds, 1),
+        "p50_ms": round(quantiles[49] * 1000, 2),
+        "p95_ms": round(quantiles[94] * 1000, 2),
+        "p99_ms": round(quantiles[98] * 1000, 2),
+    }
+
+
+async def main(args) -> dict:
+    return {
+        "config": vars(args),
+        "default": await run_profile("default", False, args),
+        "production": await run_profile("production", True, args),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--login-ratio", type=float, default=0.3)
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
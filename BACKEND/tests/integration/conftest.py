@@ -7,13 +7,18 @@ from sqlalchemy import MetaData
 from alembic.config import Config as AlembiConfig
 from alembic import command
 import asyncio
+import contextlib
 import os
 
 from app.database.models import Base, User, Group, Role, Permission
+from app.database.engine import build_session_factory, instrument_query_log, track_queries
+from app.middlewares.query_budget import query_budget
 from app.auth.jwt import JWTManager
 from app.auth.password_hash import PasswordHasher
 from app.main import app
-from app.api.dependencies.database import get_db
+from app.api.dependencies.database import get_db, get_read_db
+from app.utils.response_cache import response_cache
+from app.utils.rate_limit import rate_limiter
 from tests.config import TestConfig
 from app.database.models import RolePermission, UserRole, GroupRole, UserGroup
 
@@ -22,6 +27,7 @@ async_engine = create_async_engine(TestConfig.TEST_DATABASE_URL, echo=False)
 AsyncTestingSessionLocal = sessionmaker(
     bind=async_engine, class_=AsyncSession, expire_on_commit=False
 )
+instrument_query_log(async_engine)
 
 async def run_migrations_on_connection(async_engine: AsyncEngine, revision):
     async with async_engine.begin() as conn:
@@ -46,13 +52,57 @@ async def db_session(setup_database):
         yield session
 
 
+@pytest_asyncio.fixture(autouse=True)
+async def clear_response_cache():
+    # Fixtures write rows without going through the services, which is what invalidates
+    response_cache.backend.clear()
+    yield
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def clear_rate_limits():
+    # Every client shares one address, and the suite logs in far more often than the limits allow
+    await rate_limiter.backend.clear()
+    yield
+
 @pytest_asyncio.fixture
 async def override_get_db(db_session):
     async def _override_get_db():
         yield db_session
     app.dependency_overrides[get_db] = _override_get_db
+    app.dependency_overrides[get_read_db] = _override_get_db
     yield
     app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_read_db, None)
+
+@pytest_asyncio.fixture
+async def assert_query_budget(setup_database):
+    """
+    Context manager asserting that the requests made in the block stay within
+    the route's query budget (Config.QUERY_BUDGETS). Requests get a session of
+    their own, configured as in production, instead of the shared test
+    session whose already loaded objects would hide queries.
+    """
+    SessionLocal = build_session_factory(async_engine, async_engine)
+
+    async def _get_db():
+        async with SessionLocal() as session:
+            yield session
+    app.dependency_overrides[get_db] = _get_db
+    app.dependency_overrides[get_read_db] = _get_db
+
+    @contextlib.contextmanager
+    def check(route: str):
+        with track_queries(keep=100) as queries:
+            yield queries
+        budget = query_budget(route)
+        assert queries.count <= budget, (
+            f"{route} ran {queries.count} queries (budget {budget}):\n" + "\n".join(queries.statements)
+        )
+
+    yield check
+    app.dependency_overrides.pop(get_db, None)
+    app.dependency_overrides.pop(get_read_db, None)
 
 @pytest_asyncio.fixture(scope="function")
 async def test_user(db_session: AsyncSession):
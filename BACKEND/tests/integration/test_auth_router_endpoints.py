@@ -1,11 +1,13 @@
 import asyncio
 import logging
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
 import pytest
 from fastapi import status
 from httpx import AsyncClient
 from tests.config import TestConfig
 from app.main import app
+from app.config import Config
+from app.utils.rate_limit import parse_rate
 from app.database.models import User
 from app.database.services.password_reset_token_service import PasswordResetTokenService
 from app.database.services.refresh_token_service import RefreshTokenService
@@ -48,6 +50,38 @@ class TestAuthRouter:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
         assert "inactive user" in response.json()["detail"].lower()
 
+    async def test_get_token_rate_limited_per_username(self, client: AsyncClient, test_user: User, monkeypatch):
+        verify = MagicMock(return_value=False)
+        monkeypatch.setattr("app.api.routers.auth.PasswordHasher.verify_password", verify)
+        capacity, _ = parse_rate(Config.RATE_LIMIT_TOKEN_PER_USERNAME)
+        attempts = [
+            await client.post(app.url_path_for("token"), data={"username": test_user.username, "password": "wrongpass"})
+            for _ in range(capacity + 1)
+        ]
+        assert [response.status_code for response in attempts[:-1]] == [status.HTTP_401_UNAUTHORIZED] * capacity
+        assert attempts[-1].status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(attempts[-1].headers["Retry-After"]) >= 1
+        # rejected before the password is checked
+        assert verify.call_count == capacity
+
+    async def test_get_token_succeeds_while_username_is_flooded(self, client: AsyncClient, test_user: User, monkeypatch):
+        monkeypatch.setattr(Config, "RATE_LIMIT_TRUST_FORWARDED_FOR", True)
+        owner = {"X-Forwarded-For": "1.1.1.1"}
+        login = {"username": test_user.username, "password": TestConfig.TEST_USER["password"]}
+        assert (await client.post(app.url_path_for("token"), data=login, headers=owner)).status_code == status.HTTP_200_OK
+        capacity, _ = parse_rate(Config.RATE_LIMIT_TOKEN_PER_USERNAME)
+        flood = [
+            await client.post(
+                app.url_path_for("token"),
+                data={"username": test_user.username, "password": "wrongpass"},
+                headers={"X-Forwarded-For": f"6.6.6.{i}"},
+            )
+            for i in range(capacity + 1)
+        ]
+        assert flood[-1].status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        response = await client.post(app.url_path_for("token"), data=login, headers=owner)
+        assert response.status_code == status.HTTP_200_OK
+
     async def test_request_password_reset_existing_email(self, client: AsyncClient, test_user: User):
         response = await client.post(
             app.url_path_for("request_password_reset"),
@@ -0,0 +1,51 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.main import app
+from app.api.routers import debug
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("setup_database", "override_get_db")
+class TestDebugRouter:
+
+    async def test_profile(self, client: AsyncClient, admin_token: str):
+        url = app.url_path_for("get_profile")
+        response = await client.get(url, params={"seconds": 0.2}, headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert body["samples"] > 0
+        assert set(body) == {"seconds", "samples", "sample_seconds", "coroutines", "stacks"}
+
+    async def test_profile_releases_permission_check_session(self, client: AsyncClient, admin_token: str, db_session: AsyncSession, monkeypatch):
+        profile = debug.profiler.profile
+        in_transaction = []
+
+        async def checked(seconds, interval):
+            in_transaction.append(db_session.in_transaction())
+            return await profile(seconds, interval)
+
+        monkeypatch.setattr(debug.profiler, "profile", checked)
+        response = await client.get(app.url_path_for("get_profile"), params={"seconds": 0.05}, headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == status.HTTP_200_OK
+        assert in_transaction == [False]
+
+    async def test_profile_formats(self, client: AsyncClient, admin_token: str):
+        url = app.url_path_for("get_profile")
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        collapsed = await client.get(url, params={"seconds": 0.1, "format": "collapsed"}, headers=headers)
+        assert collapsed.headers["content-type"].startswith("text/plain")
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in collapsed.text.splitlines())
+        speedscope = await client.get(url, params={"seconds": 0.1, "format": "speedscope"}, headers=headers)
+        assert speedscope.json()["$schema"] == "https://www.speedscope.app/file-format-schema.json"
+
+    async def test_profile_limits(self, client: AsyncClient, admin_token: str):
+        url = app.url_path_for("get_profile")
+        response = await client.get(url, params={"seconds": 3600}, headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    async def test_profile_requires_permission(self, client: AsyncClient, token: str):
+        response = await client.get(app.url_path_for("get_profile"), headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -196,6 +196,30 @@ class TestGroupRouter:
         )
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
+    async def test_add_users_to_group_bulk(self, client: AsyncClient, admin_token: str, test_group, test_user):
+        url = app.url_path_for("add_users_to_group", group_id=test_group.id)
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = await client.post(url, json={"user_ids": [test_user.id, 999999]}, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert (data["created"], data["updated"], data["not_found"]) == (1, 0, 1)
+        assert data["results"] == [{"id": test_user.id, "status": "created"}, {"id": 999999, "status": "not_found"}]
+        again = (await client.post(url, json={"user_ids": [test_user.id]}, headers=headers)).json()
+        assert again["results"] == [{"id": test_user.id, "status": "updated"}]
+
+    async def test_add_users_to_group_bulk_validation(self, client: AsyncClient, admin_token: str, test_group):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = await client.post(app.url_path_for("add_users_to_group", group_id=test_group.id), json={"user_ids": []}, headers=headers)
+        assert response.status_code == 422
+        response = await client.post(app.url_path_for("add_users_to_group", group_id=999999), json={"user_ids": [1]}, headers=headers)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_assign_roles_to_group_bulk(self, client: AsyncClient, admin_token: str, test_group, test_role):
+        url = app.url_path_for("assign_roles_to_group", group_id=test_group.id)
+        response = await client.post(url, json={"role_ids": [test_role.id]}, headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["results"] == [{"id": test_role.id, "status": "created"}]
+
     async def test_remove_user_from_group(self, client: AsyncClient, admin_token: str, test_user_group):
         test_user, test_group = test_user_group
 
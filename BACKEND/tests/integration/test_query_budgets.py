@@ -0,0 +1,62 @@
+import asyncio
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+
+from app.main import app
+from app.database.models import User, Role, Group, Permission
+from tests.config import TestConfig
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("setup_database")
+class TestQueryBudgets:
+
+    async def test_login_and_refresh(self, client: AsyncClient, test_user: User, assert_query_budget):
+        with assert_query_budget("token"):
+            response = await client.post(
+                app.url_path_for("token"),
+                data={"username": test_user.username, "password": TestConfig.TEST_USER["password"]},
+            )
+        assert response.status_code == status.HTTP_200_OK
+        # tokens issued within the same second are identical
+        await asyncio.sleep(1)
+        with assert_query_budget("refresh_access_token"):
+            response = await client.post(
+                app.url_path_for("refresh_access_token"),
+                data={"refresh_token": response.json()["refresh_token"]},
+            )
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.parametrize("route, params", [
+        ("get_me", {}),
+        ("get_all_users", {}),
+        ("search_users", {"q": "adm"}),
+        ("get_all_roles", {}),
+        ("get_all_groups", {}),
+        ("get_all_permissions", {}),
+        ("get_stats_summary", {}),
+    ])
+    async def test_listings(self, client: AsyncClient, admin_token: str, assert_query_budget, route, params):
+        with assert_query_budget(route):
+            response = await client.get(
+                app.url_path_for(route), params=params, headers={"Authorization": f"Bearer {admin_token}"}
+            )
+        assert response.status_code == status.HTTP_200_OK
+
+    async def test_entities(
+        self, client: AsyncClient, admin_token: str, admin_user: User, test_user: User,
+        test_role: Role, test_group: Group, test_permission: Permission, assert_query_budget,
+    ):
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        for route, params in [
+            ("get_by_id", {"id": test_user.id}),
+            ("get_roles_of_user", {"user_id": admin_user.id}),
+            ("get_groups_of_user", {"user_id": admin_user.id}),
+            ("get_role", {"id": test_role.id}),
+            ("get_group", {"id": test_group.id}),
+            ("get_permission", {"id": test_permission.id}),
+        ]:
+            with assert_query_budget(route):
+                response = await client.get(app.url_path_for(route, **params), headers=headers)
+            assert response.status_code == status.HTTP_200_OK, route
@@ -1,9 +1,15 @@
 import pytest
 from fastapi import status
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from app.main import app
+from app.api.dependencies import database
+from app.api.dependencies.database import get_read_db
+from app.database.engine import ReadReplicaRouter
 from app.database.models import Role
+from app.database.pagination import Keyset
+from app.utils.response_cache import RESPONSE_CACHE_LOOKUPS
 
 @pytest.mark.asyncio
 @pytest.mark.usefixtures("setup_database", "override_get_db")
@@ -36,6 +42,36 @@ class TestRoleRouter:
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert "already exists" in response.json()["detail"]
 
+    async def test_get_roles_conditional(self, client: AsyncClient, token: str, test_role: Role):
+        url = app.url_path_for("get_all_roles")
+        headers = {"Authorization": f"Bearer {token}"}
+        response = await client.get(url, headers=headers)
+        etag = response.headers["ETag"]
+        assert response.status_code == status.HTTP_200_OK
+
+        response = await client.get(url, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+        # authentication still comes first
+        response = await client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+        await client.put(app.url_path_for("update_role", id=test_role.id), json={"description": "changed"}, headers=headers)
+        response = await client.get(url, headers={**headers, "If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+
+    async def test_role_writes_invalidate_cached_responses(self, client: AsyncClient, token: str, test_role: Role):
+        headers = {"Authorization": f"Bearer {token}"}
+        get_url = app.url_path_for("get_role", id=test_role.id)
+        assert (await client.get(get_url, headers=headers)).json()["description"] == test_role.description
+        await client.put(app.url_path_for("update_role", id=test_role.id), json={"description": "cached?"}, headers=headers)
+        assert (await client.get(get_url, headers=headers)).json()["description"] == "cached?"
+
+        await client.delete(app.url_path_for("delete_role", id=test_role.id), headers=headers)
+        assert (await client.get(get_url, headers=headers)).status_code == status.HTTP_404_NOT_FOUND
+
     async def test_get_role_by_id(self, client: AsyncClient, token: str, test_role: Role):
         get_url = app.url_path_for("get_role", id=test_role.id)
         response = await client.get(
@@ -123,6 +159,81 @@ class TestRoleRouter:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.json()) == 5
 
+    async def test_get_all_roles_cursor_pagination(self, client: AsyncClient, token: str):
+        create_url = app.url_path_for("create_role")
+        for i in range(1, 8):
+            await client.post(
+                create_url,
+                json={"name": f"cursor_role_{i}", "description": f"Role {i}"},
+                headers={"Authorization": f"Bearer {token}"}
+            )
+
+        list_url = app.url_path_for("get_all_roles")
+        headers = {"Authorization": f"Bearer {token}"}
+        offset_page = await client.get(list_url, params={"limit": 100, "sort_by": "name", "sort_order": "asc"}, headers=headers)
+        seen, params = [], {"limit": 3, "sort_by": "name", "sort_order": "asc"}
+        while True:
+            response = await client.get(list_url, params=params, headers=headers)
+            assert response.status_code == status.HTTP_200_OK
+            seen.extend(r["id"] for r in response.json())
+            next_cursor = response.headers.get("X-Next-Cursor")
+            if not next_cursor or len(seen) > 1000:
+                break
+            params = {"limit": 3, "cursor": next_cursor}
+        assert seen == [r["id"] for r in offset_page.json()]
+
+    async def test_get_all_roles_replica_miss_fills_the_cache(
+        self, client: AsyncClient, token: str, db_session: AsyncSession, monkeypatch
+    ):
+        # Both factories are bound to the test database; the second is the "replica"
+        primary, replica = (async_sessionmaker(bind=db_session.bind, expire_on_commit=False) for _ in range(2))
+        monkeypatch.setattr(database, "read_router", ReadReplicaRouter(primary, [replica]))
+        monkeypatch.delitem(app.dependency_overrides, get_read_db)
+        hit = RESPONSE_CACHE_LOOKUPS.labels(resource="roles", result="hit")
+        miss = RESPONSE_CACHE_LOOKUPS.labels(resource="roles", result="miss")
+        hits, misses = hit._value.get(), miss._value.get()
+        headers = {"Authorization": f"Bearer {token}"}
+        first = await client.get(app.url_path_for("get_all_roles"), headers=headers)
+        second = await client.get(app.url_path_for("get_all_roles"), headers=headers)
+        assert first.status_code == second.status_code == status.HTTP_200_OK
+        assert second.content == first.content
+        assert (miss._value.get(), hit._value.get()) == (misses + 1, hits + 1)
+
+    async def test_get_all_roles_invalid_cursor(self, client: AsyncClient, token: str):
+        response = await client.get(
+            app.url_path_for("get_all_roles"),
+            params={"cursor": "not-a-cursor"},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_get_all_roles_cursor_with_unknown_sort_key(self, client: AsyncClient, token: str):
+        response = await client.get(
+            app.url_path_for("get_all_roles"),
+            params={"cursor": Keyset.encode("password", "asc", "x", 1)},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.parametrize("sort_by, value, id", [
+        ("created", [1], 5),
+        ("created", "abc", 5),
+        ("name", 3, 5),
+        ("name", None, 5),
+        ("id", "5", 5),
+        ("id", 2**70, 5),
+        ("is_active", 1, 5),
+        ("name", "x", True),
+    ])
+    async def test_get_all_roles_cursor_with_tampered_value(self, client: AsyncClient, token: str, sort_by, value, id):
+        response = await client.get(
+            app.url_path_for("get_all_roles"),
+            params={"cursor": Keyset.encode(sort_by, "desc", value, id)},
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "Invalid cursor"
+
     async def test_get_all_roles_sorting(self, client: AsyncClient, token: str):
         create_url = app.url_path_for("create_role")
         await client.post(
@@ -235,6 +346,17 @@ class TestRoleRouter:
         response = await client.post(url, json=payload, headers={"Authorization": f"Bearer invalid_token"})
         assert response.status_code != status.HTTP_201_CREATED
 
+    async def test_add_permissions_to_role_bulk(self, client: AsyncClient, admin_token: str, test_role_permission):
+        test_role, test_permission = test_role_permission
+        url = app.url_path_for("add_permissions_to_role", role_id=test_role.id)
+        payload = {"permission_ids": [test_permission.id, 999999]}
+        response = await client.post(url, json=payload, headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["results"] == [
+            {"id": test_permission.id, "status": "updated"},
+            {"id": 999999, "status": "not_found"},
+        ]
+
     async def test_remove_permission_from_role_success(self, client: AsyncClient, admin_token: str, test_role_permission):
         test_role, test_permission = test_role_permission
         url = app.url_path_for("remove_permission_from_role", role_id=test_role.id)
@@ -0,0 +1,37 @@
+import pytest
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.main import app
+from app.database.models import User
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("setup_database", "override_get_db")
+class TestStatsRouter:
+
+    async def test_summary(self, client: AsyncClient, admin_token: str, test_user: User):
+        url = app.url_path_for("get_stats_summary")
+        response = await client.get(url, headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert body["users"]["active"] >= 1
+        assert body["roles"] >= 1
+        assert test_user.id in [user["id"] for user in body["recent_signups"]["users"]]
+        assert set(body["expiring_assignments"]) == {"within_days", "count", "assignments"}
+
+    async def test_summary_is_cached(self, db_session: AsyncSession, client: AsyncClient, admin_token: str, test_user: User):
+        url = app.url_path_for("get_stats_summary")
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        first = await client.get(url, headers=headers)
+        test_user.is_active = False
+        await db_session.commit()
+        # within the TTL the same body is served, generated_at included
+        assert (await client.get(url, headers=headers)).json() == first.json()
+
+    async def test_summary_requires_permission(self, client: AsyncClient, token: str):
+        url = app.url_path_for("get_stats_summary")
+        response = await client.get(url, headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert (await client.get(url)).status_code == status.HTTP_401_UNAUTHORIZED
@@ -1,3 +1,4 @@
+import json
 import uuid
 import pytest
 from fastapi import status
@@ -7,7 +8,9 @@ from unittest.mock import patch, AsyncMock
 
 from app.main import app
 from app.database.models import User
+from app.database.pagination import Keyset
 from tests.config import TestConfig
+from app.config import Config
 from app.auth.password_hash import PasswordHasher
 
 @pytest.mark.asyncio
@@ -40,6 +43,16 @@ class TestUsersRouter:
         assert response.status_code == status.HTTP_200_OK
         assert response.json()["username"] == test_user.username
 
+    async def test_get_current_user_conditional(self, client: AsyncClient, token: str, admin_token: str):
+        url = app.url_path_for("get_me")
+        response = await client.get(url, headers={"Authorization": f"Bearer {token}"})
+        etag = response.headers["ETag"]
+        response = await client.get(url, headers={"Authorization": f"Bearer {token}", "If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        # same URL, other user: the ETag is per caller
+        response = await client.get(url, headers={"Authorization": f"Bearer {admin_token}", "If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+
     async def test_update_current_user(self, client: AsyncClient, test_user: User, token: str):
         url = app.url_path_for("put_me")
 
@@ -116,6 +129,75 @@ class TestUsersRouter:
         assert "users" in data and isinstance(data["users"], list)
         assert any(user["id"] == test_user.id or user["username"] == test_user.username for user in data["users"])
 
+    async def test_get_all_users_fields_and_expand(self, client: AsyncClient, admin_token: str, test_user_role, test_user_group):
+        test_user, test_role = test_user_role
+        _, test_group = test_user_group
+        url = app.url_path_for("get_all_users")
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        params = {"search": test_user.username, "fields": "username,email", "sort": "created"}
+        response = await client.get(url, headers=headers, params=params)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["users"] == [{"id": test_user.id, "username": test_user.username, "email": test_user.email}]
+
+        response = await client.get(url, headers=headers, params={**params, "fields": "username", "expand": "roles,groups"})
+        assert response.json()["users"] == [
+            {"id": test_user.id, "username": test_user.username, "roles": [test_role.name], "groups": [test_group.name]}
+        ]
+        # expand alone keeps every UserOut field
+        user = (await client.get(url, headers=headers, params={"search": test_user.username, "expand": "roles"})).json()["users"][0]
+        assert user["roles"] == [test_role.name] and user["email"] == test_user.email and "groups" not in user
+
+    @pytest.mark.parametrize("params", [{"fields": "password"}, {"fields": ","}, {"expand": "permissions"}])
+    async def test_get_all_users_invalid_fields(self, client: AsyncClient, admin_token: str, params: dict):
+        url = app.url_path_for("get_all_users")
+        response = await client.get(url, headers={"Authorization": f"Bearer {admin_token}"}, params=params)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    async def test_get_all_users_cursor_pagination(self, client: AsyncClient, admin_token: str, test_user: User):
+        url = app.url_path_for("get_all_users")
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        first = (await client.get(url, headers=headers, params={"limit": 1})).json()
+        assert first["next_cursor"]
+        seen, params = [u["id"] for u in first["users"]], {"limit": 1, "cursor": first["next_cursor"]}
+        while params["cursor"] and len(seen) <= first["total"]:
+            data = (await client.get(url, headers=headers, params=params)).json()
+            seen.extend(u["id"] for u in data["users"])
+            params["cursor"] = data["next_cursor"]
+        assert len(seen) == len(set(seen)) == first["total"]
+        assert test_user.id in seen
+
+    @pytest.mark.parametrize("sort, value", [("created", "abc"), ("created", [1, 2]), ("username", 1), ("status", "yes")])
+    async def test_get_all_users_cursor_with_tampered_value(self, client: AsyncClient, admin_token: str, sort, value):
+        url = app.url_path_for("get_all_users")
+        response = await client.get(
+            url, headers={"Authorization": f"Bearer {admin_token}"},
+            params={"cursor": Keyset.encode(sort, "desc", value, 5)},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "Invalid cursor"
+
+    async def test_get_all_users_unknown_sort_cursor(self, client: AsyncClient, admin_token: str, test_user: User):
+        url = app.url_path_for("get_all_users")
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        first = (await client.get(url, headers=headers, params={"sort": "bogus", "limit": 1})).json()
+        assert Keyset.decode(first["next_cursor"]).sort_by == "created"
+        response = await client.get(url, headers=headers, params={"limit": 1, "cursor": first["next_cursor"]})
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.parametrize("mode", ["exact", "estimate", "none"])
+    async def test_get_all_users_total_modes(self, client: AsyncClient, admin_token: str, test_user: User, mode: str):
+        url = app.url_path_for("get_all_users")
+        response = await client.get(url, headers={"Authorization": f"Bearer {admin_token}"}, params={"total": mode})
+        data = response.json()
+        assert response.status_code == status.HTTP_200_OK
+        assert data["total_mode"] == mode
+        assert (data["total"] is None) == (mode == "none")
+
+    async def test_get_all_users_invalid_total_mode(self, client: AsyncClient, admin_token: str):
+        url = app.url_path_for("get_all_users")
+        response = await client.get(url, headers={"Authorization": f"Bearer {admin_token}"}, params={"total": "sometimes"})
+        assert response.status_code == 422
+
     async def test_get_all_users_no_auth(self, client):
         url = app.url_path_for("get_all_users")
         response = await client.get(url, params={"page": 1, "limit": 10})
@@ -144,6 +226,67 @@ class TestUsersRouter:
         assert response.status_code == 200
         assert response.json()["users"] == []
 
+    async def test_import_users_csv(self, client: AsyncClient, admin_token: str, test_user: User, monkeypatch):
+        monkeypatch.setattr(Config, "PASSWORD_HASH_WORKERS", 0)
+        tag = uuid.uuid4().hex[:8]
+        body = (
+            "firstname,lastname,username,email,password\n"
+            f"Bulk,One,imp1_{tag},imp1_{tag}@example.com,secret123\n"
+            f"Bulk,Two,{test_user.username},imp2_{tag}@example.com,secret123\n"
+            f"Bulk,Three,imp3_{tag},imp3_{tag}@example.com,short\n"
+        )
+        response = await client.post(
+            app.url_path_for("import_users"),
+            content=body.encode(),
+            headers={"Authorization": f"Bearer {admin_token}", "Content-Type": "text/csv"},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert (data["total"], data["created"], data["failed"]) == (3, 1, 2)
+        assert [(e["row"], e["errors"][0].split(":")[0]) for e in data["errors"]] == [(2, "username"), (3, "password")]
+
+    async def test_import_users_rejects_unknown_content_type_and_role(self, client: AsyncClient, admin_token: str, token: str):
+        url = app.url_path_for("import_users")
+        headers = {"Authorization": f"Bearer {admin_token}", "Content-Type": "application/xml"}
+        assert (await client.post(url, content=b"<users/>", headers=headers)).status_code == 415
+        headers["Content-Type"] = "application/x-ndjson"
+        response = await client.post(url, content=b"", headers=headers, params={"role_id": 999999})
+        assert response.status_code == 404
+        headers["Authorization"] = f"Bearer {token}"
+        assert (await client.post(url, content=b"", headers=headers)).status_code == 403
+
+    async def test_search_users(self, client: AsyncClient, admin_token: str, test_user: User):
+        url = app.url_path_for("search_users")
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = await client.get(url, headers=headers, params={"q": test_user.username.upper()})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()[0]["id"] == test_user.id
+        response = await client.get(url, headers=headers, params={"q": test_user.username[-6:]})
+        assert test_user.id in [u["id"] for u in response.json()]
+
+    async def test_search_users_validation_and_permission(self, client: AsyncClient, admin_token: str, token: str):
+        url = app.url_path_for("search_users")
+        response = await client.get(url, headers={"Authorization": f"Bearer {admin_token}"}, params={"q": ""})
+        assert response.status_code == 422
+        response = await client.get(url, headers={"Authorization": f"Bearer {token}"}, params={"q": "user"})
+        assert response.status_code == 403
+
+    async def test_export_users(self, client: AsyncClient, admin_token: str, token: str, test_user: User):
+        url = app.url_path_for("export_users")
+        headers = {"Authorization": f"Bearer {admin_token}"}
+        response = await client.get(url, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert test_user.id in [row["id"] for row in rows]
+        assert all("password" not in row for row in rows)
+
+        response = await client.get(url, headers=headers, params={"format": "csv"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"].startswith("text/csv")
+        assert response.text.splitlines()[0].endswith(",roles,groups")
+        assert (await client.get(url, headers={"Authorization": f"Bearer {token}"})).status_code == 403
+
     async def test_activate_user_success(self, db_session: AsyncSession, client: AsyncClient, admin_token: str, test_user: User):
         test_user.is_active = False
         db_session.add(test_user)
@@ -323,6 +466,17 @@ class TestUsersRouter:
         )
         assert resp.status_code == status.HTTP_400_BAD_REQUEST
 
+    async def test_assign_roles_to_user_bulk(self, client, admin_token, test_user, test_role):
+        url = app.url_path_for("assign_roles_to_user", user_id=test_user.id)
+        response = await client.post(url, json={"role_ids": [test_role.id, test_role.id]}, headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"created": 1, "updated": 0, "not_found": 0, "results": [{"id": test_role.id, "status": "created"}]}
+
+    async def test_assign_roles_to_user_bulk_unknown_user(self, client, admin_token, test_role):
+        url = app.url_path_for("assign_roles_to_user", user_id=999999)
+        response = await client.post(url, json={"role_ids": [test_role.id]}, headers={"Authorization": f"Bearer {admin_token}"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     async def test_remove_role_from_user(self, client, admin_token, test_user, test_role):
         # Assign role first
         assign_url = app.url_path_for("assigne_role_to_user", user_id=test_user.id)
@@ -0,0 +1,19 @@
+from app.api.dependencies.conditional import etag_matches, make_etag
+
+
+class TestConditionalDeps:
+    def test_make_etag_follows_key_and_versions(self):
+        etag = make_etag("/roles/?", {"roles": 3})
+        assert etag.startswith('"') and etag.endswith('"')
+        assert make_etag("/roles/?", {"roles": 3}) == etag
+        assert make_etag("/roles/?", {"roles": 4}) != etag
+        assert make_etag("/roles/?limit=5", {"roles": 3}) != etag
+
+    def test_etag_matches(self):
+        etag = make_etag("/roles/?", {"roles": 3})
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
+        assert not etag_matches("", etag)
@@ -1,6 +1,16 @@
 import pytest
-from sqlalchemy.ext.asyncio import AsyncSession
+import pytest_asyncio
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.api.dependencies import database
 from app.api.dependencies.database import get_db
+from app.auth.jwt import JWTManager
+from app.config import Config
+from app.database.engine import ReadReplicaRouter, build_async_engine
+from app.middlewares import read_your_writes
+from app.middlewares.read_your_writes import MemoryPinBackend
 
 @pytest.mark.asyncio
 async def test_get_db_yields_session():
@@ -16,3 +26,77 @@ async def test_get_db_yields_session():
     # Advance generator to completion and confirm it closes properly
     with pytest.raises(StopAsyncIteration):
         await gen.__anext__()
+
+
+@pytest.mark.asyncio
+class TestGetReadDb:
+    """A second SQLite file stands in for the replica; each database holds a marker row."""
+
+    @pytest_asyncio.fixture
+    async def router(self, tmp_path, monkeypatch):
+        factories = []
+        for name in ("primary", "replica"):
+            engine = build_async_engine(f"sqlite+aiosqlite:///{tmp_path}/{name}.db", pool_name=f"test_{name}")
+            async with engine.begin() as conn:
+                await conn.execute(text("CREATE TABLE marker (name TEXT)"))
+                await conn.execute(text("INSERT INTO marker VALUES (:name)"), {"name": name})
+            factories.append(async_sessionmaker(bind=engine))
+        router = ReadReplicaRouter(factories[0], [factories[1]])
+        monkeypatch.setattr(database, "read_router", router)
+        yield router
+        for factory in factories:
+            await factory.kw["bind"].dispose()
+
+    @staticmethod
+    def make_request(headers: dict | None = None) -> Request:
+        raw = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+        return Request({"type": "http", "headers": raw})
+
+    async def read_marker(self, request: Request) -> str:
+        gen = database.get_read_db(request)
+        db = await gen.__anext__()
+        marker = (await db.execute(text("SELECT name FROM marker"))).scalar_one()
+        with pytest.raises(StopAsyncIteration):
+            await gen.__anext__()
+        return marker
+
+    async def test_reads_go_to_replica(self, router):
+        assert await self.read_marker(self.make_request()) == "replica"
+
+    async def test_consistency_header_forces_primary(self, router):
+        request = self.make_request({Config.READ_CONSISTENCY_HEADER: "primary"})
+        assert await self.read_marker(request) == "primary"
+
+    async def test_user_pinned_by_recent_write_reads_primary(self, router, monkeypatch):
+        backend = MemoryPinBackend()
+        monkeypatch.setattr(read_your_writes, "read_pins", backend)
+        await backend.pin("alice", 5)
+
+        def bearer(subject: str) -> Request:
+            return self.make_request({"Authorization": f"Bearer {JWTManager.encode_access_token(data={'sub': subject})}"})
+
+        assert await self.read_marker(bearer("alice")) == "primary"
+        assert await self.read_marker(bearer("bob")) == "replica"
+        assert await self.read_marker(self.make_request({"Authorization": "Bearer garbage"})) == "replica"
+
+
+class TestReadReplicaRouter:
+
+    def test_round_robin_over_replicas(self):
+        primary, first, second = object(), object(), object()
+        router = ReadReplicaRouter(primary, [first, second])
+        assert [router.session_factory() for _ in range(4)] == [first, second, first, second]
+        assert router.session_factory(use_primary=True) is primary
+
+    @pytest.mark.asyncio
+    async def test_dispose_closes_replica_engines(self, tmp_path):
+        engine = build_async_engine(f"sqlite+aiosqlite:///{tmp_path}/replica.db", pool_name="test_dispose")
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        assert engine.pool.checkedin() == 1
+        await ReadReplicaRouter(object(), [async_sessionmaker(bind=engine)]).dispose()
+        assert engine.pool.checkedin() == 0
+
+    def test_falls_back_to_primary_without_replicas(self):
+        primary = object()
+        assert ReadReplicaRouter(primary, []).session_factory() is primary
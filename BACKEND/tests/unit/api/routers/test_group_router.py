@@ -89,7 +89,8 @@ class Testgroup_router:
                 skip=2,
                 limit=5,
                 sort_by="created",
-                sort_order="desc"
+                sort_order="desc",
+                cursor=None
             )
 
     async def test_get_all_groups_sorting(self, mock_db, mock_group):
@@ -109,7 +110,8 @@ class Testgroup_router:
                 skip=0,
                 limit=10,
                 sort_by="name",
-                sort_order="asc"
+                sort_order="asc",
+                cursor=None
             )
     # 🔸 POST /users/{user_id}/add_to_group
     async def test_add_user_to_group_success(self, mock_db, mock_current_user):
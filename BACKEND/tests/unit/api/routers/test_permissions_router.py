@@ -89,7 +89,8 @@ class Testpermission_router:
                 skip=2,
                 limit=5,
                 sort_by="created",
-                sort_order="desc"
+                sort_order="desc",
+                cursor=None
             )
 
     async def test_get_all_permissions_sorting(self, mock_db, mock_permission):
@@ -109,7 +110,8 @@ class Testpermission_router:
                 skip=0,
                 limit=10,
                 sort_by="name",
-                sort_order="asc"
+                sort_order="asc",
+                cursor=None
             )
 
     async def test_add_permission_to_role_success(self, mock_db):
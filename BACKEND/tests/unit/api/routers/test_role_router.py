@@ -91,7 +91,8 @@ class Testrole_router:
                 skip=2,
                 limit=5,
                 sort_by="created",
-                sort_order="desc"
+                sort_order="desc",
+                cursor=None
             )
 
     async def test_get_all_roles_sorting(self, mock_db, mock_role):
@@ -111,7 +112,8 @@ class Testrole_router:
                 skip=0,
                 limit=10,
                 sort_by="name",
-                sort_order="asc"
+                sort_order="asc",
+                cursor=None
             )
 
     async def test_assign_role_to_user_success(self, mock_db, mock_current_user):
@@ -1,11 +1,12 @@
+import json
 import pytest
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Response, status
 from unittest.mock import AsyncMock, MagicMock, patch, ANY
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.models import User
 
 from app.api.routers import users as users_router
-from app.schemas.user import UserCreate, UserOut, UserUpdate, UsersResponse
+from app.schemas.user import UserCreate, UserUpdate, UsersResponse
 from app.database.services.user_service import UserService
 from app.database.services.users_roles_services import UserRoleService
 
@@ -138,16 +139,26 @@ class TestUserRouter:
             status=True,
             role=None,
             group=None,
-            search=None
+            search=None,
+            cursor=None,
+            total_mode="exact",
+            columns=users_router.USER_OUT_COLUMNS,
+            expand=None
         )
-        assert isinstance(response, UsersResponse)
-        assert response.page == 1
-        assert response.limit == 50
-        assert response.total == 1
-        assert isinstance(response.users, list)
-        assert len(response.users) == 1
-        assert isinstance(response.users[0], UserOut)
-        assert response.users[0].username == dummy_user.username
+        assert isinstance(response, Response) and response.media_type == "application/json"
+        body = UsersResponse.model_validate_json(response.body)
+        assert body.page == 1
+        assert body.limit == 50
+        assert body.total == 1
+        assert len(body.users) == 1
+        assert body.users[0].username == dummy_user.username
+        assert "password" not in json.loads(response.body)["users"][0]
+
+    async def test_search_users(self, mock_db):
+        with patch.object(UserService, "search_users", new_callable=AsyncMock, return_value=[]) as search_mock:
+            result = await users_router.search_users(q="jo", limit=5, session=mock_db)
+        search_mock.assert_awaited_once_with(db=mock_db, q="jo", limit=5)
+        assert result == []
 
     async def test_activate_user_success(self, mock_db):
         user_id = 123
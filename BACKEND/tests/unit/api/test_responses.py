@@ -0,0 +1,66 @@
+import json
+from datetime import datetime, timezone
+from typing import List
+
+import pytest
+from fastapi import FastAPI, Response
+from httpx import ASGITransport, AsyncClient
+
+from app.api.responses import type_adapter, validated_response
+from app.schemas.user import UserOut, UsersResponse
+
+
+class Row:
+    """Attribute access like a SQLAlchemy Row, plus a column the schema does not declare."""
+
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+
+def make_row(id: int) -> Row:
+    return Row(
+        id=id, firstname="Jane", middlename=None, lastname="Doe", username=f"jane{id}", email=f"jane{id}@example.com",
+        is_active=True, is_verified=False, is_deleted=False, created=datetime(2025, 1, 2, 3, 4, 5, 6), updated=None,
+        password="hash", total=2,
+    )
+
+
+class TestResponses:
+    def test_type_adapter_is_cached(self):
+        assert type_adapter(List[UserOut]) is type_adapter(List[UserOut])
+
+    def test_validated_response_matches_model_serialization(self):
+        data = {"page": 1, "limit": 2, "total": 2, "users": [make_row(1), make_row(2)]}
+        response = validated_response(UsersResponse, data)
+        assert isinstance(response, Response)
+        assert response.media_type == "application/json"
+        expected = UsersResponse(**{**data, "users": [UserOut.model_validate(u) for u in data["users"]]})
+        assert json.loads(response.body) == json.loads(expected.model_dump_json())
+        assert "password" not in json.loads(response.body)["users"][0]
+
+    def test_validated_response_passes_status_and_headers(self):
+        response = validated_response(List[int], [1, 2], status_code=201, headers={"X-Test": "1"})
+        assert response.status_code == 201
+        assert response.headers["X-Test"] == "1"
+        assert response.body == b"[1,2]"
+
+    @pytest.mark.asyncio
+    async def test_route_body_matches_pydantic_for_aware_datetimes(self):
+        row = make_row(1)
+        row.created = datetime(2025, 1, 2, 3, 4, 5, 6, tzinfo=timezone.utc)
+        app = FastAPI()
+
+        @app.get("/validated", response_model=UserOut)
+        async def validated():
+            return validated_response(UserOut, row)
+
+        @app.get("/fastapi", response_model=UserOut)
+        async def fastapi_serialized():
+            return row
+
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            body = (await client.get("/validated")).content
+            fastapi_body = (await client.get("/fastapi")).content
+        assert body == UserOut.model_validate(row).model_dump_json().encode()
+        assert b'"2025-01-02T03:04:05.000006Z"' in body
+        assert json.loads(body) == json.loads(fastapi_body)
@@ -0,0 +1,51 @@
+import pytest
+import uuid
+from sqlalchemy import delete, insert, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.models import Role, TableVersion
+from app.database.services import TableVersionService
+
+pytestmark = pytest.mark.asyncio
+
+TABLES = ("users", "roles", "groups", "permissions")
+
+
+class TestTableVersion:
+
+    async def test_every_versioned_table_is_seeded(self, db_session: AsyncSession):
+        versions = await TableVersionService.get_versions(db_session, TABLES)
+        assert set(versions) == set(TABLES)
+
+    async def test_writes_bump_only_their_table(self, db_session: AsyncSession):
+        before = await TableVersionService.get_versions(db_session, TABLES)
+        role = Role(name="role_" + uuid.uuid4().hex[:6])
+        db_session.add(role)
+        await db_session.commit()
+        inserted = await TableVersionService.get_versions(db_session, TABLES)
+        assert inserted["roles"] > before["roles"]
+        assert {t: v for t, v in inserted.items() if t != "roles"} == {t: v for t, v in before.items() if t != "roles"}
+
+        await db_session.execute(update(Role).where(Role.id == role.id).values(description="changed"))
+        await db_session.commit()
+        updated = await TableVersionService.get_versions(db_session, TABLES)
+        assert updated["roles"] > inserted["roles"]
+
+        await db_session.execute(delete(Role).where(Role.id == role.id))
+        await db_session.commit()
+        assert (await TableVersionService.get_versions(db_session, TABLES))["roles"] > updated["roles"]
+
+    async def test_rolled_back_write_keeps_version(self, db_session: AsyncSession):
+        before = await TableVersionService.get_versions(db_session, ("roles",))
+        db_session.add(Role(name="role_" + uuid.uuid4().hex[:6]))
+        await db_session.flush()
+        await db_session.rollback()
+        assert await TableVersionService.get_versions(db_session, ("roles",)) == before
+
+    async def test_version_is_the_sum_of_shards(self, db_session: AsyncSession):
+        before = (await TableVersionService.get_versions(db_session, ("groups",)))["groups"]
+        await db_session.execute(insert(TableVersion).values(name="groups", shard=7, version=5))
+        try:
+            assert await TableVersionService.get_versions(db_session, ("groups",)) == {"groups": before + 5}
+        finally:
+            await db_session.execute(delete(TableVersion).where(TableVersion.name == "groups", TableVersion.shard == 7))
+            await db_session.commit()
@@ -4,12 +4,19 @@ from fastapi import HTTPException
 
 from app.database.services.auth_service import AuthService 
 
+
+def mock_session(role_names: list[str]) -> MagicMock:
+    """Session whose execute() returns `role_names` as the token role lookup."""
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=MagicMock(**{"scalars.return_value.all.return_value": role_names}))
+    return db
+
 @pytest.mark.asyncio
 class TestAuthService:
 
     async def test_get_new_tokens_success(self):
         # Arrange
-        mock_db = MagicMock()
+        mock_db = mock_session([])
         mock_user = MagicMock()
         mock_user.id = 123
         mock_user.username = "alice"
@@ -49,10 +56,27 @@ class TestAuthService:
                 user_id=123,
             )
             mock_log.info.assert_called_once()
+
+    async def test_get_new_tokens_embeds_role_names_in_access_token(self):
+        mock_db = mock_session(["admin", "auditor"])
+        mock_user = MagicMock(id=7, username="carol")
+
+        with patch(
+            "app.database.services.auth_service.create_access_token", return_value="access"
+        ) as mock_create_access_token, patch(
+            "app.database.services.auth_service.create_refresh_token", return_value="refresh"
+        ), patch(
+            "app.database.services.auth_service.RefreshTokenService.add_refresh_token_to_db",
+            new_callable=AsyncMock,
+            return_value=MagicMock()
+        ):
+            await AuthService.get_new_tokens(mock_db, mock_user)
+
+        mock_create_access_token.assert_called_once_with(data={"sub": "carol", "user_id": 7, "roles": ["admin", "auditor"]})
     
     async def test_get_new_tokens_refresh_token_fail(self):
         # Arrange
-        mock_db = MagicMock()
+        mock_db = mock_session([])
         mock_user = MagicMock()
         mock_user.id = 99
         mock_user.username = "bob"
@@ -1,9 +1,10 @@
 import pytest
+import uuid
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import Config
 from app.database.services.groups_roles_services import GroupRoleService
-from app.database.models import GroupRole
+from app.database.models import GroupRole, Role
 
 
 # --- Helper to normalize DB datetime to UTC-aware for cross-DB consistency ---
@@ -61,6 +62,22 @@ class TestGroupRoleService:
         assert restored.is_deleted is False
         assert await GroupRoleService.check_group_role_exists(db_session, group.id, role.id) is True
 
+    async def test_assign_roles_to_group_bulk(self, db_session: AsyncSession, test_link_group_role):
+        group, role = test_link_group_role
+        await GroupRoleService.remove_group_role(db_session, group.id, role.id)
+        new_role = Role(name="role_" + uuid.uuid4().hex[:6])
+        db_session.add(new_role)
+        await db_session.commit()
+
+        statuses = await GroupRoleService.assign_roles_to_group(db_session, group.id, [new_role.id, role.id])
+
+        assert statuses == {new_role.id: "created", role.id: "updated"}
+        assert await GroupRoleService.check_group_role_exists(db_session, group.id, role.id) is True
+        assert await GroupRoleService.check_group_role_exists(db_session, group.id, new_role.id) is True
+
+    async def test_assign_roles_to_group_bulk_missing_group(self, db_session: AsyncSession, test_role):
+        assert await GroupRoleService.assign_roles_to_group(db_session, 999999, [test_role.id]) is None
+
     async def test_remove_group_role(self, db_session: AsyncSession, test_link_group_role):
         group, role = test_link_group_role
 
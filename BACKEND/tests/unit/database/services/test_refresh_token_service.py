@@ -3,7 +3,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timezone, timedelta
 
-from app.database.services.refresh_token_service import RefreshTokenService
+from app.database.services.refresh_token_service import RefreshTokenService, TOKEN_COLUMNS
 from app.database.models import RefreshToken
 
 
@@ -84,7 +84,7 @@ class TestRefreshTokenService:
             assert mock_token.used is True
             mock_db.add.assert_called_once_with(mock_token)
             mock_db.commit.assert_awaited_once()
-            mock_db.refresh.assert_awaited_once_with(mock_token)
+            mock_db.refresh.assert_awaited_once_with(mock_token, TOKEN_COLUMNS)
             mock_log.info.assert_called_once()
 
     async def test_validate_refresh_token_found(self, mock_db, mock_token):
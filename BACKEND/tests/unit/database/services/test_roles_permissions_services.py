@@ -1,6 +1,8 @@
 import pytest
+import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.services.roles_permissions_services import RolePermissionService
+from app.database.models import Permission
 
 
 @pytest.mark.asyncio
@@ -33,6 +35,22 @@ class TestRolePermissionService:
         assert restored.is_deleted is False
         assert await RolePermissionService.check_role_permission_exists(db_session, role.id, permission.id) is True
 
+    async def test_assign_permissions_to_role_bulk(self, db_session: AsyncSession, test_link_role_permission):
+        role, permission = test_link_role_permission
+        new_permission = Permission(name="perm_" + uuid.uuid4().hex[:6])
+        db_session.add(new_permission)
+        await db_session.commit()
+
+        statuses = await RolePermissionService.assign_permissions_to_role(
+            db_session, role.id, [permission.id, new_permission.id, 999999]
+        )
+
+        assert statuses == {permission.id: "updated", new_permission.id: "created", 999999: "not_found"}
+        assert await RolePermissionService.check_role_permission_exists(db_session, role.id, new_permission.id) is True
+
+    async def test_assign_permissions_to_role_bulk_missing_role(self, db_session: AsyncSession, test_permission):
+        assert await RolePermissionService.assign_permissions_to_role(db_session, 999999, [test_permission.id]) is None
+
     async def test_remove_role_permission(self, db_session: AsyncSession, test_link_role_permission):
         role, permission = test_link_role_permission
         result = await RolePermissionService.remove_role_permission(db_session, role.id, permission.id)
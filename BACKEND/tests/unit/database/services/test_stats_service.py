@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import User, UserGroup, GroupRole
+from app.database.services.stats_service import StatsService
+
+
+@pytest.mark.asyncio
+class TestStatsService:
+
+    async def test_counts_follow_user_status(self, db_session: AsyncSession, test_user: User):
+        before = await StatsService.get_summary(db_session)
+        test_user.is_active = False
+        await db_session.commit()
+        inactive = await StatsService.get_summary(db_session)
+        assert inactive["users"]["active"] == before["users"]["active"] - 1
+        assert inactive["users"]["inactive"] == before["users"]["inactive"] + 1
+
+        test_user.is_deleted = True
+        await db_session.commit()
+        deleted = await StatsService.get_summary(db_session)
+        assert deleted["users"]["inactive"] == before["users"]["inactive"]
+        assert deleted["users"]["deleted"] == before["users"]["deleted"] + 1
+
+    async def test_counts_skip_deleted_entities(self, db_session: AsyncSession, test_role, test_group, test_permission):
+        before = await StatsService.get_summary(db_session)
+        for entity in (test_role, test_group, test_permission):
+            entity.is_deleted = True
+        await db_session.commit()
+        after = await StatsService.get_summary(db_session)
+        assert (after["roles"], after["groups"], after["permissions"]) == (
+            before["roles"] - 1, before["groups"] - 1, before["permissions"] - 1
+        )
+
+    async def test_recent_signups(self, db_session: AsyncSession, test_user: User):
+        summary = await StatsService.get_summary(db_session, signup_days=1, limit=1000)
+        assert test_user.id in [user.id for user in summary["recent_signups"]["users"]]
+        assert summary["recent_signups"]["count"] >= 1
+
+        test_user.created = datetime.now(timezone.utc) - timedelta(days=3)
+        await db_session.commit()
+        summary = await StatsService.get_summary(db_session, signup_days=1, limit=1000)
+        assert test_user.id not in [user.id for user in summary["recent_signups"]["users"]]
+
+    async def test_expiring_assignments(self, db_session: AsyncSession, test_user, test_group, test_role):
+        now = datetime.now(timezone.utc)
+        db_session.add(UserGroup(user_id=test_user.id, group_id=test_group.id, valid_until=now + timedelta(hours=1)))
+        # beyond the horizon: counted by neither
+        db_session.add(GroupRole(group_id=test_group.id, role_id=test_role.id, valid_until=now + timedelta(days=30)))
+        await db_session.commit()
+
+        summary = await StatsService.get_summary(db_session, expiring_days=7, limit=1000)
+        mine = [a for a in summary["expiring_assignments"]["assignments"] if a.target_name == test_group.name or a.subject_name == test_group.name]
+        assert [(a.kind, a.subject_id, a.subject_name, a.target_id) for a in mine] == [
+            ("user_group", test_user.id, test_user.username, test_group.id)
+        ]
+        assert summary["expiring_assignments"]["count"] >= 1
+        valid_until = [a.valid_until for a in summary["expiring_assignments"]["assignments"]]
+        assert valid_until == sorted(valid_until)
+
+    async def test_three_statements(self, db_session: AsyncSession, test_user: User):
+        statements = []
+
+        def listener(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            await StatsService.get_summary(db_session)
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert len(statements) == 3
@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+import uuid
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import User, Role, UserRole
+from app.database.services.user_export_service import UserExportService
+
+
+async def collect(iterator) -> list:
+    return [item async for item in iterator]
+
+
+@pytest.mark.asyncio
+class TestUserExportService:
+
+    async def test_rows_carry_aggregated_memberships(self, db_session: AsyncSession, test_link_user_group_role):
+        user, group, role = test_link_user_group_role
+        extra_role = Role(name="role_" + uuid.uuid4().hex[:6])
+        db_session.add(extra_role)
+        await db_session.flush()
+        db_session.add(UserRole(user_id=user.id, role_id=extra_role.id))
+        await db_session.commit()
+
+        rows = [row for chunk in await collect(UserExportService.stream_rows(db_session)) for row in chunk]
+        exported = next(row for row in rows if row["id"] == user.id)
+        assert exported["username"] == user.username
+        # direct roles only: `role` reaches the user through the group
+        assert exported["roles"] == [extra_role.name]
+        assert exported["groups"] == [group.name]
+        assert "password" not in exported
+
+    async def test_streams_in_fixed_size_chunks(self, db_session: AsyncSession, test_user: User):
+        live = len((await db_session.execute(select(User.id).where(User.is_deleted == False))).all())
+        chunks = await collect(UserExportService.stream_rows(db_session, chunk_size=2))
+        assert sum(len(chunk) for chunk in chunks) == live
+        assert all(len(chunk) == 2 for chunk in chunks[:-1])
+        ids = [row["id"] for chunk in chunks for row in chunk]
+        assert ids == sorted(ids)
+
+    async def test_excludes_deleted_and_filters_status(self, db_session: AsyncSession, test_user: User):
+        test_user.is_active = False
+        await db_session.commit()
+        inactive = [row["id"] for chunk in await collect(UserExportService.stream_rows(db_session, status=False)) for row in chunk]
+        assert test_user.id in inactive
+        test_user.is_deleted = True
+        await db_session.commit()
+        everyone = [row["id"] for chunk in await collect(UserExportService.stream_rows(db_session)) for row in chunk]
+        assert test_user.id not in everyone
+
+    async def test_encoders(self):
+        rows = [{"id": 1, "firstname": "A", "middlename": None, "lastname": "B", "username": "ab", "email": "ab@example.com",
+                 "is_active": True, "is_verified": False, "created": None, "updated": None, "roles": ["r1", "r2"], "groups": []}]
+
+        async def chunks(*parts):
+            for part in parts:
+                yield part
+
+        ndjson = b"".join(await collect(UserExportService.ndjson(chunks(rows))))
+        assert json.loads(ndjson.decode().splitlines()[0])["roles"] == ["r1", "r2"]
+        parsed = list(csv.DictReader(io.StringIO(b"".join(await collect(UserExportService.csv(chunks(rows)))).decode())))
+        assert parsed[0]["roles"] == "r1|r2" and parsed[0]["middlename"] == ""
+        empty = b"".join(await collect(UserExportService.csv(chunks())))
+        assert empty.decode().startswith("id,firstname")
@@ -0,0 +1,111 @@
+import json
+import uuid
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.password_hash import PasswordHasher
+from app.config import Config
+from app.database.models import User, UserRole
+from app.database.services.user_import_service import UserImportService
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(iterator) -> list:
+    return [item async for item in iterator]
+
+
+def ndjson(*records: dict) -> bytes:
+    return "\n".join(json.dumps(record) for record in records).encode()
+
+
+def new_user(**overrides) -> dict:
+    tag = uuid.uuid4().hex[:8]
+    user = {"firstname": "Bulk", "lastname": "User", "username": f"bulk_{tag}", "email": f"bulk_{tag}@example.com", "password": "secret123"}
+    return {**user, **overrides}
+
+
+@pytest.mark.asyncio
+class TestUserImportService:
+
+    @pytest.fixture(autouse=True)
+    def thread_hashing(self, monkeypatch):
+        monkeypatch.setattr(Config, "PASSWORD_HASH_WORKERS", 0)
+
+    async def test_read_lines_across_chunk_boundaries(self):
+        body = "﻿a,b\r\nx,y\nü,z".encode()
+        lines = await collect(UserImportService.read_lines(stream(body[:5], body[5:12], body[12:])))
+        assert lines == ["a,b", "x,y", "ü,z"]
+
+    async def test_read_lines_rejects_invalid_utf8(self):
+        with pytest.raises(UnicodeDecodeError):
+            await collect(UserImportService.read_lines(stream(b"abc\n\xff\n")))
+
+    async def test_read_records_csv(self):
+        lines = stream(b"username,middlename,email\n\nbob,,bob@example.com\n\"a,b\",x\n")
+        records = await collect(UserImportService.read_records(UserImportService.read_lines(lines), "csv"))
+        assert records == [
+            (1, {"username": "bob", "email": "bob@example.com"}, None),
+            (2, None, "Expected 3 columns, got 2"),
+        ]
+
+    async def test_read_records_ndjson(self):
+        lines = stream(b'{"username": "bob"}\nnot json\n[1]\n')
+        records = await collect(UserImportService.read_records(UserImportService.read_lines(lines), "ndjson"))
+        assert records == [(1, {"username": "bob"}, None), (2, None, "Invalid JSON"), (3, None, "Expected a JSON object")]
+
+    async def test_import_users_reports_rejected_rows(self, db_session: AsyncSession, test_user: User):
+        good, other = new_user(), new_user()
+        body = ndjson(
+            good,
+            new_user(email="not-an-email"),
+            new_user(username=good["username"]),
+            new_user(username=test_user.username, email=test_user.email),
+            other,
+        )
+        records = UserImportService.read_records(UserImportService.read_lines(stream(body)), "ndjson")
+        report = await UserImportService.import_users(db_session, records, chunk_size=2)
+
+        assert (report.total, report.created, report.failed) == (5, 2, 3)
+        assert [e.row for e in report.errors] == [2, 3, 4]
+        assert report.errors[0].errors[0].startswith("email: ")
+        assert report.errors[1].errors == ["username: Duplicate in import"]
+        assert report.errors[2].errors == ["username: Already exists", "email: Already exists"]
+        assert report.errors[2].username == test_user.username
+        created = (await db_session.execute(
+            select(User).where(User.username.in_([good["username"], other["username"]]))
+        )).scalars().all()
+        assert len(created) == 2
+        assert all(PasswordHasher.verify_password("secret123", u.password) for u in created)
+
+    async def test_import_users_one_insert_per_chunk_with_role(self, db_session: AsyncSession, test_role):
+        users = [new_user() for _ in range(3)]
+        records = UserImportService.read_records(UserImportService.read_lines(stream(ndjson(*users))), "ndjson")
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+        try:
+            report = await UserImportService.import_users(db_session, records, role_id=test_role.id)
+        finally:
+            event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+        assert report.created == 3
+        assert len([s for s in statements if s.startswith("INSERT INTO users ")]) == 1
+        assert len([s for s in statements if s.startswith("SELECT users.username, users.email")]) == 1
+        assigned = (await db_session.execute(select(UserRole).where(UserRole.role_id == test_role.id))).scalars().all()
+        assert len(assigned) == 3
+
+    async def test_hash_many_on_process_pool(self, monkeypatch):
+        monkeypatch.setattr(Config, "PASSWORD_HASH_WORKERS", 2)
+        hashes = await PasswordHasher.hash_many(["one", "two"])
+        assert PasswordHasher._pool is not None
+        processes = list(PasswordHasher._pool._processes.values())
+        assert [PasswordHasher.verify_password(p, h) for p, h in zip(["one", "two"], hashes)] == [True, True]
+
+        await PasswordHasher.shutdown()
+        assert PasswordHasher._pool is None
+        assert not any(process.is_alive() for process in processes)
@@ -1,11 +1,13 @@
 from unittest.mock import AsyncMock, MagicMock
 import pytest
 import uuid
+from sqlalchemy import event, func, select
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from app.schemas.user import UserCreate, UserUpdate
 from app.database.services.user_service import UserService
-from app.database.models import User, Group, Role, Permission
+from app.database.models import User, Group, Role, Permission, UserRole, UserCounter
 
 
 @pytest.mark.asyncio
@@ -68,6 +70,35 @@ class TestUserService:
         assert total >= 1
         assert any(u.id == test_user.id for u in users)
 
+    async def test_get_all_users_columns_returns_rows(self, db_session: AsyncSession, test_user: User):
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+        try:
+            total, rows = await UserService.get_all_users(db_session, sort_by="email", columns=["username"])
+        finally:
+            event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+        assert len(statements) == 1  # no relationship loading
+        row = next(r for r in rows if r.id == test_user.id)
+        assert set(row._mapping) == {"id", "email", "username", "total"}
+        assert row.username == test_user.username
+
+    async def test_get_all_users_expand_aggregates_in_one_query(self, db_session: AsyncSession, test_link_user_role):
+        test_user, test_role = test_link_user_role
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+        try:
+            total, rows = await UserService.get_all_users(
+                db_session, limit=100, search=test_user.username, columns=["username"], expand=["roles", "groups"]
+            )
+        finally:
+            event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+        assert len(statements) == 1
+        row = next(r for r in rows if r.id == test_user.id)
+        assert UserService.split_names(row.roles) == [test_role.name]
+        assert UserService.split_names(row.groups) == []
+
     async def test_get_all_users_sorting(self, db_session: AsyncSession, test_user: User):
         user2 = User(
             firstname="TestFirst_" + uuid.uuid4().hex[:6],
@@ -105,6 +136,125 @@ class TestUserService:
         total, users = await UserService.get_all_users(db_session, search=search_term)
         assert any(search_term.lower() in u.username.lower() or search_term.lower() in u.email.lower() for u in users)
 
+    async def test_get_all_users_exact_total_uses_window_count(self, db_session: AsyncSession, test_user: User):
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+        try:
+            total, users = await UserService.get_all_users(db_session, limit=1)
+        finally:
+            event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+        expected = (await db_session.execute(
+            select(func.count()).select_from(User).where(User.is_deleted == False, User.is_active == True)
+        )).scalar_one()
+        assert total == expected and len(users) == 1
+        counting = [s for s in statements if "count(" in s]
+        assert counting and all("OVER" in s for s in counting)
+
+    async def test_get_all_users_total_not_inflated_by_role_join(self, db_session: AsyncSession, test_user: User):
+        # Role names are case-sensitive unique, the filter is case-insensitive
+        name = "dup_" + uuid.uuid4().hex[:6]
+        roles = [Role(name=name), Role(name=name.upper())]
+        db_session.add_all(roles)
+        await db_session.flush()
+        db_session.add_all(UserRole(user_id=test_user.id, role_id=r.id) for r in roles)
+        await db_session.commit()
+        total, users = await UserService.get_all_users(db_session, role=name)
+        assert total == 1
+        assert [u.id for u in users] == [test_user.id]
+
+    async def test_get_all_users_total_modes(self, db_session: AsyncSession, test_user: User):
+        exact, _ = await UserService.get_all_users(db_session, total_mode="exact")
+        estimate, _ = await UserService.get_all_users(db_session, total_mode="estimate")
+        none, users = await UserService.get_all_users(db_session, total_mode="none")
+        assert estimate == exact
+        assert none is None and users
+
+    async def test_get_all_users_exact_total_past_last_page(self, db_session: AsyncSession, test_user: User):
+        exact, _ = await UserService.get_all_users(db_session)
+        total, users = await UserService.get_all_users(db_session, page=10_000)
+        assert users == [] and total == exact
+
+    async def test_user_counters_follow_status_and_soft_delete(self, db_session: AsyncSession, test_user: User):
+        async def counters():
+            rows = (await db_session.execute(select(UserCounter.is_active, UserCounter.total))).all()
+            return dict(rows)
+
+        before = await counters()
+        test_user.is_active = False
+        await db_session.commit()
+        after_deactivate = await counters()
+        assert after_deactivate[True] == before[True] - 1
+        assert after_deactivate[False] == before[False] + 1
+        test_user.is_deleted = True
+        await db_session.commit()
+        assert (await counters())[False] == before[False]
+
+    @pytest.mark.parametrize("dialect", [postgresql.asyncpg.dialect(), postgresql.psycopg.dialect()])
+    async def test_estimate_user_count_uses_planner_on_postgres(self, dialect):
+        db = MagicMock()
+        db.get_bind.return_value.dialect = dialect
+        result = MagicMock()
+        result.scalar_one.return_value = [{"Plan": {"Plan Rows": 1234}}]
+        conn = MagicMock()
+        conn.exec_driver_sql = AsyncMock(return_value=result)
+        db.connection = AsyncMock(return_value=conn)
+        name = "x :name 'quoted'"
+        estimate = await UserService.estimate_user_count(db, [User.is_deleted == False, User.username == name], True)
+        assert estimate == 1234
+        statement, params = conn.exec_driver_sql.await_args.args
+        assert statement.startswith("EXPLAIN (FORMAT JSON) SELECT users.id")
+        # user input travels as a parameter, never inside the SQL text
+        assert name not in statement
+        assert name in (params.values() if isinstance(params, dict) else params)
+
+    async def test_estimate_user_count_exact_fallback_on_postgres(self):
+        db = MagicMock()
+        db.get_bind.return_value.dialect = postgresql.asyncpg.dialect()
+        result = MagicMock()
+        result.scalar_one.return_value = 3
+        db.execute = AsyncMock(return_value=result)
+        db.connection = AsyncMock()
+        assert await UserService.estimate_user_count(db, [User.is_deleted == False], True, exact_fallback=True) == 3
+        db.connection.assert_not_awaited()
+        assert str(db.execute.await_args.args[0]).startswith("SELECT count(*)")
+
+    async def test_search_users_ranks_prefix_before_substring(self, db_session: AsyncSession):
+        tag = "s" + uuid.uuid4().hex[:8]
+        def make(username: str, email: str) -> User:
+            return User(firstname="S", lastname="U", username=username, email=email, password="x")
+        substring = make(f"zz{tag}", f"zz{tag}@example.com")
+        email_prefix = make(f"mail_{uuid.uuid4().hex[:8]}", f"{tag}@example.com")
+        long_prefix = make(f"{tag}_longer", f"long_{uuid.uuid4().hex[:8]}@example.com")
+        exact = make(tag, f"exact_{uuid.uuid4().hex[:8]}@example.com")
+        db_session.add_all([substring, email_prefix, long_prefix, exact])
+        await db_session.commit()
+
+        users = await UserService.search_users(db_session, tag.upper())
+        assert [u.id for u in users] == [exact.id, long_prefix.id, email_prefix.id, substring.id]
+        assert [u.id for u in await UserService.search_users(db_session, tag, limit=2)] == [exact.id, long_prefix.id]
+
+    async def test_search_users_index_follows_writes(self, db_session: AsyncSession, test_user: User):
+        tag = "w" + uuid.uuid4().hex[:8]
+        assert await UserService.search_users(db_session, tag) == []
+        test_user.username = f"x_{tag}_x"
+        await db_session.commit()
+        assert [u.id for u in await UserService.search_users(db_session, tag)] == [test_user.id]
+        total, users = await UserService.get_all_users(db_session, search=tag)
+        assert total == 1 and users[0].id == test_user.id
+        test_user.is_deleted = True
+        await db_session.commit()
+        assert await UserService.search_users(db_session, tag) == []
+
+    async def test_search_users_escapes_like_wildcards_on_postgres(self):
+        clause = UserService._prefix_match(func.lower(User.username), "a%_", "postgresql")
+        compiled = clause.compile(dialect=postgresql.dialect())
+        assert str(compiled).endswith("ESCAPE '/'")
+        assert list(compiled.params.values()) == ["a/%/_%"]
+
+    async def test_search_users_blank_query(self, db_session: AsyncSession):
+        assert await UserService.search_users(db_session, "   ") == []
+
     async def test_delete_user(self, db_session: AsyncSession, test_user: User):
         result = await UserService.delete_user(db_session, test_user.id)
         assert result is True
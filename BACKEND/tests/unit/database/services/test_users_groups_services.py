@@ -1,9 +1,11 @@
 import pytest
+import uuid
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import Config
 from app.database.services.users_groups_services import UserGroupService
-from app.database.models import UserGroup
+from app.database.models import UserGroup, User
+from app.utils.invalidation import LinkChanged, invalidation_bus
 
 # --- Helper to normalize DB datetime to UTC-aware ---
 def to_utc_aware(dt: datetime) -> datetime:
@@ -60,6 +62,49 @@ class TestUserGroupService:
         assert restored.is_deleted is False
         assert await UserGroupService.check_user_group_exists(db_session, user.id, group.id) is True
 
+    async def test_assign_users_to_group_bulk(self, db_session: AsyncSession, test_link_user_group, monkeypatch):
+        user, group = test_link_user_group
+        await UserGroupService.remove_user_group(db_session, user.id, group.id)
+        others = [
+            User(firstname="B", lastname="U", username=f"bulk_{uuid.uuid4().hex[:8]}", email=f"{uuid.uuid4().hex[:8]}@example.com", password="x")
+            for _ in range(3)
+        ]
+        db_session.add_all(others)
+        await db_session.commit()
+        monkeypatch.setattr(Config, "BULK_ASSIGN_BATCH_SIZE", 2)
+
+        ids = [user.id, *(u.id for u in others), 999999, others[0].id]
+        statuses = await UserGroupService.assign_users_to_group(db_session, group.id, ids)
+
+        assert statuses == {
+            user.id: "updated", others[0].id: "created", others[1].id: "created", others[2].id: "created", 999999: "not_found"
+        }
+        for member in [user, *others]:
+            assert await UserGroupService.check_user_group_exists(db_session, member.id, group.id) is True
+
+    async def test_writes_publish_link_events(self, db_session: AsyncSession, test_user, test_group):
+        events = []
+
+        async def record(event):
+            events.append(event)
+
+        invalidation_bus.subscribe(record)
+        try:
+            await UserGroupService.assign_user_group(db_session, test_user.id, test_group.id)
+            await UserGroupService.remove_user_group(db_session, test_user.id, test_group.id)
+            await UserGroupService.assign_users_to_group(db_session, test_group.id, [test_user.id])
+        finally:
+            invalidation_bus.handlers.remove(record)
+        assert events == [
+            LinkChanged("users_groups", test_user.id, test_group.id),
+            LinkChanged("users_groups", test_user.id, test_group.id),
+            # bulk: the group is the owner, any user may have changed
+            LinkChanged("users_groups", None, test_group.id),
+        ]
+
+    async def test_assign_users_to_group_bulk_missing_group(self, db_session: AsyncSession, test_user):
+        assert await UserGroupService.assign_users_to_group(db_session, 999999, [test_user.id]) is None
+
     async def test_remove_user_group(self, db_session: AsyncSession, test_link_user_group):
         user, group = test_link_user_group
 
@@ -1,9 +1,11 @@
 import pytest
+import uuid
+from sqlalchemy import select
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.config import Config
 from app.database.services.users_roles_services import UserRoleService
-from app.database.models import UserRole
+from app.database.models import UserRole, Role
 
 
 # --- Helper to normalize DB datetime to UTC-aware ---
@@ -61,6 +63,25 @@ class TestUserRoleService:
         assert restored.is_deleted is False
         assert await UserRoleService.check_user_role_exists(db_session, user.id, role.id) is True
 
+    async def test_assign_roles_to_user_bulk(self, db_session: AsyncSession, test_link_user_role):
+        user, role = test_link_user_role
+        new_role = Role(name="role_" + uuid.uuid4().hex[:6])
+        db_session.add(new_role)
+        await db_session.commit()
+        until = datetime.now(timezone.utc) + timedelta(days=3)
+
+        statuses = await UserRoleService.assign_roles_to_user(db_session, user.id, [role.id, new_role.id, 999999], valid_until=until)
+
+        assert statuses == {role.id: "updated", new_role.id: "created", 999999: "not_found"}
+        links = (await db_session.execute(
+            select(UserRole).where(UserRole.user_id == user.id).execution_options(populate_existing=True)
+        )).scalars().all()
+        assert {link.role_id for link in links} == {role.id, new_role.id}
+        assert all(to_utc_aware(link.valid_until).date() == until.date() for link in links)
+
+    async def test_assign_roles_to_user_bulk_missing_user(self, db_session: AsyncSession, test_role):
+        assert await UserRoleService.assign_roles_to_user(db_session, 999999, [test_role.id]) is None
+
     async def test_remove_user_role(self, db_session: AsyncSession, test_link_user_role):
         user, role = test_link_user_role
 
@@ -0,0 +1,33 @@
+from unittest.mock import MagicMock
+import pytest
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.database.bulk import BulkLinks
+from app.database.models import UserGroup
+
+
+def session_for(dialect):
+    db = MagicMock()
+    db.get_bind.return_value.dialect = dialect
+    return db
+
+
+class TestBulkUpsert:
+
+    @pytest.mark.parametrize("dialect", [postgresql.dialect(), sqlite.dialect()])
+    def test_multi_row_insert_on_conflict_do_update(self, dialect):
+        rows = [{"group_id": 1, "user_id": user_id, "is_deleted": False, "created_by": 7} for user_id in (1, 2, 3)]
+        statement = BulkLinks.upsert(session_for(dialect), UserGroup, ["group_id", "user_id"], rows)
+        compiled = statement.compile(dialect=dialect)
+        sql = str(compiled)
+        assert sql.startswith("INSERT INTO users_groups (user_id, group_id, created_by, is_deleted) VALUES")
+        assert sql.count("INSERT") == 1 and len(compiled.params) == 12
+        assert "ON CONFLICT (group_id, user_id) DO UPDATE SET" in sql
+        assert "is_deleted = excluded.is_deleted" in sql and "created_by = excluded.created_by" in sql
+        assert "group_id = excluded" not in sql
+
+    def test_unsupported_dialect(self):
+        db = session_for(MagicMock())
+        db.get_bind.return_value.dialect.name = "mssql"
+        with pytest.raises(NotImplementedError):
+            BulkLinks.upsert(db, UserGroup, ["group_id", "user_id"], [{"group_id": 1, "user_id": 1}])
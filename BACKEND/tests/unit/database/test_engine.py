@@ -0,0 +1,121 @@
+import asyncio
+import pytest
+import pytest_asyncio
+from prometheus_client import REGISTRY
+from sqlalchemy import exc, func, select, text, update
+
+from app.config import Config
+from app.database.engine import (
+    build_async_engine, build_engines, build_session_factory, engine_options,
+    InstrumentedAsyncQueuePool, POOL_CHECKOUT_TIMEOUTS
+)
+from app.database.models import Base, Group
+
+
+class TestEngineOptions:
+
+    def test_file_database_uses_configured_pool(self):
+        options = engine_options("sqlite+aiosqlite:///./some.db", "primary")
+        assert options["poolclass"] is InstrumentedAsyncQueuePool
+        assert options["pool_size"] == Config.DATABASE_POOL_SIZE
+        assert options["max_overflow"] == Config.DATABASE_MAX_OVERFLOW
+        assert options["pool_timeout"] == Config.DATABASE_POOL_TIMEOUT
+        assert options["pool_recycle"] == Config.DATABASE_POOL_RECYCLE
+        assert options["pool_pre_ping"] == Config.DATABASE_POOL_PRE_PING
+        assert options["pool_logging_name"] == "primary"
+
+    def test_postgres_uses_configured_pool(self):
+        options = engine_options("postgresql+asyncpg://u:p@localhost:5432/db", "primary")
+        assert options["poolclass"] is InstrumentedAsyncQueuePool
+
+    def test_memory_sqlite_keeps_default_pool(self):
+        assert engine_options("sqlite+aiosqlite:///:memory:", "primary") == {}
+
+
+@pytest.mark.asyncio
+class TestInstrumentedPool:
+
+    async def test_pool_metrics_and_timeouts(self, tmp_path):
+        engine = build_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path}/pool.db",
+            pool_name="test_pool",
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.05,
+        )
+        before = POOL_CHECKOUT_TIMEOUTS.labels(pool="test_pool")._value.get()
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                assert REGISTRY.get_sample_value("db_pool_checked_out_connections", {"pool": "test_pool"}) == 1
+                assert REGISTRY.get_sample_value("db_pool_size", {"pool": "test_pool"}) == 1
+
+                with pytest.raises(exc.TimeoutError):
+                    async with engine.connect():
+                        pass
+
+            assert POOL_CHECKOUT_TIMEOUTS.labels(pool="test_pool")._value.get() == before + 1
+            assert REGISTRY.get_sample_value("db_pool_checked_out_connections", {"pool": "test_pool"}) == 0
+            assert REGISTRY.get_sample_value("db_pool_checkout_wait_seconds_count", {"pool": "test_pool"}) >= 2
+        finally:
+            await engine.dispose()
+
+
+@pytest.mark.asyncio
+class TestSQLiteProductionProfile:
+
+    @pytest_asyncio.fixture
+    async def engines(self, tmp_path):
+        engine, writer_engine = build_engines(
+            f"sqlite+aiosqlite:///{tmp_path}/profile.db", sqlite_production=True, pool_name="test_profile"
+        )
+        async with writer_engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        yield engine, writer_engine
+        await engine.dispose()
+        await writer_engine.dispose()
+
+    async def test_disabled_profile_uses_single_engine(self, tmp_path):
+        engine, writer_engine = build_engines(f"sqlite+aiosqlite:///{tmp_path}/plain.db", sqlite_production=False)
+        assert engine is writer_engine
+        await engine.dispose()
+
+    async def test_pragmas_applied_on_every_connection(self, engines):
+        for eng in engines:
+            async with eng.connect() as conn:
+                assert (await conn.execute(text("PRAGMA journal_mode"))).scalar() == "wal"
+                assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1  # NORMAL
+                assert (await conn.execute(text("PRAGMA busy_timeout"))).scalar() == Config.SQLITE_PRAGMAS["busy_timeout"]
+                assert (await conn.execute(text("PRAGMA temp_store"))).scalar() == 2  # MEMORY
+
+    async def test_writer_is_single_connection(self, engines):
+        _, writer_engine = engines
+        assert writer_engine.sync_engine.pool.size() == 1
+        assert writer_engine.sync_engine.pool._max_overflow == 0
+
+    async def test_session_routes_writes_to_writer(self, engines):
+        engine, writer_engine = engines
+        SessionLocal = build_session_factory(engine, writer_engine)
+        async with SessionLocal() as db:
+            sync_session = db.sync_session
+            await db.execute(select(Group))
+            assert sync_session.get_bind(clause=select(Group)) is engine.sync_engine
+            await db.execute(update(Group).where(Group.id == -1).values(name="x"))
+            # once the transaction has written, reads stay on the writer
+            assert sync_session.get_bind(clause=select(Group)) is writer_engine.sync_engine
+            await db.rollback()
+            assert sync_session.get_bind(clause=select(Group)) is engine.sync_engine
+
+    async def test_concurrent_writes_do_not_lock(self, engines):
+        engine, writer_engine = engines
+        SessionLocal = build_session_factory(engine, writer_engine)
+
+        async def create_group(i: int):
+            async with SessionLocal() as db:
+                db.add(Group(name=f"group_{i}"))
+                await db.commit()
+
+        await asyncio.gather(*(create_group(i) for i in range(25)))
+        async with SessionLocal() as db:
+            count = (await db.execute(select(func.count()).select_from(Group))).scalar_one()
+        assert count == 25
@@ -0,0 +1,90 @@
+import pytest
+from contextlib import contextmanager
+from sqlalchemy import event, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.schema import CreateIndex
+
+from app.database.services import PermissionService, RoleService, GroupService, UserService
+from app.database.services.refresh_token_service import RefreshTokenService
+from app.database.models import Role, User
+from app.database.models.user_search import USER_SEARCH_POSTGRES_PREFIX_DDL
+
+
+@contextmanager
+def captured_statements(engine):
+    """Collects (statement, parameters) for everything executed on the engine."""
+    statements = []
+
+    def _capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _capture)
+
+
+async def query_plan(db_session, statement: str, parameters) -> str:
+    connection = await db_session.connection()
+    rows = await connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return "\n".join(row[-1] for row in rows)
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("setup_database")
+class TestHotQueriesUseIndexes:
+
+    @pytest.mark.parametrize("call, index", [
+        (lambda db: PermissionService.get_all_roles_for_permission(db, 1), "ix_roles_permissions_permission_id"),
+        (lambda db: RoleService.get_all_groups_for_role(db, 1), "ix_groups_roles_role_id"),
+        (lambda db: GroupService.get_all_users_for_group(db, 1), "ix_users_groups_group_id"),
+        (lambda db: RoleService.get_all_users_for_role(db, 1), "ix_users_roles_role_id"),
+        (lambda db: RoleService.get_all_roles(db), "ix_roles_active_created"),
+        (lambda db: GroupService.get_all_groups(db), "ix_groups_active_created"),
+        (lambda db: PermissionService.get_all_permissions(db), "ix_permissions_active_created"),
+        (lambda db: UserService.get_all_users(db), "ix_users_status_created"),
+        (lambda db: RefreshTokenService.revoke_user_tokens(db, 1), "ix_refresh_tokens_user_id_revoked"),
+        (lambda db: UserService.search_users(db, "adm"), "ix_users_username_prefix"),
+        (lambda db: UserService.search_users(db, "adm"), "ix_users_email_prefix"),
+    ])
+    async def test_query_uses_index(self, db_session, call, index):
+        with captured_statements(db_session.get_bind()) as statements:
+            await call(db_session)
+        plans = [await query_plan(db_session, statement, parameters) for statement, parameters in statements]
+        await db_session.rollback()
+        assert any(f"INDEX {index}" in plan for plan in plans), "\n\n".join(plans)
+
+    async def test_substring_search_uses_fts(self, db_session):
+        with captured_statements(db_session.get_bind()) as statements:
+            await UserService.search_users(db_session, "dmi")
+        plans = [await query_plan(db_session, statement, parameters) for statement, parameters in statements]
+        await db_session.rollback()
+        assert any("SCAN users_fts VIRTUAL TABLE" in plan for plan in plans), "\n\n".join(plans)
+        assert not any("SCAN users\n" in plan + "\n" for plan in plans), "\n\n".join(plans)
+
+
+class TestPartialIndexDDL:
+
+    @pytest.mark.parametrize("dialect, predicate", [
+        (postgresql.dialect(), "WHERE is_deleted = false"),
+        (sqlite.dialect(), "WHERE is_deleted = 0"),
+    ])
+    def test_not_deleted_predicate_per_dialect(self, dialect, predicate):
+        index = next(i for i in Role.__table__.indexes if i.name == "ix_roles_active_created")
+        assert str(CreateIndex(index).compile(dialect=dialect)).endswith(predicate)
+
+
+class TestPrefixSearchSQL:
+
+    def test_postgres_matches_and_orders_by_the_collated_index_expression(self):
+        key = UserService._prefix_key(User.username, "postgresql")
+        query = select(User.id).where(UserService._prefix_match(key, "adm", "postgresql")).order_by(key)
+        sql = str(query.compile(dialect=postgresql.dialect()))
+        assert '(lower(users.username) COLLATE "C") LIKE' in sql
+        assert sql.endswith('ORDER BY lower(users.username) COLLATE "C"')
+        assert '(lower(username) COLLATE "C")' in USER_SEARCH_POSTGRES_PREFIX_DDL[0]
+
+    def test_sqlite_keeps_the_binary_collation(self):
+        key = UserService._prefix_key(User.username, "sqlite")
+        assert str(key.compile(dialect=sqlite.dialect())) == "lower(users.username)"
@@ -0,0 +1,149 @@
+import pytest
+import pytest_asyncio
+import os
+from datetime import datetime, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.models import Group, Role, User
+from app.database.pagination import Keyset, KeysetCursor
+from app.database.services import GroupService, RoleService, UserService
+
+
+class TestKeysetCursor:
+
+    def test_roundtrip_keeps_datetime(self):
+        created = datetime(2025, 8, 21, 15, 24, 55, 123, tzinfo=timezone.utc)
+        cursor = Keyset.decode(Keyset.encode("created", "desc", created, 42))
+        assert cursor == KeysetCursor("created", "desc", created, 42)
+
+    def test_cursor_is_url_safe(self):
+        cursor = Keyset.encode("name", "asc", "a/b+c?d", 1)
+        assert all(c.isalnum() or c in "-_" for c in cursor)
+
+    @pytest.mark.parametrize("cursor", ["garbage", "", Keyset.encode("name", "asc", "x", 1)[:-3], "W10"])
+    def test_invalid_cursor_raises_value_error(self, cursor):
+        with pytest.raises(ValueError):
+            Keyset.decode(cursor)
+
+    @pytest.mark.parametrize("column, value, accepted", [
+        (Role.created, datetime(2025, 8, 21), True),
+        (Role.created, "2025-08-21", False),
+        (Role.created, None, False),
+        (Role.name, "r", True),
+        (Role.name, [1], False),
+        (Role.description, None, True),
+        (Role.id, 3, True),
+        (Role.id, True, False),
+        (Role.id, 2**63, False),
+        (Role.is_active, False, True),
+        (Role.is_active, 0, False),
+    ])
+    def test_accepts_checks_value_type(self, column, value, accepted):
+        assert Keyset.accepts(column, value) is accepted
+
+    def test_next_cursor_only_for_full_pages(self):
+        role = Role(id=7, name="r")
+        assert Keyset.next_cursor([role], 2, "name", "asc") is None
+        assert Keyset.decode(Keyset.next_cursor([role, role], 2, "name", "asc")) == KeysetCursor("name", "asc", "r", 7)
+
+
+@pytest.mark.asyncio
+class TestKeysetServices:
+
+    @pytest_asyncio.fixture
+    async def roles(self, db_session: AsyncSession):
+        # Inserted in one statement, so they share the server-default `created` timestamp
+        roles = [Role(name=f"keyset_role_{os.urandom(4).hex()}") for _ in range(7)]
+        db_session.add_all(roles)
+        await db_session.commit()
+        yield roles
+        for role in roles:
+            role.is_deleted = True
+        await db_session.commit()
+
+    @pytest_asyncio.fixture
+    async def users(self, db_session: AsyncSession):
+        suffix = os.urandom(4).hex()
+        users = [
+            User(firstname="k", lastname="s", username=f"keyset_{i}_{suffix}", email=f"keyset_{i}_{suffix}@example.com", password="x")
+            for i in range(7)
+        ]
+        db_session.add_all(users)
+        await db_session.commit()
+        yield users
+        for user in users:
+            user.is_deleted = True
+        await db_session.commit()
+
+    async def walk_roles(self, db_session, sort_by, sort_order, limit=3):
+        seen, cursor = [], None
+        for _ in range(1000):  # a broken seek would loop forever
+            page = await RoleService.get_all_roles(
+                db_session, limit=limit, sort_by=sort_by, sort_order=sort_order, cursor=cursor
+            )
+            seen.extend(r.id for r in page)
+            next_cursor = Keyset.next_cursor(page, limit, sort_by, sort_order)
+            if next_cursor is None:
+                return seen
+            cursor = Keyset.decode(next_cursor)
+        pytest.fail("cursor walk did not terminate")
+
+    @pytest.mark.parametrize("sort_by, sort_order", [
+        ("created", "desc"), ("created", "asc"), ("name", "asc"), ("name", "desc"), ("id", "desc"),
+    ])
+    async def test_cursor_walk_matches_offset_order(self, db_session, roles, sort_by, sort_order):
+        expected = [
+            r.id for r in await RoleService.get_all_roles(db_session, limit=1000, sort_by=sort_by, sort_order=sort_order)
+        ]
+        walked = await self.walk_roles(db_session, sort_by, sort_order)
+        assert walked == expected
+        assert {r.id for r in roles} <= set(walked)
+
+    @pytest.mark.parametrize("sort_order", ["asc", "desc"])
+    async def test_cursor_walk_over_nullable_sort(self, db_session, sort_order):
+        suffix = os.urandom(4).hex()
+        groups = [
+            Group(name=f"keyset_group_{i}_{suffix}", description=None if i % 2 else f"d{i}")
+            for i in range(6)
+        ]
+        db_session.add_all(groups)
+        await db_session.commit()
+        try:
+            expected = [
+                g.id for g in await GroupService.get_all_groups(db_session, limit=1000, sort_by="description", sort_order=sort_order)
+            ]
+            seen, cursor = [], None
+            for _ in range(1000):
+                page = await GroupService.get_all_groups(
+                    db_session, limit=2, sort_by="description", sort_order=sort_order, cursor=cursor
+                )
+                seen.extend(g.id for g in page)
+                next_cursor = Keyset.next_cursor(page, 2, "description", sort_order)
+                if next_cursor is None:
+                    break
+                cursor = Keyset.decode(next_cursor)
+            assert seen == expected
+            assert {g.id for g in groups} <= set(seen)
+            # NULLs trail in both directions
+            by_id = {g.id: g for g in groups}
+            assert [by_id[i].description is None for i in seen if i in by_id] == [False] * 3 + [True] * 3
+        finally:
+            for group in groups:
+                group.is_deleted = True
+            await db_session.commit()
+
+    async def test_user_cursor_walk(self, db_session, users):
+        seen, cursor = [], None
+        for _ in range(1000):
+            total, page = await UserService.get_all_users(db_session, limit=3, sort_by="created", cursor=cursor)
+            seen.extend(u.id for u in page)
+            next_cursor = Keyset.next_cursor(page, 3, "created", "desc")
+            if next_cursor is None:
+                break
+            cursor = Keyset.decode(next_cursor)
+        assert len(seen) == len(set(seen)) == total
+        assert {u.id for u in users} <= set(seen)
+
+    async def test_user_sort_by_status(self, db_session, users):
+        total, page = await UserService.get_all_users(db_session, limit=3, sort_by="status")
+        assert len(page) == 3
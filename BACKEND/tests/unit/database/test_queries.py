@@ -0,0 +1,74 @@
+import pytest
+import pytest_asyncio
+from prometheus_client import REGISTRY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import Config
+from app.database.engine import build_async_engine
+from app.database.models import Base, User, Role, Permission, UserRole, RolePermission
+from app.database.queries import HotQueries
+
+
+def cache_lookups(result: str) -> float:
+    return REGISTRY.get_sample_value(
+        "db_statement_cache_lookups_total", {"engine": "test_queries", "result": result}
+    ) or 0
+
+
+@pytest.mark.asyncio
+class TestHotQueries:
+
+    @pytest_asyncio.fixture
+    async def session(self, tmp_path):
+        engine = build_async_engine(f"sqlite+aiosqlite:///{tmp_path}/queries.db", pool_name="test_queries")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            user = User(firstname="a", lastname="b", username="hot", email="hot@example.com", password="x")
+            role = Role(name="hot_role")
+            permission = Permission(name="hot_permission")
+            session.add_all([user, role, permission])
+            await session.flush()
+            session.add_all([
+                UserRole(user_id=user.id, role_id=role.id),
+                RolePermission(role_id=role.id, permission_id=permission.id),
+            ])
+            await session.commit()
+            yield session
+        await engine.dispose()
+
+    async def test_statements_return_expected_rows(self, session):
+        user = (await session.execute(HotQueries.user_by_username("hot"))).scalar_one()
+        assert (await session.execute(HotQueries.user_by_id(user.id))).scalar_one().username == "hot"
+        roles = (await session.execute(HotQueries.direct_roles_for_user(user.id))).scalars().all()
+        assert [r.name for r in roles] == ["hot_role"]
+        assert (await session.execute(HotQueries.group_roles_for_user(user.id))).scalars().all() == []
+        permissions = (await session.execute(HotQueries.permissions_for_roles([r.id for r in roles]))).scalars().all()
+        assert [p.name for p in permissions] == ["hot_permission"]
+        assert (await session.execute(HotQueries.refresh_token_by_hash("missing", user.id))).scalar_one_or_none() is None
+
+    async def test_bound_values_are_not_cached(self, session):
+        assert (await session.execute(HotQueries.user_by_username("hot"))).scalar_one_or_none() is not None
+        assert (await session.execute(HotQueries.user_by_username("other"))).scalar_one_or_none() is None
+
+    async def test_repeated_statement_hits_compiled_cache(self, session):
+        await session.execute(HotQueries.user_by_username("warmup"))
+        hits_before = cache_lookups("hit")
+        misses_before = cache_lookups("miss")
+        for name in ("a", "b", "c"):
+            await session.execute(HotQueries.user_by_username(name))
+        assert cache_lookups("hit") == hits_before + 3
+        assert cache_lookups("miss") == misses_before
+
+
+class TestPreparedStatementCache:
+
+    def test_asyncpg_url_gets_prepared_statement_cache_size(self):
+        engine = build_async_engine("postgresql+asyncpg://u:p@localhost:5432/db", pool_name="test_asyncpg")
+        assert engine.url.query["prepared_statement_cache_size"] == str(Config.DATABASE_PREPARED_STATEMENT_CACHE_SIZE)
+
+    def test_explicit_prepared_statement_cache_size_is_kept(self):
+        engine = build_async_engine(
+            "postgresql+asyncpg://u:p@localhost:5432/db?prepared_statement_cache_size=10", pool_name="test_asyncpg"
+        )
+        assert engine.url.query["prepared_statement_cache_size"] == "10"
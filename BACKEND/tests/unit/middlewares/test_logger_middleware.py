@@ -1,7 +1,7 @@
 import pytest
 from fastapi import FastAPI, HTTPException
 from fastapi.testclient import TestClient
-from unittest.mock import patch
+from unittest.mock import patch, ANY
 
 from app.middlewares.logger_middlewares import LogCorrelationIdMiddleware
 from app.utils.logger import log 
@@ -36,7 +36,7 @@ class TestLogCorrelationIdMiddleware:
 
             # Confirm "request_received" and "request_completed" logs emitted
             mock_info.assert_any_call("request_received")
-            mock_info.assert_any_call("request_completed", status_code=200)
+            mock_info.assert_any_call("request_completed", status_code=200, duration_ms=ANY)
 
     def test_exception_flow(self, test_app):
         client = TestClient(test_app, raise_server_exceptions=False)
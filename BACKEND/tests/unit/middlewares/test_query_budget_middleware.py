@@ -0,0 +1,80 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from unittest.mock import patch
+
+from app.config import Config
+from app.database.engine import build_async_engine, track_queries
+from app.middlewares.query_budget import QueryBudgetMiddleware, QUERY_BUDGET_EXCEEDED
+from app.utils.logger import log
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(Config, "QUERY_BUDGETS", {"run_queries": 2})
+    monkeypatch.setattr(Config, "QUERY_BUDGET_MODE", "log")
+    app = FastAPI()
+    app.add_middleware(QueryBudgetMiddleware)
+
+    @app.get("/queries/{count}")
+    async def run_queries(count: int):
+        # Built per request: TestClient may run each request on a new event loop
+        engine = build_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.connect() as conn:
+            for i in range(count):
+                await conn.execute(text(f"SELECT {i}"))
+        await engine.dispose()
+        return {}
+
+    return TestClient(app)
+
+
+class TestQueryBudgetMiddleware:
+
+    def test_within_budget_is_silent(self, client):
+        before = QUERY_BUDGET_EXCEEDED.labels(route="run_queries")._value.get()
+        with patch.object(log, "warning") as mock_warning:
+            assert client.get("/queries/2").status_code == 200
+        mock_warning.assert_not_called()
+        assert QUERY_BUDGET_EXCEEDED.labels(route="run_queries")._value.get() == before
+
+    def test_queries_per_request_recorded(self, client):
+        before = REGISTRY.get_sample_value("db_queries_per_request_sum", {"route": "run_queries"}) or 0
+        client.get("/queries/4")
+        assert REGISTRY.get_sample_value("db_queries_per_request_sum", {"route": "run_queries"}) == before + 4
+
+    def test_over_budget_logs_statements_and_counts(self, client):
+        before = QUERY_BUDGET_EXCEEDED.labels(route="run_queries")._value.get()
+        with patch.object(log, "warning") as mock_warning:
+            assert client.get("/queries/3").status_code == 200
+        mock_warning.assert_called_once_with(
+            "Query budget exceeded",
+            route="run_queries",
+            queries=3,
+            budget=2,
+            statements=["SELECT 0", "SELECT 1", "SELECT 2"],
+        )
+        assert QUERY_BUDGET_EXCEEDED.labels(route="run_queries")._value.get() == before + 1
+
+    def test_off_mode_does_not_warn(self, client, monkeypatch):
+        monkeypatch.setattr(Config, "QUERY_BUDGET_MODE", "off")
+        with patch.object(log, "warning") as mock_warning:
+            assert client.get("/queries/5").status_code == 200
+        mock_warning.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_track_queries_nests_and_keeps_first_statements():
+    engine = build_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        with track_queries(keep=1) as outer:
+            async with engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+                with track_queries() as inner:
+                    await conn.execute(text("SELECT 2"))
+        assert (outer.count, outer.statements) == (2, ["SELECT 1"])
+        assert (inner.count, inner.statements) == (1, ["SELECT 2"])
+    finally:
+        await engine.dispose()
@@ -0,0 +1,145 @@
+import asyncio
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.auth.jwt import JWTManager
+from app.config import Config
+from app.database.models import Base, ReadPin
+from app.middlewares import read_your_writes
+from app.middlewares.read_your_writes import (
+    DatabasePinBackend, MemoryPinBackend, ReadYourWritesMiddleware, load_pin_backend,
+)
+from app.utils.response_cache import MemoryCacheBackend, response_cache
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = MemoryPinBackend()
+    monkeypatch.setattr(read_your_writes, "read_pins", backend)
+    return backend
+
+
+@pytest.fixture
+def client(monkeypatch, backend):
+    monkeypatch.setattr(Config, "DATABASE_READ_REPLICA_URLS", ["sqlite+aiosqlite:///./replica.db"])
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware)
+
+    @app.get("/items")
+    async def list_items():
+        return []
+
+    @app.post("/items")
+    async def create_item():
+        return {"id": 1}
+
+    @app.delete("/items")
+    async def delete_item():
+        raise HTTPException(status_code=404, detail="Not found")
+
+    return TestClient(app, headers={"Authorization": f"Bearer {JWTManager.encode_access_token(data={'sub': 'alice'})}"})
+
+
+def pinned(backend, subject: str = "alice") -> bool:
+    return asyncio.run(backend.pinned(subject))
+
+
+class TestReadYourWritesMiddleware:
+
+    def test_successful_write_pins_user_to_primary(self, client, backend):
+        response = client.post("/items")
+        assert response.status_code == 200
+        assert "set-cookie" not in response.headers
+        assert pinned(backend)
+        assert backend.pins["alice"] <= backend.clock() + Config.READ_YOUR_WRITES_SECONDS
+
+    def test_reads_and_failed_writes_do_not_pin(self, client, backend):
+        client.get("/items")
+        client.delete("/items")
+        assert not pinned(backend)
+
+    def test_anonymous_or_invalid_token_does_not_pin(self, client, backend):
+        client.post("/items", headers={"Authorization": ""})
+        client.post("/items", headers={"Authorization": "Bearer not-a-token"})
+        assert backend.pins == {}
+
+    def test_no_pin_without_replicas(self, client, backend, monkeypatch):
+        monkeypatch.setattr(Config, "DATABASE_READ_REPLICA_URLS", [])
+        client.post("/items")
+        assert not pinned(backend)
+
+    def test_pins_survive_response_cache_pressure(self, client, backend, monkeypatch):
+        cache = MemoryCacheBackend(max_entries=1)
+        monkeypatch.setattr(response_cache, "backend", cache)
+        client.post("/items")
+        for i in range(10):
+            asyncio.run(cache.set(f"response:{i}", b"[]"))
+        assert pinned(backend)
+
+
+class TestPinBackends:
+
+    def test_memory_pins_expire_and_are_swept(self):
+        clock = FakeClock()
+        backend = MemoryPinBackend(sweep_interval=10, clock=clock)
+        asyncio.run(backend.pin("alice", 5))
+        assert asyncio.run(backend.pinned("alice"))
+        assert not asyncio.run(backend.pinned("bob"))
+        clock.now = 5
+        assert not asyncio.run(backend.pinned("alice"))
+        clock.now = 10
+        asyncio.run(backend.pin("bob", 5))
+        assert set(backend.pins) == {"bob"}
+
+    def test_database_pins_are_shared(self, tmp_path):
+        async def scenario():
+            engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pins.db'}")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+            clock = FakeClock(1_000.0)
+            # two backends over one table stand for two workers
+            first = DatabasePinBackend(factory, sweep_interval=100, clock=clock)
+            second = DatabasePinBackend(factory, sweep_interval=100, clock=clock)
+            try:
+                await first.pin("alice", 5)
+                assert await second.pinned("alice")
+                clock.now += 3
+                await second.pin("alice", 5)
+                clock.now += 3
+                assert await first.pinned("alice")
+                clock.now += 100
+                assert not await first.pinned("alice")
+                await first.pin("bob", 5)
+                async with factory() as db:
+                    assert (await db.execute(select(ReadPin.subject))).scalars().all() == ["bob"]
+            finally:
+                await engine.dispose()
+
+        asyncio.run(scenario())
+
+    @pytest.mark.parametrize("replicas, workers, spec, refused", [
+        (["sqlite+aiosqlite:///./replica.db"], 4, "memory", True),
+        (["sqlite+aiosqlite:///./replica.db"], 1, "memory", False),
+        ([], 4, "memory", False),
+        (["sqlite+aiosqlite:///./replica.db"], 4, "database", False),
+    ])
+    def test_memory_backend_refused_for_several_workers_with_replicas(self, monkeypatch, replicas, workers, spec, refused):
+        monkeypatch.setattr(Config, "DATABASE_READ_REPLICA_URLS", replicas)
+        monkeypatch.setattr(Config, "WEB_CONCURRENCY", workers)
+        if refused:
+            with pytest.raises(RuntimeError, match="shared backend"):
+                load_pin_backend(spec)
+        else:
+            assert isinstance(load_pin_backend(spec), MemoryPinBackend if spec == "memory" else DatabasePinBackend)
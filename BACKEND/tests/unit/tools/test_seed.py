@@ -0,0 +1,68 @@
+import argparse
+import random
+from collections import Counter
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.auth.password_hash import PasswordHasher
+from app.database.models import Base, Group, Permission, Role, RolePermission, User, UserGroup, UserRole
+from app.tools.seed import Picker, parse_range, seed
+
+
+def test_parse_range():
+    assert parse_range("1-3") == (1, 3)
+    assert parse_range("2") == (2, 2)
+    for spec in ("3-1", "a-b", "-1"):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_range(spec)
+
+
+def test_picker_favours_first_ids_and_never_repeats():
+    picker = Picker(random.Random(1), range(10, 30), skew=1.5)
+    counts = Counter()
+    for _ in range(2000):
+        picked = picker.pick((2, 3))
+        assert 2 <= len(picked) <= 3
+        counts.update(picked)
+    assert counts.most_common(1)[0][0] == 10
+    assert counts[10] > 5 * counts[29]
+
+
+@pytest.mark.asyncio
+class TestSeed:
+
+    @pytest_asyncio.fixture
+    async def engine(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/seed.db")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        yield engine
+        await engine.dispose()
+
+    async def test_generates_dataset(self, engine):
+        summary = await seed(
+            users=300, roles=10, groups=5, permissions=8, roles_per_user=(1, 2), groups_per_user=(0, 1),
+            password="secret", chunk=64, rng=random.Random(1), engine=engine,
+        )
+        assert summary["users"] == {"rows": 300, "first_id": 1}
+        async with engine.connect() as conn:
+            async def count(model):
+                return (await conn.execute(select(func.count()).select_from(model))).scalar()
+
+            assert [await count(model) for model in (User, Role, Group, Permission)] == [300, 10, 5, 8]
+            assert 300 <= await count(UserRole) <= 600
+            assert await count(UserGroup) <= 300
+            assert await count(RolePermission) == summary["roles_permissions"]["rows"]
+            hashes = (await conn.execute(select(User.password).distinct())).scalars().all()
+            assert len(hashes) == 1 and PasswordHasher.verify_password("secret", hashes[0])
+
+    async def test_appends_after_existing_rows(self, engine):
+        await seed(users=5, roles=2, groups=2, permissions=2, prefix="first", engine=engine)
+        summary = await seed(users=5, roles=2, groups=2, permissions=2, prefix="second", engine=engine)
+        assert summary["users"]["first_id"] == 6
+        async with engine.connect() as conn:
+            username = (await conn.execute(select(User.username).where(User.id == 6))).scalar()
+        assert username == "second_0"
@@ -0,0 +1,113 @@
+import pytest
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database.models import Base, InvalidationLog
+from app.utils.invalidation import (
+    EntityChanged, InvalidationBackend, InvalidationBus, LinkChanged, LocalBackend, PollingBackend,
+)
+
+
+class RecordingBackend(InvalidationBackend):
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, payload: str) -> None:
+        self.sent.append(payload)
+
+
+def recorder(bus: InvalidationBus) -> list:
+    events = []
+
+    @bus.subscribe
+    async def record(event):
+        events.append(event)
+
+    return events
+
+
+@pytest.mark.asyncio
+class TestInvalidationBus:
+
+    async def test_publish_delivers_locally_then_sends_once_started(self):
+        backend = RecordingBackend()
+        bus = InvalidationBus(backend, origin="a")
+        events = recorder(bus)
+        await bus.publish(EntityChanged("roles", 1))
+        assert events == [EntityChanged("roles", 1)]
+        assert backend.sent == []
+
+        await bus.start()
+        await bus.publish(LinkChanged("users_roles", right_id=3))
+        assert events[-1] == LinkChanged("users_roles", None, 3)
+        assert InvalidationBus.decode(backend.sent[0]) == ("a", LinkChanged("users_roles", None, 3))
+
+    async def test_remote_events_skip_own_origin(self):
+        bus = InvalidationBus(LocalBackend(), origin="a")
+        other = InvalidationBus(LocalBackend(), origin="b")
+        events = recorder(bus)
+        await bus._receive(bus.encode(EntityChanged("groups", 2)))
+        await bus._receive(other.encode(EntityChanged("groups", 2)))
+        await bus._receive("not json")
+        assert events == [EntityChanged("groups", 2)]
+
+    async def test_failing_handler_does_not_stop_others(self):
+        bus = InvalidationBus(LocalBackend())
+
+        @bus.subscribe
+        async def broken(event):
+            raise RuntimeError("boom")
+
+        events = recorder(bus)
+        await bus.publish(EntityChanged("users", 1))
+        assert events == [EntityChanged("users", 1)]
+
+    async def test_backend_that_cannot_start_keeps_events_local(self):
+        class Unavailable(RecordingBackend):
+            async def start(self, receive):
+                raise RuntimeError("no such table: invalidation_log")
+
+        backend = Unavailable()
+        bus = InvalidationBus(backend)
+        await bus.start()
+        await bus.publish(EntityChanged("roles", 1))
+        assert not bus.started
+        assert backend.sent == []
+
+
+@pytest.mark.asyncio
+class TestPollingBackend:
+
+    async def test_workers_see_each_others_events(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'bus.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        # two buses over one database stand for two workers; poll() is driven by hand
+        first_backend = PollingBackend(engine, engine, interval=3600, retention=60)
+        second_backend = PollingBackend(engine, engine, interval=3600, retention=60)
+        first, second = InvalidationBus(first_backend), InvalidationBus(second_backend)
+        first_events, second_events = recorder(first), recorder(second)
+        try:
+            await first.start()
+            await second.start()
+            await first.publish(EntityChanged("permissions", 7))
+            await second.publish(LinkChanged("roles_permissions", 1, 7))
+            await first_backend.poll()
+            await second_backend.poll()
+            assert first_events == [EntityChanged("permissions", 7), LinkChanged("roles_permissions", 1, 7)]
+            assert second_events == [LinkChanged("roles_permissions", 1, 7), EntityChanged("permissions", 7)]
+
+            # pruned rows never hand their ids to new events
+            async with engine.begin() as conn:
+                await conn.execute(update(InvalidationLog).values(created=0))
+            first_backend.next_prune = 0
+            await first_backend.poll()
+            await second.publish(EntityChanged("permissions", 8))
+            await first_backend.poll()
+            assert first_events[-1] == EntityChanged("permissions", 8)
+            async with engine.connect() as conn:
+                assert (await conn.execute(select(func.count()).select_from(InvalidationLog))).scalar() == 1
+        finally:
+            await first.stop()
+            await second.stop()
+            await engine.dispose()
@@ -0,0 +1,51 @@
+import pytest
+import structlog
+
+from app.utils.log_sampling import LogSampler, LOG_EVENTS_SUPPRESSED
+
+
+def suppressed_count(event: str) -> float:
+    return LOG_EVENTS_SUPPRESSED.labels(event=event)._value.get()
+
+
+class TestLogSampler:
+
+    @pytest.fixture
+    def sampler(self):
+        # rng always returns 0.5 so a rate of 0.1 drops and 0.9 keeps
+        return LogSampler(
+            rates={"request_completed": 0.1, "hot_event": 0.9, "muted_event": 0.0},
+            slow_request_ms=1000,
+            rng=lambda: 0.5,
+        )
+
+    def test_unlisted_event_is_kept(self, sampler):
+        event = {"event": "User created", "level": "info"}
+        assert sampler(None, "info", event) is event
+
+    def test_event_sampled_out_and_counted(self, sampler):
+        before = suppressed_count("request_completed")
+        with pytest.raises(structlog.DropEvent):
+            sampler(None, "info", {"event": "request_completed", "level": "info", "status_code": 200, "duration_ms": 3})
+        assert suppressed_count("request_completed") == before + 1
+
+    def test_event_kept_within_rate(self, sampler):
+        event = {"event": "hot_event", "level": "info"}
+        assert sampler(None, "info", event) is event
+
+    def test_zero_rate_drops_everything(self, sampler):
+        with pytest.raises(structlog.DropEvent):
+            sampler(None, "info", {"event": "muted_event", "level": "info"})
+
+    @pytest.mark.parametrize("level", ["warning", "error", "critical"])
+    def test_errors_always_kept(self, sampler, level):
+        event = {"event": "muted_event", "level": level}
+        assert sampler(None, level, event) is event
+
+    def test_slow_request_always_kept(self, sampler):
+        event = {"event": "request_completed", "level": "info", "status_code": 200, "duration_ms": 1500}
+        assert sampler(None, "info", event) is event
+
+    def test_server_error_always_kept(self, sampler):
+        event = {"event": "request_completed", "level": "info", "status_code": 503, "duration_ms": 2}
+        assert sampler(None, "info", event) is event
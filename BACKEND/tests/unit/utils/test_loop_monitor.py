@@ -0,0 +1,52 @@
+import asyncio
+import time
+import pytest
+import structlog
+from prometheus_client import REGISTRY
+from unittest.mock import ANY, patch
+
+from app.utils.logger import log
+from app.utils.loop_monitor import LoopMonitor
+
+
+def blocking_handler():
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+class TestLoopMonitor:
+
+    async def test_reports_blocking_call_with_correlation_id(self):
+        monitor = LoopMonitor(interval=0.02, threshold=0.1)
+        monitor.start()
+
+        async def request():
+            structlog.contextvars.bind_contextvars(correlation_id="abc-123", path="/slow")
+            blocking_handler()
+
+        try:
+            await asyncio.sleep(0.05)
+            with patch.object(log, "warning") as mock_warning:
+                await asyncio.get_running_loop().create_task(request())
+                await asyncio.sleep(0.05)
+        finally:
+            await monitor.stop()
+
+        mock_warning.assert_called_once_with(
+            "Event loop blocked", blocked_ms=ANY, task=ANY, stack=ANY, correlation_id="abc-123", path="/slow",
+        )
+        kwargs = mock_warning.call_args.kwargs
+        assert "blocking_handler" in kwargs["stack"]
+        assert kwargs["blocked_ms"] >= 100
+
+    async def test_records_lag_and_restores_task_factory(self):
+        before = REGISTRY.get_sample_value("event_loop_lag_seconds_count") or 0
+        loop = asyncio.get_running_loop()
+        monitor = LoopMonitor(interval=0.01, threshold=1)
+        monitor.start()
+        with patch.object(log, "warning") as mock_warning:
+            await asyncio.sleep(0.1)
+        await monitor.stop()
+        assert REGISTRY.get_sample_value("event_loop_lag_seconds_count") > before
+        mock_warning.assert_not_called()
+        assert loop.get_task_factory() is None
@@ -0,0 +1,110 @@
+import os
+import pytest
+import pytest_asyncio
+from prometheus_client import REGISTRY
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database.engine import build_async_engine
+from app.utils import monitoring
+from app.utils.monitoring import fingerprint, normalize_statement
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+class TestNormalizeStatement:
+
+    def test_literals_and_parameters(self):
+        assert normalize_statement("SELECT * FROM users WHERE id = 5 AND name = 'o''neil'") == (
+            "SELECT * FROM users WHERE id = ? AND name = ?"
+        )
+        assert normalize_statement("SELECT * FROM users\n  WHERE id = $1 AND email = :email") == (
+            "SELECT * FROM users WHERE id = ? AND email = ?"
+        )
+
+    def test_lists_collapse(self):
+        assert normalize_statement("SELECT id FROM roles WHERE id IN (?, ?, ?)") == "SELECT id FROM roles WHERE id IN (?)"
+        assert normalize_statement("SELECT id FROM roles WHERE id IN (__[POSTCOMPILE_id_1])") == (
+            "SELECT id FROM roles WHERE id IN ?"
+        )
+        assert normalize_statement("INSERT INTO roles (name, id) VALUES (?, ?), (?, ?)") == (
+            "INSERT INTO roles (name, id) VALUES (?)"
+        )
+
+    def test_casts_are_kept(self):
+        assert normalize_statement("SELECT name::text FROM roles") == "SELECT name::text FROM roles"
+
+    def test_same_shape_same_fingerprint(self):
+        assert fingerprint("SELECT 1 FROM users WHERE id IN (1, 2)") == fingerprint("SELECT 7 FROM users WHERE id IN (3)")
+        assert fingerprint("SELECT 1 FROM users") != fingerprint("SELECT 1 FROM roles")
+
+
+class ReportService:
+    """Stands in for an app service: its frames count as the caller."""
+
+    @staticmethod
+    async def names(db: AsyncSession) -> list[str]:
+        return (await db.execute(text("SELECT 'a' UNION ALL SELECT 'b' UNION ALL SELECT 'c'"))).scalars().all()
+
+
+@pytest.mark.asyncio
+class TestDatabaseInstrumentation:
+
+    @pytest_asyncio.fixture
+    async def engine(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(monitoring, "CALLER_ROOTS", (os.path.dirname(__file__) + os.sep,))
+        engine = build_async_engine(f"sqlite+aiosqlite:///{tmp_path}/metrics.db", pool_name="test_monitoring")
+        yield engine
+        await engine.dispose()
+
+    async def test_query_latency_rows_and_caller(self, engine):
+        statement = "SELECT 'a' UNION ALL SELECT 'b' UNION ALL SELECT 'c'"
+        labels = {"fingerprint": fingerprint(statement), "caller": "ReportService.names"}
+        count = sample("db_query_duration_seconds_count", **labels)
+        rows = sample("db_query_rows_sum", fingerprint=labels["fingerprint"])
+        async with AsyncSession(engine) as db:
+            assert await ReportService.names(db) == ["a", "b", "c"]
+        assert sample("db_query_duration_seconds_count", **labels) == count + 1
+        assert sample("db_query_rows_sum", fingerprint=labels["fingerprint"]) == rows + 3
+        assert sample("db_statement_info", fingerprint=labels["fingerprint"], statement=normalize_statement(statement)) == 1
+
+    async def test_transaction_outcomes(self, engine):
+        labels = {"engine": "test_monitoring"}
+        commits = sample("db_transactions_total", outcome="commit", **labels)
+        rollbacks = sample("db_transactions_total", outcome="rollback", **labels)
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE notes (id INTEGER PRIMARY KEY)"))
+        with pytest.raises(RuntimeError):
+            async with engine.begin() as conn:
+                await conn.execute(text("INSERT INTO notes (id) VALUES (1)"))
+                raise RuntimeError("abort")
+        assert sample("db_transactions_total", outcome="commit", **labels) == commits + 1
+        assert sample("db_transactions_total", outcome="rollback", **labels) == rollbacks + 1
+        assert sample("db_transaction_duration_seconds_count", outcome="commit", **labels) >= 1
+
+    async def test_read_only_sessions_count_as_close(self, engine):
+        labels = {"engine": "test_monitoring"}
+        rollbacks = sample("db_transactions_total", outcome="rollback", **labels)
+        closes = sample("db_transactions_total", outcome="close", **labels)
+        for _ in range(3):
+            async with AsyncSession(engine) as db:
+                await db.execute(text("SELECT 1"))
+        async with AsyncSession(engine) as db:
+            await ReportService.names(db)
+            await db.execute(text("CREATE TABLE notes (id INTEGER PRIMARY KEY)"))
+        assert sample("db_transactions_total", outcome="close", **labels) == closes + 3
+        assert sample("db_transactions_total", outcome="rollback", **labels) == rollbacks + 1
+
+    @pytest.mark.parametrize("statement, wrote", [
+        ("SELECT 1", False),
+        ("  with recent AS (SELECT 1) SELECT * FROM recent", False),
+        ("(SELECT 1) UNION (SELECT 2)", False),
+        ("EXPLAIN QUERY PLAN SELECT 1", False),
+        ("INSERT INTO notes (id) VALUES (1)", True),
+        ("update notes SET id = 2", True),
+        ("CREATE TABLE notes (id INTEGER)", True),
+    ])
+    def test_textual_statements_that_write(self, statement, wrote):
+        assert monitoring.writes(statement, None) is wrote
@@ -0,0 +1,77 @@
+import asyncio
+import time
+import pytest
+from unittest.mock import patch
+
+from app.utils import profiler as profiler_module
+from app.utils.profiler import Profiler, frame_label
+
+
+def spin(seconds: float):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def busy_handler():
+    await asyncio.sleep(0.02)
+    spin(0.15)
+
+
+async def idle_handler():
+    await asyncio.sleep(1)
+
+
+def test_frame_label_is_relative_to_the_project():
+    label = frame_label(Profiler.profile.__code__)
+    assert label.startswith("Profiler.profile (app/utils/profiler.py:")
+
+
+@pytest.mark.asyncio
+class TestProfiler:
+
+    async def test_samples_loop_stacks_and_task_wall_time(self):
+        profiler = Profiler()
+        busy = asyncio.create_task(busy_handler())
+        idle = asyncio.create_task(idle_handler())
+        try:
+            profile = await profiler.profile(0.3, 0.005)
+        finally:
+            idle.cancel()
+        await busy
+
+        assert profile.samples > 10 and 0.25 <= profile.duration < 1
+        spinning = sum(count for stack, count in profile.stacks.items() if stack[-1].startswith("spin "))
+        assert spinning * profile.sample_seconds == pytest.approx(0.15, abs=0.08)
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in profile.collapsed().splitlines())
+
+        coroutines = {entry["coroutine"].split(" ")[0]: entry for entry in profile.coroutines()}
+        assert coroutines["idle_handler"]["tasks"] == 1
+        assert coroutines["idle_handler"]["wall_seconds"] == pytest.approx(profile.duration, rel=0.1)
+        assert coroutines["idle_handler"]["awaiting"][0]["frame"].startswith("sleep ")
+        # the task running the profile is left out
+        assert not any(name.startswith("TestProfiler") for name in coroutines)
+
+    async def test_speedscope_document(self):
+        profile = await Profiler().profile(0.05, 0.005)
+        document = profile.speedscope()
+        frames = document["shared"]["frames"]
+        assert [p["name"] for p in document["profiles"]] == ["Event loop thread", "Coroutines (wall time)"]
+        for sampled in document["profiles"]:
+            assert len(sampled["samples"]) == len(sampled["weights"])
+            assert all(0 <= index < len(frames) for stack in sampled["samples"] for index in stack)
+
+    async def test_one_profile_at_a_time(self):
+        profiler = Profiler()
+        running = asyncio.create_task(profiler.profile(0.05, 0.01))
+        await asyncio.sleep(0)
+        with pytest.raises(RuntimeError):
+            await profiler.profile(0.05, 0.01)
+        await running
+        assert not profiler.running
+
+    async def test_sampling_error_keeps_duration(self):
+        with patch.object(profiler_module.asyncio, "all_tasks", side_effect=RuntimeError("Set changed size during iteration")):
+            profile = await Profiler().profile(0.05, 0.005)
+        assert profile.samples == 0
+        assert profile.duration > 0
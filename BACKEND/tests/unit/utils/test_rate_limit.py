@@ -0,0 +1,203 @@
+import pytest
+from fastapi import Depends, FastAPI, Form, HTTPException
+from starlette.requests import Request
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.config import Config
+from app.database.models import Base, RateLimitBucket
+from app.utils.rate_limit import (
+    DatabaseRateLimitBackend, MemoryRateLimitBackend, RateLimiter, RATE_LIMIT_REJECTIONS, client_ip, form_field, parse_rate,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_parse_rate():
+    assert parse_rate("10/minute") == (10, 10 / 60)
+    assert parse_rate("3/hours") == (3, 3 / 3600)
+    assert parse_rate("") is None
+
+
+@pytest.mark.parametrize("trusted, forwarded, expected", [
+    (1, "6.6.6.6, 1.2.3.4", "1.2.3.4"),
+    (2, "6.6.6.6, 1.2.3.4, 10.0.0.2", "1.2.3.4"),
+    # fewer hops than trusted proxies: the request did not come through them
+    (2, "1.2.3.4", "10.0.0.1"),
+    (1, "", "10.0.0.1"),
+])
+def test_client_ip_takes_hop_added_by_trusted_proxy(monkeypatch, trusted, forwarded, expected):
+    monkeypatch.setattr(Config, "RATE_LIMIT_TRUST_FORWARDED_FOR", True)
+    monkeypatch.setattr(Config, "RATE_LIMIT_TRUSTED_PROXIES", trusted)
+    request = Request({
+        "type": "http", "headers": [(b"x-forwarded-for", forwarded.encode())], "client": ("10.0.0.1", 5000),
+    })
+    assert client_ip(request) == expected
+
+
+@pytest.mark.asyncio
+class TestMemoryRateLimitBackend:
+
+    async def test_bucket_drains_and_refills(self):
+        clock = FakeClock()
+        backend = MemoryRateLimitBackend(clock=clock)
+        for _ in range(3):
+            assert await backend.consume("k", capacity=3, rate=1.0) == 0
+        assert await backend.consume("k", capacity=3, rate=1.0) == pytest.approx(1.0)
+        clock.now = 0.5
+        assert await backend.consume("k", capacity=3, rate=1.0) == pytest.approx(0.5)
+        clock.now = 2.0
+        assert await backend.consume("k", capacity=3, rate=1.0) == 0
+        # other keys have their own bucket
+        assert await backend.consume("other", capacity=3, rate=1.0) == 0
+        assert await backend.peek("other", capacity=3, rate=1.0) == pytest.approx(2.0)
+        assert await backend.peek("unused", capacity=3, rate=1.0) == 3
+
+    async def test_sweep_drops_refilled_buckets(self):
+        clock = FakeClock()
+        backend = MemoryRateLimitBackend(sweep_interval=10, clock=clock)
+        await backend.consume("idle", capacity=2, rate=1.0)
+        await backend.consume("busy", capacity=100, rate=1.0)
+        for _ in range(50):
+            await backend.consume("busy", capacity=100, rate=1.0)
+        clock.now = 10
+        await backend.consume("new", capacity=2, rate=1.0)
+        assert set(backend.buckets) == {"busy", "new"}
+
+
+@pytest.mark.asyncio
+class TestDatabaseRateLimitBackend:
+
+    async def test_bucket_is_shared_and_atomic(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'limits.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        clock = FakeClock(1_000.0)
+        # two backends over one table stand for two workers
+        first = DatabaseRateLimitBackend(factory, sweep_interval=100, clock=clock)
+        second = DatabaseRateLimitBackend(factory, sweep_interval=100, clock=clock)
+        try:
+            assert await first.consume("k", capacity=2, rate=0.5) == 0
+            assert await second.consume("k", capacity=2, rate=0.5) == 0
+            assert await first.consume("k", capacity=2, rate=0.5) == pytest.approx(2.0)
+            clock.now += 2
+            assert await first.peek("k", capacity=2, rate=0.5) == pytest.approx(1.0)
+            assert await second.consume("k", capacity=2, rate=0.5) == 0
+            assert await second.peek("k", capacity=2, rate=0.5) == pytest.approx(0.0)
+            assert await second.peek("unused", capacity=2, rate=0.5) == 2
+
+            await first.consume("idle", capacity=2, rate=0.5)
+            clock.now += 100
+            await first.consume("fresh", capacity=2, rate=0.5)
+            async with factory() as db:
+                keys = set((await db.execute(select(RateLimitBucket.key))).scalars())
+            assert keys == {"fresh"}
+        finally:
+            await engine.dispose()
+
+
+@pytest.mark.asyncio
+class TestRateLimiter:
+
+    def build_app(self, limiter: RateLimiter) -> FastAPI:
+        app = FastAPI()
+        check = limiter.limit("login", per_ip="5/minute", per_identity="2/minute", identity=form_field("username"))
+
+        @app.post("/login", dependencies=[Depends(check)])
+        async def login(username: str = Form(...)):
+            return {"username": username}
+
+        return app
+
+    async def test_identity_bucket_returns_retry_after(self):
+        limiter = RateLimiter(MemoryRateLimitBackend())
+        before = RATE_LIMIT_REJECTIONS.labels(scope="login", kind="identity")._value.get()
+        async with AsyncClient(transport=ASGITransport(app=self.build_app(limiter)), base_url="http://test") as client:
+            for _ in range(2):
+                assert (await client.post("/login", data={"username": "Alice"})).status_code == 200
+            response = await client.post("/login", data={"username": "alice "})
+            assert response.status_code == 429
+            assert response.headers["Retry-After"] == "30"
+            # the body was still parsed for the endpoint of an allowed request
+            assert (await client.post("/login", data={"username": "bob"})).json() == {"username": "bob"}
+        assert RATE_LIMIT_REJECTIONS.labels(scope="login", kind="identity")._value.get() == before + 1
+
+    async def test_ip_bucket_covers_every_identity(self):
+        limiter = RateLimiter(MemoryRateLimitBackend())
+        async with AsyncClient(transport=ASGITransport(app=self.build_app(limiter)), base_url="http://test") as client:
+            statuses = [(await client.post("/login", data={"username": f"user{i}"})).status_code for i in range(6)]
+        assert statuses == [200] * 5 + [429]
+
+    async def test_long_identity_is_hashed_into_the_key(self, tmp_path):
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'limits.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+        limiter = RateLimiter(DatabaseRateLimitBackend(factory))
+        username = "u" * 5000
+        try:
+            async with AsyncClient(transport=ASGITransport(app=self.build_app(limiter)), base_url="http://test") as client:
+                statuses = [(await client.post("/login", data={"username": username})).status_code for _ in range(3)]
+            assert statuses == [200, 200, 429]
+            async with factory() as db:
+                keys = (await db.execute(select(RateLimitBucket.key))).scalars().all()
+            assert len(keys) == 2
+            assert all(len(key) <= RateLimitBucket.key.type.length and username not in key for key in keys)
+        finally:
+            await engine.dispose()
+
+    def build_login_app(self, limiter: RateLimiter) -> FastAPI:
+        app = FastAPI()
+        check = limiter.limit(
+            "login", per_ip="5/minute", per_identity="2/minute", identity=form_field("username"),
+            identity_failure_status=401, known_client_seconds=3600,
+        )
+
+        @app.post("/login", dependencies=[Depends(check)])
+        async def login(username: str = Form(...), password: str = Form(...)):
+            if password != "right":
+                raise HTTPException(status_code=401, detail="Invalid credentials.")
+            return {"username": username}
+
+        return app
+
+    async def test_identity_bucket_only_charged_on_failure(self):
+        app = self.build_login_app(RateLimiter(MemoryRateLimitBackend()))
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            statuses = [
+                (await client.post("/login", data={"username": "alice", "password": password})).status_code
+                for password in ["right", "right", "right", "wrong", "wrong", "wrong"]
+            ]
+        assert statuses == [200, 200, 200, 401, 401, 429]
+
+    async def test_known_client_logs_in_while_username_is_flooded(self):
+        app = self.build_login_app(RateLimiter(MemoryRateLimitBackend()))
+
+        def client(ip: str) -> AsyncClient:
+            return AsyncClient(transport=ASGITransport(app=app, client=(ip, 5000)), base_url="http://test")
+
+        async with client("1.1.1.1") as owner, client("6.6.6.6") as attacker, client("7.7.7.7") as stranger:
+            assert (await owner.post("/login", data={"username": "alice", "password": "right"})).status_code == 200
+            flood = [
+                (await attacker.post("/login", data={"username": "alice", "password": "guess"})).status_code
+                for _ in range(4)
+            ]
+            assert flood == [401, 401, 429, 429]
+            assert (await owner.post("/login", data={"username": "Alice", "password": "right"})).status_code == 200
+            # an address that never logged in as alice still waits for her bucket
+            assert (await stranger.post("/login", data={"username": "alice", "password": "right"})).status_code == 429
+
+    async def test_disabled(self):
+        limiter = RateLimiter(MemoryRateLimitBackend(), enabled=False)
+        async with AsyncClient(transport=ASGITransport(app=self.build_app(limiter)), base_url="http://test") as client:
+            statuses = {(await client.post("/login", data={"username": "alice"})).status_code for _ in range(10)}
+        assert statuses == {200}
@@ -0,0 +1,193 @@
+import pytest
+from datetime import datetime
+from fastapi import Depends, FastAPI, HTTPException, Request, Response
+from httpx import ASGITransport, AsyncClient
+
+from app.config import Config
+from app.schemas.role import RoleOut
+from app.utils.invalidation import EntityChanged, LinkChanged
+from app.utils.response_cache import MemoryCacheBackend, ResponseCache, RESPONSE_CACHE_LOOKUPS
+
+
+def lookups(resource: str, result: str) -> float:
+    return RESPONSE_CACHE_LOOKUPS.labels(resource=resource, result=result)._value.get()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def role(id: int, name: str) -> dict:
+    return {"id": id, "name": name, "description": None, "created": datetime(2025, 1, 1), "updated": None}
+
+
+@pytest.mark.asyncio
+class TestMemoryCacheBackend:
+
+    async def test_entries_expire(self):
+        clock = FakeClock()
+        backend = MemoryCacheBackend(clock=clock)
+        await backend.set("a", b"1", ttl=10)
+        await backend.set("b", b"2")
+        clock.now = 11
+        assert await backend.get("a") is None
+        assert await backend.get("b") == b"2"
+
+    async def test_least_recently_used_is_evicted(self):
+        backend = MemoryCacheBackend(max_entries=2)
+        await backend.set("a", b"1")
+        await backend.set("b", b"2")
+        await backend.get("a")
+        await backend.set("c", b"3")
+        assert await backend.get("b") is None
+        assert await backend.get("a") == b"1"
+
+
+@pytest.mark.asyncio
+class TestResponseCache:
+
+    @pytest.fixture
+    def setup(self):
+        clock = FakeClock()
+        clock.now = 1_000.0
+        cache = ResponseCache(MemoryCacheBackend(), ttl=60, clock=clock)
+        calls = []
+        rows = {1: role(1, "admin"), 2: role(2, "viewer")}
+        app = FastAPI()
+
+        async def authenticated(request: Request):
+            # stands in for get_read_db, which records where the request reads from
+            read = request.headers.get("X-Test-Read")
+            request.state.primary_requested = read == "pinned"
+            request.state.read_from_replica = read == "replica"
+            return "user"
+
+        @app.get("/roles/", response_model=list[RoleOut], dependencies=[Depends(authenticated)])
+        @cache.cached("test_roles", list[RoleOut])
+        async def list_roles(limit: int = 10, response: Response = None):
+            calls.append(("list", limit))
+            response.headers["X-Next-Cursor"] = "next"
+            return list(rows.values())[:limit]
+
+        @app.get("/roles/{id}", response_model=RoleOut)
+        @cache.cached("test_roles", RoleOut, id_param="id")
+        async def get_role(id: int):
+            calls.append(("get", id))
+            if id not in rows:
+                raise HTTPException(status_code=404, detail="Role not found")
+            return rows[id]
+
+        client = AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+        return cache, client, calls, rows, list_roles
+
+    async def test_second_request_is_served_from_cache(self, setup):
+        cache, client, calls, _, _ = setup
+        hits = lookups("test_roles", "hit")
+        first = await client.get("/roles/", params={"limit": 5})
+        second = await client.get("/roles/", params={"limit": 5})
+        assert calls == [("list", 5)]
+        assert second.content == first.content
+        assert [r["name"] for r in second.json()] == ["admin", "viewer"]
+        assert second.headers["X-Next-Cursor"] == "next"
+        assert lookups("test_roles", "hit") == hits + 1
+        assert cache.hit_ratios()["test_roles"] == 0.5
+
+    async def test_query_parameters_are_part_of_the_key(self, setup):
+        _, client, calls, _, _ = setup
+        await client.get("/roles/", params={"limit": 1})
+        await client.get("/roles/", params={"limit": 2})
+        assert calls == [("list", 1), ("list", 2)]
+
+    async def test_query_strings_do_not_collide(self, setup):
+        _, client, calls, _, _ = setup
+        await client.get("/roles/1?a=1&b=2")
+        await client.get("/roles/1", params={"a": "1&b=2"})
+        assert calls == [("get", 1), ("get", 1)]
+
+    async def test_replica_miss_fills_then_hits(self, setup):
+        _, client, calls, _, _ = setup
+        hits = lookups("test_roles", "hit")
+        first = await client.get("/roles/", headers={"X-Test-Read": "replica"})
+        second = await client.get("/roles/", headers={"X-Test-Read": "replica"})
+        assert calls == [("list", 10)]
+        assert second.content == first.content
+        assert lookups("test_roles", "hit") == hits + 1
+
+    async def test_replica_reads_do_not_fill_within_lag_of_invalidation(self, setup, monkeypatch):
+        monkeypatch.setattr(Config, "READ_YOUR_WRITES_SECONDS", 5)
+        cache, client, calls, _, _ = setup
+        await cache.invalidate("test_roles")
+        cache.clock.now += 4
+        await client.get("/roles/", headers={"X-Test-Read": "replica"})
+        await client.get("/roles/", headers={"X-Test-Read": "replica"})
+        assert calls == [("list", 10), ("list", 10)]
+        # a primary read fills right away
+        await client.get("/roles/")
+        await client.get("/roles/", headers={"X-Test-Read": "replica"})
+        assert len(calls) == 3
+        # past the lag bound, replica reads fill again
+        await cache.invalidate("test_roles")
+        cache.clock.now += 5
+        await client.get("/roles/", headers={"X-Test-Read": "replica"})
+        await client.get("/roles/", headers={"X-Test-Read": "replica"})
+        assert len(calls) == 4
+
+    async def test_pinned_reads_skip_cached_body(self, setup):
+        _, client, calls, rows, _ = setup
+        await client.get("/roles/")
+        rows[1] = role(1, "owner")
+        pinned = await client.get("/roles/", headers={"X-Test-Read": "pinned"})
+        assert pinned.json()[0]["name"] == "owner"
+        assert calls == [("list", 10), ("list", 10)]
+
+    async def test_invalidation_is_per_entity(self, setup):
+        cache, client, calls, rows, _ = setup
+        await client.get("/roles/")
+        await client.get("/roles/1")
+        await client.get("/roles/2")
+        rows[1] = role(1, "owner")
+        await cache.invalidate("test_roles", 1)
+        calls.clear()
+        assert (await client.get("/roles/1")).json()["name"] == "owner"
+        await client.get("/roles/")
+        await client.get("/roles/2")
+        assert calls == [("get", 1), ("list", 10)]
+
+    async def test_creation_invalidates_listings_only(self, setup):
+        cache, client, calls, rows, _ = setup
+        await client.get("/roles/")
+        await client.get("/roles/1")
+        rows[3] = role(3, "auditor")
+        await cache.invalidate("test_roles")
+        calls.clear()
+        assert len((await client.get("/roles/")).json()) == 3
+        await client.get("/roles/1")
+        assert calls == [("list", 10)]
+
+    async def test_errors_are_not_cached(self, setup):
+        _, client, calls, _, _ = setup
+        assert (await client.get("/roles/9")).status_code == 404
+        assert (await client.get("/roles/9")).status_code == 404
+        assert calls == [("get", 9), ("get", 9)]
+
+    async def test_direct_call_bypasses_cache(self, setup):
+        _, _, calls, _, list_roles = setup
+        response = Response()
+        result = await list_roles(limit=1, response=response)
+        assert [r["name"] for r in result] == ["admin"]
+        assert calls == [("list", 1)]
+
+    async def test_bus_events_invalidate_cached_resources(self, setup):
+        cache, client, calls, rows, _ = setup
+        await client.get("/roles/1")
+        rows[1] = role(1, "owner")
+        await cache.on_invalidation(EntityChanged("users", 1))
+        await cache.on_invalidation(LinkChanged("users_roles", 5, 1))
+        assert (await client.get("/roles/1")).json()["name"] == "admin"
+        await cache.on_invalidation(EntityChanged("test_roles", 1))
+        assert (await client.get("/roles/1")).json()["name"] == "owner"
+        assert calls == [("get", 1), ("get", 1)]
@@ -0,0 +1,9 @@
+import apiClient from './client.js';
+
+export const statsApi = {
+  /** GET /stats/summary */
+  getSummary: async () => {
+    const response = await apiClient.get('/stats/summary');
+    return response.data;
+  },
+};
@@ -26,6 +26,7 @@ import { usersApi } from '../api/users.js';
 import { groupsApi } from '../api/groups.js';
 import { rolesApi } from '../api/roles.js';
 import { permissionsApi } from '../api/permissions.js';
+import { statsApi } from '../api/stats.js';
 import { Skeleton } from '../components/ui/Skeleton.jsx';
 import Can from '../components/ui/Can.jsx';
 
@@ -47,25 +48,29 @@ export default function DashboardPage() {
   // Queries (enabled by permission checking where required)
   const canSearchUsers = hasPermission(PERMISSIONS.SEARCH_USER);
 
-  const { data: usersData, isLoading: usersLoading } = useQuery({
-    queryKey: ['users', 'dashboard-count'],
-    queryFn: () => usersApi.getAllUsers({ limit: 1 }),
+  // One request for every count; callers without search_user fall back to the listings
+  const { data: summary, isLoading: summaryLoading } = useQuery({
+    queryKey: ['stats', 'summary'],
+    queryFn: statsApi.getSummary,
     enabled: canSearchUsers,
   });
 
   const { data: groupsData, isLoading: groupsLoading } = useQuery({
     queryKey: ['groups', 'dashboard-count'],
-    queryFn: () => groupsApi.getAllGroups({ limit: 1 }),
+    queryFn: () => groupsApi.getAllGroups({ limit: 100 }),
+    enabled: !canSearchUsers,
   });
 
   const { data: rolesData, isLoading: rolesLoading } = useQuery({
     queryKey: ['roles', 'dashboard-count'],
-    queryFn: () => rolesApi.getAllRoles({ limit: 1 }),
+    queryFn: () => rolesApi.getAllRoles({ limit: 100 }),
+    enabled: !canSearchUsers,
   });
 
   const { data: permissionsData, isLoading: permissionsLoading } = useQuery({
     queryKey: ['permissions', 'dashboard-count'],
-    queryFn: () => permissionsApi.getAllPermissions({ limit: 1 }),
+    queryFn: () => permissionsApi.getAllPermissions({ limit: 100 }),
+    enabled: !canSearchUsers,
   });
 
   // Fetch recent activity logs of the current user
@@ -84,8 +89,8 @@ export default function DashboardPage() {
     {
       id: 'users',
       label: 'Total Users',
-      value: usersData?.total ?? 0,
-      loading: usersLoading,
+      value: summary ? summary.users.active + summary.users.inactive : 0,
+      loading: summaryLoading,
       icon: <Users size={22} />,
       color: 'violet',
       permission: PERMISSIONS.SEARCH_USER,
@@ -94,8 +99,8 @@ export default function DashboardPage() {
     {
       id: 'groups',
       label: 'User Groups',
-      value: groupsData?.length ?? 0,
-      loading: groupsLoading,
+      value: summary?.groups ?? groupsData?.length ?? 0,
+      loading: canSearchUsers ? summaryLoading : groupsLoading,
       icon: <FolderLock size={22} />,
       color: 'info',
       path: '/groups',
@@ -103,8 +108,8 @@ export default function DashboardPage() {
     {
       id: 'roles',
       label: 'Security Roles',
-      value: rolesData?.length ?? 0,
-      loading: rolesLoading,
+      value: summary?.roles ?? rolesData?.length ?? 0,
+      loading: canSearchUsers ? summaryLoading : rolesLoading,
       icon: <UserCheck size={22} />,
       color: 'success',
       path: '/roles',
@@ -112,8 +117,8 @@ export default function DashboardPage() {
     {
       id: 'permissions',
       label: 'RBAC Scopes',
-      value: permissionsData?.length ?? 0,
-      loading: permissionsLoading,
+      value: summary?.permissions ?? permissionsData?.length ?? 0,
+      loading: canSearchUsers ? summaryLoading : permissionsLoading,
       icon: <ShieldCheck size={22} />,
       color: 'warning',
       path: '/permissions',